@@ -1,13 +1,32 @@
-from flask import Flask, request, jsonify, send_from_directory, send_file
+from flask import Flask, request, jsonify, send_from_directory, send_file, Response, stream_with_context
 from flask_cors import CORS
 import sqlite3
+from database import get_database
+from history import ensure_history_schema, build_history_query, page_from_rows
+from retention import RETENTION_COLUMNS, RetentionSweeper, policy_from_environment
+from audio_delivery import AudioMetadataCache, file_content_hash
+from audio_probe import probe_audio
+from language_stats import ensure_language_stats_schema, record_language, order_languages
+from batch_upload import BatchFiles, BatchError
 from werkzeug.utils import secure_filename
+from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import HTTPException
 import os
 import json
 from datetime import datetime
 import uuid
 import hashlib
 import logging
+import time
+import tempfile
+import zipfile
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from jobs import JobManager, JOB_COMPLETED, JOB_FAILED
+from live_audio import LiveAudioRegistry
+from progress_events import ProgressFeedRegistry, format_sse
+from metrics import registry as metrics_registry, render_metric_family, StageTimings, stage_totals
+from metrics import PIPELINE_SECONDS, PIPELINES_IN_FLIGHT, HTTP_SECONDS, RESULT_REUSE
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,7 +34,9 @@ logger = logging.getLogger(__name__)
 
 # Import processing functions
 try:
-    from audio_processing import audio_to_text, translate_text, text_to_speech, detect_language_from_audio
+    from audio_processing import audio_to_text, translate_text, text_to_speech, detect_language_from_audio, identify_language, prepare_audio
+    from audio_processing import translation_cache, tts_cache
+    from engines import get_engine, engine_names
     PROCESSING_AVAILABLE = True
     logger.info("✅ Audio processing modules loaded successfully")
 except ImportError as e:
@@ -31,20 +52,59 @@ app.config['OUTPUT_FOLDER'] = 'output_audio'
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max
 ALLOWED_EXTENSIONS = {'mp3', 'wav', 'mp4', 'avi', 'mov', 'm4a', 'ogg', 'webm', 'flac'}
 
+# Asynchronous upload jobs (opt-in per request with async=true)
+app.config['ASYNC_UPLOADS'] = os.environ.get('NEUROFORGE_ASYNC_UPLOADS', 'false').lower() in ('1', 'true', 'yes')
+app.config['JOB_EXECUTOR'] = os.environ.get('NEUROFORGE_JOB_EXECUTOR', 'thread')  # 'thread' or 'process'
+app.config['JOB_WORKERS'] = int(os.environ.get('NEUROFORGE_JOB_WORKERS', 4))
+app.config['MAX_PENDING_JOBS'] = int(os.environ.get('NEUROFORGE_MAX_PENDING_JOBS', 32))
+app.config['JOB_RESULT_TTL'] = int(os.environ.get('NEUROFORGE_JOB_RESULT_TTL', 3600))  # seconds
+
+# In-memory uploads: skip uploads/ and keep small files in RAM, spooling larger ones to a private temp file
+app.config['IN_MEMORY_UPLOADS'] = os.environ.get('NEUROFORGE_IN_MEMORY_UPLOADS', 'false').lower() in ('1', 'true', 'yes')
+app.config['IN_MEMORY_UPLOAD_LIMIT'] = int(os.environ.get('NEUROFORGE_IN_MEMORY_UPLOAD_LIMIT', 8 * 1024 * 1024))  # bytes
+app.config['AUDIO_CACHE_MAX_AGE'] = int(os.environ.get('NEUROFORGE_AUDIO_CACHE_MAX_AGE', 3600))  # browser cache, seconds
+
+# Identical uploads (same content hash and settings) reuse the earlier transcript and voice
+app.config['REUSE_RESULTS'] = os.environ.get('NEUROFORGE_REUSE_RESULTS', 'true').lower() in ('1', 'true', 'yes')
+
+# Auto-detection tries the languages seen most often (for the user and overall) first
+app.config['LANGUAGE_PRIORS'] = os.environ.get('NEUROFORGE_LANGUAGE_PRIORS', 'true').lower() in ('1', 'true', 'yes')
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# /upload/batch: files per request, unpacked zip size, and files processed at once across all batches
+app.config['BATCH_MAX_FILES'] = int(os.environ.get('NEUROFORGE_BATCH_MAX_FILES', 50))
+app.config['BATCH_MAX_UNPACKED_MB'] = int(os.environ.get('NEUROFORGE_BATCH_MAX_UNPACKED_MB', 500))
+app.config['BATCH_CONCURRENCY'] = int(os.environ.get('NEUROFORGE_BATCH_CONCURRENCY', 4))
+
+# Multi-target uploads: target languages per upload and how many are translated and voiced at once
+app.config['MAX_TARGET_LANGUAGES'] = int(os.environ.get('NEUROFORGE_MAX_TARGET_LANGUAGES', 8))
+app.config['FANOUT_WORKERS'] = int(os.environ.get('NEUROFORGE_FANOUT_WORKERS', 4))
+
 # Create directories
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
 os.makedirs('static', exist_ok=True)
 
 # SQLite Database Configuration
-DATABASE_PATH = 'neuroforge.db'
+DATABASE_PATH = os.environ.get('NEUROFORGE_DATABASE_PATH', 'neuroforge.db')
+database = get_database(DATABASE_PATH)
+
+# Columns added after the original schema (see init_database migrations)
+OPTIONAL_TRANSLATION_COLUMNS = {
+    'content_hash': 'TEXT',
+    'audio_hash': 'TEXT',
+    'user_id': 'TEXT',
+    'parent_session_id': 'TEXT',
+    **RETENTION_COLUMNS
+}
+
+# Last-access timestamps are refreshed at most this often per session
+AUDIO_ACCESS_TOUCH_INTERVAL = 60
 
 def get_db_connection():
-    """Create SQLite database connection"""
+    """Lease this thread's pooled SQLite connection; close() returns it to the pool"""
     try:
-        connection = sqlite3.connect(DATABASE_PATH)
-        connection.row_factory = sqlite3.Row
-        return connection
+        return database.connection()
     except sqlite3.Error as err:
         logger.error(f"Database connection failed: {err}")
         return None
@@ -58,111 +118,148 @@ def init_database():
     try:
         connection = get_db_connection()
         if connection:
-            cursor = connection.cursor()
+            try:
+                cursor = connection.cursor()
             
-            # Create users table
-            create_users_table = """
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                email TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                name TEXT NOT NULL,
-                role TEXT DEFAULT 'user',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-            cursor.execute(create_users_table)
+                # Create users table
+                create_users_table = """
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    email TEXT UNIQUE NOT NULL,
+                    password TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    role TEXT DEFAULT 'user',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+                cursor.execute(create_users_table)
             
-            # Check if translations table exists and has correct columns
-            cursor.execute("PRAGMA table_info(translations)")
-            existing_columns = [row[1] for row in cursor.fetchall()]
+                # Check if translations table exists and has correct columns
+                cursor.execute("PRAGMA table_info(translations)")
+                existing_columns = [row[1] for row in cursor.fetchall()]
             
-            required_columns = [
-                'id', 'session_id', 'original_filename', 'original_audio_path',
-                'source_language', 'detected_source_language', 'target_language',
-                'original_text', 'translated_text', 'audio_path', 'translated_audio_path',
-                'translated_audio_url', 'file_size', 'processing_time',
-                'confidence_score', 'voice_type', 'audio_duration', 'created_at'
-            ]
+                required_columns = [
+                    'id', 'session_id', 'original_filename', 'original_audio_path',
+                    'source_language', 'detected_source_language', 'target_language',
+                    'original_text', 'translated_text', 'audio_path', 'translated_audio_path',
+                    'translated_audio_url', 'file_size', 'processing_time',
+                    'confidence_score', 'voice_type', 'audio_duration', 'created_at'
+                ]
             
-            missing_columns = [col for col in required_columns if col not in existing_columns]
+                missing_columns = [col for col in required_columns if col not in existing_columns]
             
-            if missing_columns or not existing_columns:
-                # Backup existing data if table exists
-                backup_data = []
-                if existing_columns:
-                    try:
-                        cursor.execute("SELECT * FROM translations")
-                        backup_data = cursor.fetchall()
-                        logger.info(f"Backing up {len(backup_data)} existing translation records")
-                    except:
-                        pass
+                if missing_columns or not existing_columns:
+                    # Backup existing data if table exists
+                    backup_data = []
+                    if existing_columns:
+                        try:
+                            cursor.execute("SELECT * FROM translations")
+                            backup_data = cursor.fetchall()
+                            logger.info(f"Backing up {len(backup_data)} existing translation records")
+                        except:
+                            pass
+                
+                    # Drop and recreate table
+                    cursor.execute("DROP TABLE IF EXISTS translations")
                 
-                # Drop and recreate table
-                cursor.execute("DROP TABLE IF EXISTS translations")
+                    # Create new translations table with all required columns
+                    create_translations_table = """
+                    CREATE TABLE translations (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        session_id TEXT NOT NULL,
+                        original_filename TEXT,
+                        original_audio_path TEXT,
+                        source_language TEXT DEFAULT 'en',
+                        detected_source_language TEXT,
+                        target_language TEXT,
+                        original_text TEXT,
+                        translated_text TEXT,
+                        audio_path TEXT,
+                        translated_audio_path TEXT,
+                        translated_audio_url TEXT,
+                        file_size INTEGER,
+                        processing_time REAL,
+                        confidence_score REAL DEFAULT 0.0,
+                        voice_type TEXT DEFAULT 'standard',
+                        audio_duration REAL DEFAULT 0.0,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                    """
+                    cursor.execute(create_translations_table)
                 
-                # Create new translations table with all required columns
-                create_translations_table = """
-                CREATE TABLE translations (
+                    # Restore compatible data if any existed
+                    if backup_data and len(existing_columns) >= 12:
+                        for row in backup_data:
+                            try:
+                                # Map old data to new structure with defaults for missing columns
+                                insert_data = list(row[:12])  # Take first 12 columns that should exist
+                                insert_data.extend([0.0, 'standard', 0.0])  # Add defaults for new columns
+                                if len(row) > 12:
+                                    insert_data.append(row[-1])  # Keep original created_at if it exists
+                                else:
+                                    insert_data.append(datetime.now().isoformat())
+                            
+                                placeholders = ','.join(['?' for _ in range(len(insert_data))])
+                                cursor.execute(f"INSERT INTO translations VALUES (?, {placeholders})", insert_data)
+                            except Exception as e:
+                                logger.warning(f"Could not restore record: {e}")
+                                continue
+                
+                    logger.info(f"✅ Translations table recreated with {len(required_columns)} columns")
+                else:
+                    logger.info("✅ Translations table already has correct structure")
+            
+                # Additive migrations: optional columns are added in place, never by recreating the table
+                cursor.execute("PRAGMA table_info(translations)")
+                current_columns = [row[1] for row in cursor.fetchall()]
+                for column, definition in OPTIONAL_TRANSLATION_COLUMNS.items():
+                    if column not in current_columns:
+                        cursor.execute(f"ALTER TABLE translations ADD COLUMN {column} {definition}")
+                        logger.info(f"✅ Added translations.{column} column")
+            
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_translations_session ON translations(session_id)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_translations_parent ON translations(parent_session_id)")
+                cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_translations_reuse
+                ON translations(content_hash, source_language, target_language, voice_type)
+                """)
+            
+                # Per-stage timings of each pipeline run (offsets and durations in seconds)
+                cursor.execute("""
+                CREATE TABLE IF NOT EXISTS stage_timings (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     session_id TEXT NOT NULL,
-                    original_filename TEXT,
-                    original_audio_path TEXT,
-                    source_language TEXT DEFAULT 'en',
-                    detected_source_language TEXT,
-                    target_language TEXT,
-                    original_text TEXT,
-                    translated_text TEXT,
-                    audio_path TEXT,
-                    translated_audio_path TEXT,
-                    translated_audio_url TEXT,
-                    file_size INTEGER,
-                    processing_time REAL,
-                    confidence_score REAL DEFAULT 0.0,
-                    voice_type TEXT DEFAULT 'standard',
-                    audio_duration REAL DEFAULT 0.0,
+                    stage TEXT NOT NULL,
+                    started_offset REAL NOT NULL,
+                    duration REAL NOT NULL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
-                """
-                cursor.execute(create_translations_table)
-                
-                # Restore compatible data if any existed
-                if backup_data and len(existing_columns) >= 12:
-                    for row in backup_data:
-                        try:
-                            # Map old data to new structure with defaults for missing columns
-                            insert_data = list(row[:12])  # Take first 12 columns that should exist
-                            insert_data.extend([0.0, 'standard', 0.0])  # Add defaults for new columns
-                            if len(row) > 12:
-                                insert_data.append(row[-1])  # Keep original created_at if it exists
-                            else:
-                                insert_data.append(datetime.now().isoformat())
-                            
-                            placeholders = ','.join(['?' for _ in range(len(insert_data))])
-                            cursor.execute(f"INSERT INTO translations VALUES (?, {placeholders})", insert_data)
-                        except Exception as e:
-                            logger.warning(f"Could not restore record: {e}")
-                            continue
-                
-                logger.info(f"✅ Translations table recreated with {len(required_columns)} columns")
-            else:
-                logger.info("✅ Translations table already has correct structure")
+                """)
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_stage_timings_session ON stage_timings(session_id)")
+            
+                # /history pagination indexes and the transcript search index
+                app.config['HISTORY_SEARCH'] = ensure_history_schema(
+                    cursor, rebuild=bool(missing_columns or not existing_columns))
             
-            # Insert default users
-            default_users = [
-                ('superadmin@neuroforge.com', hash_password('super123'), 'Super Administrator', 'superadmin'),
-                ('admin@neuroforge.com', hash_password('admin123'), 'Administrator', 'admin'),
-                ('user@neuroforge.com', hash_password('user123'), 'Demo User', 'user')
-            ]
+                # Detected-language counts that order auto-detection candidates
+                ensure_language_stats_schema(cursor, rebuild=bool(missing_columns or not existing_columns))
             
-            for email, password, name, role in default_users:
-                cursor.execute("INSERT OR IGNORE INTO users (email, password, name, role) VALUES (?, ?, ?, ?)",
-                             (email, password, name, role))
+                # Insert default users
+                default_users = [
+                    ('superadmin@neuroforge.com', hash_password('super123'), 'Super Administrator', 'superadmin'),
+                    ('admin@neuroforge.com', hash_password('admin123'), 'Administrator', 'admin'),
+                    ('user@neuroforge.com', hash_password('user123'), 'Demo User', 'user')
+                ]
             
-            connection.commit()
-            cursor.close()
-            connection.close()
-            logger.info("✅ SQLite database initialized successfully!")
+                for email, password, name, role in default_users:
+                    cursor.execute("INSERT OR IGNORE INTO users (email, password, name, role) VALUES (?, ?, ?, ?)",
+                                 (email, password, name, role))
+            
+                connection.commit()
+                cursor.close()
+                logger.info("✅ SQLite database initialized successfully!")
+            finally:
+                connection.close()
     except Exception as e:
         logger.error(f"❌ Database initialization failed: {e}")
         # If all else fails, delete the database file and start fresh
@@ -267,7 +364,11 @@ def get_language_code_for_tts(lang_code):
 
 def get_audio_duration(file_path):
     """Get audio file duration in seconds"""
+    info = probe_audio(file_path)
+    if info:
+        return info['duration']
     try:
+        # Container the header probe doesn't know and no ffprobe: decode it
         from pydub import AudioSegment
         audio = AudioSegment.from_file(file_path)
         return len(audio) / 1000.0  # Convert to seconds
@@ -275,9 +376,107 @@ def get_audio_duration(file_path):
         logger.error(f"Error getting audio duration: {e}")
         return 0.0
 
+AUDIO_MIMETYPES = {'mp3': 'audio/mpeg', 'wav': 'audio/wav', 'ogg': 'audio/ogg', 'flac': 'audio/flac'}
+
+def voice_audio_format():
+    """File extension of generated voice audio (depends on the TTS engine)"""
+    return get_engine('tts').audio_format if PROCESSING_AVAILABLE else 'mp3'
+
+def audio_mimetype(file_path):
+    extension = os.path.splitext(file_path)[1][1:].lower()
+    return AUDIO_MIMETYPES.get(extension, 'audio/mpeg')
+
 # Initialize database
 init_database()
 
+# session_id -> voice path/ETag for /stream_audio and /download_audio
+audio_metadata = AudioMetadataCache(
+    max_entries=int(os.environ.get('NEUROFORGE_AUDIO_METADATA_ENTRIES', 10000)),
+    ttl=int(os.environ.get('NEUROFORGE_AUDIO_METADATA_TTL', 300))
+)
+
+# Storage retention: age/size quotas over uploads/, output_audio/ and the TTS cache
+retention_policy = policy_from_environment(
+    database,
+    folders=[app.config['UPLOAD_FOLDER'], app.config['OUTPUT_FOLDER']],
+    tts_cache_dir=tts_cache.cache_dir if PROCESSING_AVAILABLE and tts_cache.enabled else None,
+    active_holds=lambda: job_manager.active_holds()
+)
+def _forget_expired_audio(session_ids):
+    for session_id in session_ids:
+        audio_metadata.invalidate(session_id)
+
+retention_sweeper = RetentionSweeper(
+    retention_policy,
+    interval=int(os.environ.get('NEUROFORGE_RETENTION_INTERVAL', 3600)),
+    on_expired=_forget_expired_audio
+)
+# Process-pool job workers import this module for the pipeline; only the server sweeps
+if multiprocessing.parent_process() is None:
+    retention_sweeper.start()
+
+# Voice audio of sessions still being synthesized, streamed by /stream_audio
+live_audio = LiveAudioRegistry()
+
+# Stage events of running sessions, served as Server-Sent Events by /events
+progress_feeds = ProgressFeedRegistry()
+
+# Worker pool for asynchronous uploads
+job_manager = JobManager(
+    max_workers=app.config['JOB_WORKERS'],
+    executor_type=app.config['JOB_EXECUTOR'],
+    max_pending=app.config['MAX_PENDING_JOBS'],
+    result_ttl=app.config['JOB_RESULT_TTL']
+)
+
+def _collect_runtime_metrics():
+    """Job queue and cache counters, read at scrape time"""
+    jobs = job_manager.stats()['jobs']
+    lines = render_metric_family('neuroforge_jobs', 'Asynchronous jobs by status (finished jobs until their result expires)',
+                                [({'status': status}, count) for status, count in sorted(jobs.items())])
+    if PROCESSING_AVAILABLE:
+        translation = translation_cache.stats()
+        tts = tts_cache.stats()
+        lines += render_metric_family('neuroforge_cache_hits_total', 'Cache hits', [
+            ({'cache': 'translation_memory'}, translation['memory_hits']),
+            ({'cache': 'translation_db'}, translation['db_hits']),
+            ({'cache': 'translation_segment'}, translation['segment_hits']),
+            ({'cache': 'tts'}, tts['hits'])
+        ], metric_type='counter')
+        lines += render_metric_family('neuroforge_cache_misses_total', 'Cache misses', [
+            ({'cache': 'translation'}, translation['misses']),
+            ({'cache': 'translation_segment'}, translation['segment_misses']),
+            ({'cache': 'tts'}, tts['misses'])
+        ], metric_type='counter')
+    return lines
+
+def _collect_database_metrics():
+    stats = database.stats()
+    lines = render_metric_family('neuroforge_db_idle_connections', 'Pooled SQLite connections waiting for a lease',
+                                 [({}, stats['idle_connections'])])
+    lines += render_metric_family('neuroforge_db_connections_opened_total', 'SQLite connections opened',
+                                  [({}, stats['opened'])], metric_type='counter')
+    lines += render_metric_family('neuroforge_db_busy_retries_total', 'Write transactions retried on a locked database',
+                                  [({}, stats['busy_retries'])], metric_type='counter')
+    return lines
+
+metrics_registry.add_collector(_collect_runtime_metrics)
+metrics_registry.add_collector(_collect_database_metrics)
+
+@app.before_request
+def _start_request_timer():
+    request.environ['neuroforge.started'] = time.perf_counter()
+
+@app.after_request
+def _observe_request_latency(response):
+    started = request.environ.get('neuroforge.started')
+    if started is not None:
+        # Label by route pattern, not URL, to keep session ids out of the label set
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_SECONDS.observe(time.perf_counter() - started, method=request.method,
+                             endpoint=endpoint, status=response.status_code)
+    return response
+
 # Routes
 @app.route('/')
 def home():
@@ -287,6 +486,7 @@ def home():
         'version': '5.0',
         'database': 'SQLite3 (neuroforge.db)',
         'processing_available': PROCESSING_AVAILABLE,
+        'engines': engine_names() if PROCESSING_AVAILABLE else None,
         'supported_formats': list(ALLOWED_EXTENSIONS),
         'supported_languages': len(get_comprehensive_language_support()),
         'features': [
@@ -296,7 +496,9 @@ def home():
             'Audio Playback Controls',
             'Audio Download & Streaming',
             'Real-time Voice Playback',
-            'Multiple Voice Options'
+            'Multiple Voice Options',
+            'Asynchronous Upload Jobs',
+            'Batch Uploads (files or zip)'
         ]
     })
 
@@ -330,15 +532,9 @@ def register():
         if '@' not in email or '.' not in email:
             return jsonify({'success': False, 'error': 'Please enter a valid email address'}), 400
         
-        connection = get_db_connection()
-        if connection:
-            cursor = connection.cursor()
+        with database.transaction() as cursor:
             cursor.execute("SELECT id FROM users WHERE email = ?", (email,))
-            existing_user = cursor.fetchone()
-            
-            if existing_user:
-                cursor.close()
-                connection.close()
+            if cursor.fetchone():
                 return jsonify({'success': False, 'error': 'Email already registered'}), 400
             
             hashed_password = hash_password(password)
@@ -347,18 +543,16 @@ def register():
                 (email, hashed_password, name, 'user')
             )
             user_id = cursor.lastrowid
-            connection.commit()
-            cursor.close()
-            connection.close()
-            
-            return jsonify({
-                'success': True,
-                'message': 'Account created successfully!',
-                'user': {'id': user_id, 'email': email, 'name': name, 'role': 'user'}
-            })
         
-        return jsonify({'success': False, 'error': 'Database error'}), 500
+        return jsonify({
+            'success': True,
+            'message': 'Account created successfully!',
+            'user': {'id': user_id, 'email': email, 'name': name, 'role': 'user'}
+        })
         
+    except sqlite3.Error as e:
+        logger.error(f"Registration error: {e}")
+        return jsonify({'success': False, 'error': 'Database error'}), 500
     except Exception as e:
         logger.error(f"Registration error: {e}")
         return jsonify({'success': False, 'error': 'Registration failed'}), 500
@@ -376,15 +570,17 @@ def authenticate():
         
         connection = get_db_connection()
         if connection:
-            cursor = connection.cursor()
-            hashed_password = hash_password(password)
-            cursor.execute(
-                "SELECT id, email, name, role FROM users WHERE email = ? AND password = ?",
-                (email, hashed_password)
-            )
-            user = cursor.fetchone()
-            cursor.close()
-            connection.close()
+            try:
+                cursor = connection.cursor()
+                hashed_password = hash_password(password)
+                cursor.execute(
+                    "SELECT id, email, name, role FROM users WHERE email = ? AND password = ?",
+                    (email, hashed_password)
+                )
+                user = cursor.fetchone()
+                cursor.close()
+            finally:
+                connection.close()
             
             if user:
                 return jsonify({
@@ -403,10 +599,486 @@ def authenticate():
         logger.error(f"Authentication error: {e}")
         return jsonify({'success': False, 'error': 'Authentication failed'}), 500
 
-@app.route('/upload', methods=['POST'])
-def upload_file():
+def _report_progress(progress, stage, percent):
+    """Forward pipeline progress to the job manager when running as a job"""
+    if progress:
+        try:
+            progress(stage, percent)
+        except Exception:
+            pass
+
+def _publish_event(feed, event, **data):
+    """Push a stage event to the session's SSE feed, if one is open"""
+    if feed:
+        feed.publish(event, **data)
+
+def _text_preview(text, limit=500):
+    return text if len(text) <= limit else text[:limit] + '...'
+
+def ordered_detection_languages(languages, user_id=None):
+    """Auto-detection candidates ordered by how often each language was detected before"""
+    connection = get_db_connection()
+    if not connection:
+        return languages
+    try:
+        return order_languages(connection, languages, user_id)
+    except sqlite3.Error as e:
+        logger.warning(f"Language statistics unavailable: {e}")
+        return languages
+    finally:
+        connection.close()
+
+def process_translation(session_id, file_path, filename, file_size, source_language,
+                        target_language, voice_type, content_hash=None, user_id=None, progress=None,
+                        target_languages=None):
+    """Run speech-to-text, translation, voice generation and the DB insert for one upload
+
+    With several target_languages the upload is transcribed once and each
+    target gets its own session, row and voice file, linked by
+    parent_session_id = session_id.
+
+    file_path is either the saved upload or an in-memory upload buffer; buffers
+    are owned by the pipeline run and closed when it finishes. Any live audio
+    stream and progress feed opened for the session are finished here too.
+    """
+    live_stream = live_audio.get(session_id)
+    feed = progress_feeds.get(session_id)
+    failed = True
+    started = time.perf_counter()
+    PIPELINES_IN_FLIGHT.inc()
+    try:
+        result = _run_translation_pipeline(session_id, file_path, filename, file_size, source_language,
+                                           target_language, voice_type, content_hash, user_id,
+                                           progress, live_stream, feed, target_languages)
+        failed = not result.get('audio_available')
+        _publish_event(feed, 'completed', result=result)
+        return result
+    except Exception as e:
+        _publish_event(feed, 'failed', error=str(e))
+        raise
+    finally:
+        PIPELINES_IN_FLIGHT.dec()
+        PIPELINE_SECONDS.observe(time.perf_counter() - started, outcome='failed' if failed else 'completed')
+        if not isinstance(file_path, str):
+            file_path.close()
+        if live_stream:
+            live_stream.finish(failed=failed)
+        if feed:
+            feed.finish()
+
+def _run_translation_pipeline(session_id, file_path, filename, file_size, source_language,
+                              target_language, voice_type, content_hash, user_id, progress,
+                              live_stream=None, feed=None, target_languages=None):
     start_time = datetime.now()
+    stored_path = file_path if isinstance(file_path, str) else None
+    timings = StageTimings()
+    targets = target_languages or [target_language]
+
+    # Initialize variables
+    original_text = ""
+    detected_source_lang = source_language
+    confidence_score = 0.0
+    outputs = {}
+
+    # Process file with voice generation
+    if PROCESSING_AVAILABLE:
+        try:
+            logger.info("Starting voice translation processing...")
+            
+            # Step 1: Language detection and text extraction
+            _report_progress(progress, 'transcribing', 10)
+            
+            # Decode and preprocess once; every recognition pass reuses it
+            file_format = filename.rsplit('.', 1)[1].lower() if '.' in filename else None
+            with timings.span('decode'):
+                audio_source = prepare_audio(file_path, file_format=file_format) or file_path
+            
+            if source_language == 'auto':
+                detection_attempts = ['en', 'es', 'fr', 'de', 'it', 'pt', 'ru', 'ja', 'ko', 'zh-cn', 'ar', 'hi']
+                if app.config['LANGUAGE_PRIORS']:
+                    detection_attempts = ordered_detection_languages(detection_attempts, user_id)
+                candidates = [(lang, get_speech_recognition_lang_code(lang)) for lang in detection_attempts]
+                
+                with timings.span('language_detection'):
+                    best_lang, best_result, best_confidence = identify_language(
+                        audio_source,
+                        candidates,
+                        score_fn=lambda text: min(len(text.strip()) / 100.0, 1.0),
+                        threshold=0.8
+                    )
+                
+                if best_result:
+                    original_text = best_result
+                    detected_source_lang = best_lang
+                    confidence_score = best_confidence
+                else:
+                    original_text = "Could not detect language or extract text from audio"
+                    detected_source_lang = 'unknown'
+                    confidence_score = 0.0
+                    
+            else:
+                sr_lang = get_speech_recognition_lang_code(source_language)
+                with timings.span('asr'):
+                    original_text = audio_to_text(audio_source, src_lang=sr_lang)
+                detected_source_lang = source_language
+                confidence_score = 0.9
+            
+            logger.info(f"Speech-to-text completed ({detected_source_lang}): {original_text[:50]}...")
+            _publish_event(feed, 'language_detected', source_language=source_language,
+                           detected_source_language=detected_source_lang, confidence_score=confidence_score)
+            _publish_event(feed, 'transcript_ready', text=_text_preview(original_text), length=len(original_text))
+            
+            # Steps 2 and 3: translation and voice, once per target language
+            _report_progress(progress, 'translating', 50)
+            if len(targets) == 1:
+                outputs[target_language] = _render_target(
+                    session_id, target_language, original_text, detected_source_lang, voice_type,
+                    timings, live_stream, feed, progress)
+            else:
+                _report_progress(progress, 'generating_voice', 70)
+                outputs = _render_targets(targets, original_text, detected_source_lang, voice_type, timings, feed)
+            
+        except Exception as e:
+            logger.error(f"Processing error: {e}")
+            original_text = f"Processing failed for {filename}: {str(e)}"
+            for target in targets:
+                output = outputs.get(target) or {'session_id': session_id if len(targets) == 1 else str(uuid.uuid4())}
+                output.update(translated_text="Error: Could not process audio file", audio_path=None,
+                              audio_url=None, audio_duration=0.0)
+                outputs[target] = output
+    else:
+        # Mock response with voice simulation
+        mock_texts = {
+            'en': "This is sample English text extracted from the audio file.",
+            'es': "Este es un texto de muestra en español extraído del archivo de audio.",
+            'fr': "Ceci est un exemple de texte français extrait du fichier audio.",
+            'de': "Dies ist ein Beispieltext auf Deutsch aus der Audiodatei.",
+            'hi': "यह ऑडियो फाइल से निकाला गया हिंदी नमूना पाठ है।"
+        }
+        
+        if source_language == 'auto':
+            import random
+            detected_source_lang = random.choice(['en', 'es', 'fr', 'de', 'hi'])
+            confidence_score = random.uniform(0.7, 0.95)
+        else:
+            detected_source_lang = source_language
+            confidence_score = 0.9
+            
+        original_text = mock_texts.get(detected_source_lang, mock_texts['en'])
+        for target in targets:
+            outputs[target] = _render_mock_target(session_id if len(targets) == 1 else str(uuid.uuid4()), target)
+
+    # Calculate processing time
+    processing_time = (datetime.now() - start_time).total_seconds()
+
+    # Save to database with all required columns: one row per target language
+    _report_progress(progress, 'saving', 95)
+    parent_session_id = session_id if len(targets) > 1 else None
+    with timings.span('db_write'):
+        with database.transaction() as cursor:
+            insert_query = """
+            INSERT INTO translations
+            (session_id, original_filename, original_audio_path, source_language, detected_source_language, 
+             target_language, original_text, translated_text, audio_path, translated_audio_path, 
+             translated_audio_url, file_size, processing_time, confidence_score, voice_type, audio_duration,
+             content_hash, user_id, parent_session_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """
+            cursor.executemany(insert_query, [(
+                outputs[target]['session_id'], filename, stored_path, source_language, detected_source_lang, target,
+                original_text, outputs[target]['translated_text'], stored_path, outputs[target]['audio_path'], 
+                outputs[target]['audio_url'], file_size, processing_time, confidence_score, 
+                voice_type, outputs[target]['audio_duration'], content_hash, user_id, parent_session_id
+            ) for target in targets])
+            record_language(cursor, detected_source_lang, user_id)
+    
+    # Each target's session records the shared transcription spans plus its own
+    with database.transaction() as cursor:
+        cursor.executemany(
+            "INSERT INTO stage_timings (session_id, stage, started_offset, duration) VALUES (?, ?, ?, ?)",
+            [(outputs[target]['session_id'], stage, offset, duration)
+             for target in targets
+             for stage, offset, duration in timings.spans + outputs[target].get('spans', [])]
+        )
+
+    results = [{
+        'status': 'success',
+        'session_id': outputs[target]['session_id'],
+        'original_text': original_text,
+        'translated_text': outputs[target]['translated_text'],
+        'source_language': source_language,
+        'detected_source_language': detected_source_lang,
+        'target_language': target,
+        'confidence_score': confidence_score,
+        'audio_available': outputs[target]['audio_path'] is not None,
+        'audio_url': outputs[target]['audio_url'],
+        'audio_duration': outputs[target]['audio_duration'],
+        'voice_type': voice_type,
+        'processing_time': processing_time,
+        'file_size': file_size,
+        'stage_timings': timings.as_dict(),
+        'download_url': f"/download_audio/{outputs[target]['session_id']}" if outputs[target]['audio_path'] else None
+    } for target in targets]
+
+    if len(targets) == 1:
+        return results[0]
+
+    for result in results:
+        result['parent_session_id'] = session_id
+        result['stage_timings'] = stage_totals(timings.spans + outputs[result['target_language']].get('spans', []))
+    return {
+        'status': 'success',
+        'session_id': session_id,
+        'parent_session_id': session_id,
+        'original_text': original_text,
+        'source_language': source_language,
+        'detected_source_language': detected_source_lang,
+        'target_languages': targets,
+        'confidence_score': confidence_score,
+        'audio_available': any(result['audio_available'] for result in results),
+        'voice_type': voice_type,
+        'processing_time': processing_time,
+        'file_size': file_size,
+        'stage_timings': timings.as_dict(),
+        'translations': results
+    }
+
+def _render_target(session_id, target_language, original_text, detected_source_lang, voice_type,
+                   timings, live_stream=None, feed=None, progress=None):
+    """Translate the transcript into one target language and voice it as session_id's audio.
+
+    Returns a dict with session_id, translated_text, audio_path, audio_url and audio_duration.
+    """
+    translated_text = ""
+    translated_audio_path = None
+    translated_audio_url = None
+    audio_duration = 0.0
+
+    # Step 2: Translation
+    if detected_source_lang != target_language and detected_source_lang != 'unknown' and original_text and not original_text.startswith('Could not'):
+        with timings.span('translation'):
+            translated_text = translate_text(
+                original_text, 
+                src_lang=detected_source_lang, 
+                target_lang=target_language
+            )
+        logger.info(f"Translation completed ({target_language}): {translated_text[:50]}...")
+    elif detected_source_lang == target_language:
+        translated_text = original_text
+    else:
+        translated_text = "Translation failed due to language detection issues"
+    _publish_event(feed, 'translation_ready', target_language=target_language, session_id=session_id,
+                   text=_text_preview(translated_text), length=len(translated_text))
+    
+    # Step 3: High-Quality Voice Generation
+    _report_progress(progress, 'generating_voice', 70)
+    if translated_text and not translated_text.startswith('Translation failed'):
+        try:
+            tts_lang_code = get_language_code_for_tts(target_language)
+            output_filename = f"voice_{session_id}.{voice_audio_format()}"
+            output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
+            
+            # Enhanced TTS with voice options
+            with timings.span('tts'):
+                translated_audio_path = text_to_speech(
+                    text=translated_text,
+                    lang=tts_lang_code,
+                    out_file=output_path,
+                    voice_type=voice_type,
+                    on_segment=live_stream.publish if live_stream else None
+                )
+            
+            # Cache hits and the fast voice publish nothing while running; send the whole file
+            if live_stream and translated_audio_path and not live_stream.has_audio:
+                with open(translated_audio_path, 'rb') as audio_file:
+                    live_stream.publish(audio_file.read())
+            
+            if translated_audio_path and os.path.exists(translated_audio_path):
+                with timings.span('duration_probe'):
+                    audio_duration = get_audio_duration(translated_audio_path)
+                translated_audio_url = f"/stream_audio/{session_id}"
+                logger.info(f"Voice generation completed: {translated_audio_path} ({audio_duration:.1f}s)")
+                _publish_event(feed, 'audio_ready', target_language=target_language, session_id=session_id,
+                               audio_url=translated_audio_url, audio_duration=audio_duration,
+                               download_url=f'/download_audio/{session_id}')
+            
+        except Exception as e:
+            logger.error(f"Voice generation failed: {e}")
+            translated_audio_path = None
+
+    return {
+        'session_id': session_id,
+        'translated_text': translated_text,
+        'audio_path': translated_audio_path,
+        'audio_url': translated_audio_url,
+        'audio_duration': audio_duration
+    }
+
+def _render_targets(targets, original_text, detected_source_lang, voice_type, timings, feed=None):
+    """Fan translation and voice out over several target languages at once, one new session each"""
+    def render(target):
+        # Offsets stay relative to the start of the whole pipeline run
+        target_timings = StageTimings(started=timings.started)
+        try:
+            output = _render_target(str(uuid.uuid4()), target, original_text, detected_source_lang,
+                                    voice_type, target_timings, feed=feed)
+        except Exception as e:
+            logger.error(f"Processing for {target} failed: {e}")
+            output = {'session_id': str(uuid.uuid4()), 'translated_text': "Error: Could not process audio file",
+                      'audio_path': None, 'audio_url': None, 'audio_duration': 0.0}
+        output['spans'] = target_timings.spans
+        return output
+
+    workers = max(1, min(app.config['FANOUT_WORKERS'], len(targets)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fanout') as executor:
+        return dict(zip(targets, executor.map(render, targets)))
+
+def _render_mock_target(session_id, target_language):
+    """Sample translation and placeholder audio when the processing modules are unavailable"""
+    translated_text = get_sample_translation(target_language)
+    translated_audio_path = None
+    translated_audio_url = None
+    audio_duration = 0.0
     
+    # Generate mock voice audio (simplified fallback)
+    try:
+        output_filename = f"voice_{session_id}.mp3"
+        output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
+        
+        # Create a simple placeholder file for testing
+        with open(output_path, 'w') as f:
+            f.write("Mock audio file")
+        
+        translated_audio_path = output_path
+        audio_duration = 3.5  # Mock duration
+        translated_audio_url = f"/stream_audio/{session_id}"
+        logger.info(f"Mock voice generated: {translated_audio_path}")
+    except Exception as e:
+        logger.error(f"Mock voice generation failed: {e}")
+        translated_audio_path = None
+
+    return {
+        'session_id': session_id,
+        'translated_text': translated_text,
+        'audio_path': translated_audio_path,
+        'audio_url': translated_audio_url,
+        'audio_duration': audio_duration
+    }
+
+def save_upload(file, destination):
+    """Copy an upload to a path or file object, hashing it on the way through.
+    Returns (size in bytes, sha256 hex digest)."""
+    digest = hashlib.sha256()
+    size = 0
+    output = open(destination, 'wb') if isinstance(destination, str) else destination
+    try:
+        while True:
+            chunk = file.stream.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            output.write(chunk)
+            size += len(chunk)
+    finally:
+        if isinstance(destination, str):
+            output.close()
+    return size, digest.hexdigest()
+
+def find_reusable_translation(content_hash, source_language, target_language, voice_type):
+    """Most recent completed translation of the same content with the same settings"""
+    connection = get_db_connection()
+    if not connection:
+        return None
+
+    try:
+        rows = connection.execute("""
+        SELECT * FROM translations
+        WHERE content_hash = ? AND source_language = ? AND target_language = ? AND voice_type = ?
+          AND translated_audio_path IS NOT NULL AND expired_at IS NULL
+        ORDER BY id DESC
+        LIMIT 5
+        """, (content_hash, source_language, target_language, voice_type)).fetchall()
+    finally:
+        connection.close()
+
+    for row in rows:
+        if os.path.exists(row['translated_audio_path']):
+            return row
+    return None
+
+def reuse_translation(previous, session_id, filename, file_size, user_id=None):
+    """Create a new session that points at an earlier session's transcript and voice"""
+    start_time = datetime.now()
+
+    # Give the new session its own voice file name without copying the audio
+    extension = os.path.splitext(previous['translated_audio_path'])[1] or '.mp3'
+    output_path = os.path.join(app.config['OUTPUT_FOLDER'], f"voice_{session_id}{extension}")
+    try:
+        os.link(previous['translated_audio_path'], output_path)
+        translated_audio_path = output_path
+    except OSError:
+        translated_audio_path = previous['translated_audio_path']
+
+    translated_audio_url = f"/stream_audio/{session_id}"
+    processing_time = (datetime.now() - start_time).total_seconds()
+
+    with database.transaction() as cursor:
+        cursor.execute("""
+        INSERT INTO translations
+        (session_id, original_filename, original_audio_path, source_language, detected_source_language, 
+         target_language, original_text, translated_text, audio_path, translated_audio_path, 
+         translated_audio_url, file_size, processing_time, confidence_score, voice_type, audio_duration,
+         content_hash, user_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            session_id, filename, previous['original_audio_path'], previous['source_language'],
+            previous['detected_source_language'], previous['target_language'], previous['original_text'],
+            previous['translated_text'], previous['audio_path'], translated_audio_path,
+            translated_audio_url, file_size, processing_time, previous['confidence_score'],
+            previous['voice_type'], previous['audio_duration'], previous['content_hash'], user_id
+        ))
+        record_language(cursor, previous['detected_source_language'], user_id)
+
+    logger.info(f"♻️ Reused translation {previous['session_id']} for session {session_id}")
+
+    return {
+        'status': 'success',
+        'session_id': session_id,
+        'original_text': previous['original_text'],
+        'translated_text': previous['translated_text'],
+        'source_language': previous['source_language'],
+        'detected_source_language': previous['detected_source_language'],
+        'target_language': previous['target_language'],
+        'confidence_score': previous['confidence_score'],
+        'audio_available': True,
+        'audio_url': translated_audio_url,
+        'audio_duration': previous['audio_duration'],
+        'voice_type': previous['voice_type'],
+        'processing_time': processing_time,
+        'file_size': file_size,
+        'download_url': f'/download_audio/{session_id}',
+        'reused_from': previous['session_id']
+    }
+
+def requested_target_languages():
+    """Distinct targets from target_languages (repeated and/or comma-separated), in request order"""
+    targets = []
+    for value in request.form.getlist('target_languages'):
+        for target in value.split(','):
+            target = target.strip()
+            if target and target not in targets:
+                targets.append(target)
+    return targets
+
+def wants_async_upload():
+    """Async mode is opt-in per request (async=true) or server-wide via ASYNC_UPLOADS"""
+    flag = request.form.get('async', request.args.get('async'))
+    if flag is None:
+        return app.config['ASYNC_UPLOADS']
+    return str(flag).lower() in ('1', 'true', 'yes')
+
+@app.route('/upload', methods=['POST'])
+def upload_file():
     try:
         if 'file' not in request.files:
             return jsonify({'error': 'No file provided'}), 400
@@ -415,6 +1087,13 @@ def upload_file():
         source_language = request.form.get('source_language', 'auto')
         target_language = request.form.get('target_language', 'en')
         voice_type = request.form.get('voice_type', 'standard')
+        user_id = request.form.get('user_id', '').strip()[:128] or None
+        target_languages = requested_target_languages()
+        if len(target_languages) > app.config['MAX_TARGET_LANGUAGES']:
+            return jsonify({'error': f"At most {app.config['MAX_TARGET_LANGUAGES']} target languages per upload"}), 400
+        if target_languages:
+            target_language = target_languages[0]
+        multi_target = len(target_languages) > 1
 
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
@@ -427,224 +1106,385 @@ def upload_file():
         # Generate session ID
         session_id = str(uuid.uuid4())
         
-        # Save file
         filename = secure_filename(file.filename)
-        unique_filename = f"{session_id}_{filename}"
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-        file.save(file_path)
-        
-        file_size = os.path.getsize(file_path)
-        logger.info(f"File saved: {unique_filename} ({file_size} bytes)")
+        run_async = wants_async_upload()
 
-        # Initialize variables
-        original_text = ""
-        translated_text = ""
-        translated_audio_path = None
-        translated_audio_url = None
-        detected_source_lang = source_language
-        confidence_score = 0.0
-        audio_duration = 0.0
+        # Buffers can't be handed to a process pool, so those jobs still go through uploads/
+        if app.config['IN_MEMORY_UPLOADS'] and not (run_async and app.config['JOB_EXECUTOR'] == 'process'):
+            # Small uploads stay in memory; larger ones roll over to a unique anonymous temp file
+            file_path = tempfile.SpooledTemporaryFile(max_size=app.config['IN_MEMORY_UPLOAD_LIMIT'])
+            file_size, content_hash = save_upload(file, file_path)
+            file_path.seek(0)
+            logger.info(f"File received in memory: {filename} ({file_size} bytes)")
+        else:
+            # Save file
+            unique_filename = f"{session_id}_{filename}"
+            file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
+            file_size, content_hash = save_upload(file, file_path)
+            logger.info(f"File saved: {unique_filename} ({file_size} bytes)")
 
-        # Process file with voice generation
-        if PROCESSING_AVAILABLE:
-            try:
-                logger.info("Starting voice translation processing...")
-                
-                # Step 1: Language detection and text extraction
-                if source_language == 'auto':
-                    detection_attempts = ['en', 'es', 'fr', 'de', 'it', 'pt', 'ru', 'ja', 'ko', 'zh-cn', 'ar', 'hi']
-                    
-                    best_result = None
-                    best_confidence = 0.0
-                    
-                    for try_lang in detection_attempts:
-                        try:
-                            sr_lang = get_speech_recognition_lang_code(try_lang)
-                            text_result = audio_to_text(file_path, src_lang=sr_lang)
-                            
-                            if text_result and not text_result.startswith('Could not') and len(text_result.strip()) > 5:
-                                text_confidence = min(len(text_result.strip()) / 100.0, 1.0)
-                                
-                                if text_confidence > best_confidence:
-                                    best_confidence = text_confidence
-                                    best_result = text_result
-                                    detected_source_lang = try_lang
-                                    
-                                if text_confidence > 0.8:
-                                    break
-                                    
-                        except Exception as e:
-                            continue
-                    
-                    if best_result:
-                        original_text = best_result
-                        confidence_score = best_confidence
-                    else:
-                        original_text = "Could not detect language or extract text from audio"
-                        detected_source_lang = 'unknown'
-                        confidence_score = 0.0
-                        
-                else:
-                    sr_lang = get_speech_recognition_lang_code(source_language)
-                    original_text = audio_to_text(file_path, src_lang=sr_lang)
-                    detected_source_lang = source_language
-                    confidence_score = 0.9
-                
-                logger.info(f"Speech-to-text completed ({detected_source_lang}): {original_text[:50]}...")
-                
-                # Step 2: Translation
-                if detected_source_lang != target_language and detected_source_lang != 'unknown' and original_text and not original_text.startswith('Could not'):
-                    translated_text = translate_text(
-                        original_text, 
-                        src_lang=detected_source_lang, 
-                        target_lang=target_language
-                    )
-                    logger.info(f"Translation completed: {translated_text[:50]}...")
-                elif detected_source_lang == target_language:
-                    translated_text = original_text
+        # Same clip with the same settings was already processed: answer from the earlier session
+        if app.config['REUSE_RESULTS'] and not multi_target:
+            previous = find_reusable_translation(content_hash, source_language, target_language, voice_type)
+            if previous:
+                if isinstance(file_path, str):
+                    os.remove(file_path)
                 else:
-                    translated_text = "Translation failed due to language detection issues"
-                
-                # Step 3: High-Quality Voice Generation
-                if translated_text and not translated_text.startswith('Translation failed'):
-                    try:
-                        tts_lang_code = get_language_code_for_tts(target_language)
-                        output_filename = f"voice_{session_id}.mp3"
-                        output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
-                        
-                        # Enhanced TTS with voice options
-                        translated_audio_path = text_to_speech(
-                            text=translated_text,
-                            lang=tts_lang_code,
-                            out_file=output_path,
-                            voice_type=voice_type
-                        )
-                        
-                        if translated_audio_path and os.path.exists(translated_audio_path):
-                            audio_duration = get_audio_duration(translated_audio_path)
-                            translated_audio_url = f"/stream_audio/{session_id}"
-                            logger.info(f"Voice generation completed: {translated_audio_path} ({audio_duration:.1f}s)")
-                        
-                    except Exception as e:
-                        logger.error(f"Voice generation failed: {e}")
-                        translated_audio_path = None
-                
-            except Exception as e:
-                logger.error(f"Processing error: {e}")
-                original_text = f"Processing failed for {filename}: {str(e)}"
-                translated_text = f"Error: Could not process audio file"
-                translated_audio_path = None
-        else:
-            # Mock response with voice simulation
-            mock_texts = {
-                'en': "This is sample English text extracted from the audio file.",
-                'es': "Este es un texto de muestra en español extraído del archivo de audio.",
-                'fr': "Ceci est un exemple de texte français extrait du fichier audio.",
-                'de': "Dies ist ein Beispieltext auf Deutsch aus der Audiodatei.",
-                'hi': "यह ऑडियो फाइल से निकाला गया हिंदी नमूना पाठ है।"
-            }
-            
-            if source_language == 'auto':
-                import random
-                detected_source_lang = random.choice(['en', 'es', 'fr', 'de', 'hi'])
-                confidence_score = random.uniform(0.7, 0.95)
-            else:
-                detected_source_lang = source_language
-                confidence_score = 0.9
-                
-            original_text = mock_texts.get(detected_source_lang, mock_texts['en'])
-            translated_text = get_sample_translation(target_language)
-            
-            # Generate mock voice audio (simplified fallback)
-            try:
-                output_filename = f"voice_{session_id}.mp3"
-                output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
-                
-                # Create a simple placeholder file for testing
-                with open(output_path, 'w') as f:
-                    f.write("Mock audio file")
-                
-                translated_audio_path = output_path
-                audio_duration = 3.5  # Mock duration
-                translated_audio_url = f"/stream_audio/{session_id}"
-                logger.info(f"Mock voice generated: {translated_audio_path}")
-            except Exception as e:
-                logger.error(f"Mock voice generation failed: {e}")
-                translated_audio_path = None
+                    file_path.close()
+                RESULT_REUSE.inc()
+                return jsonify(reuse_translation(previous, session_id, filename, file_size, user_id))
 
-        # Calculate processing time
-        processing_time = (datetime.now() - start_time).total_seconds()
+        pipeline_args = (session_id, file_path, filename, file_size,
+                         source_language, target_language, voice_type, content_hash, user_id)
+        pipeline_kwargs = {'target_languages': target_languages} if multi_target else {}
 
-        # Save to database with all required columns
-        connection = get_db_connection()
-        if connection:
-            cursor = connection.cursor()
-            insert_query = """
-            INSERT INTO translations
-            (session_id, original_filename, original_audio_path, source_language, detected_source_language, 
-             target_language, original_text, translated_text, audio_path, translated_audio_path, 
-             translated_audio_url, file_size, processing_time, confidence_score, voice_type, audio_duration)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            cursor.execute(insert_query, (
-                session_id, filename, file_path, source_language, detected_source_lang, target_language,
-                original_text, translated_text, file_path, translated_audio_path, 
-                translated_audio_url, file_size, processing_time, confidence_score, 
-                voice_type, audio_duration
-            ))
-            connection.commit()
-            cursor.close()
-            connection.close()
+        # Async mode: hand the pipeline to the worker pool and free this request thread
+        if run_async:
+            # Thread workers can feed /stream_audio segment by segment while TTS runs,
+            # and /events with stage events
+            live_stream = None
+            feed = None
+            if app.config['JOB_EXECUTOR'] != 'process':
+                # Several voices can't share one live stream; those are fetched per target session
+                if not multi_target:
+                    live_stream = live_audio.open(session_id, mimetype=AUDIO_MIMETYPES.get(voice_audio_format(), 'audio/mpeg'))
+                feed = progress_feeds.open(session_id)
+                _publish_event(feed, 'upload_stored', filename=filename, file_size=file_size,
+                               in_memory=not isinstance(file_path, str))
 
-        return jsonify({
-            'status': 'success',
-            'session_id': session_id,
-            'original_text': original_text,
-            'translated_text': translated_text,
-            'source_language': source_language,
-            'detected_source_language': detected_source_lang,
-            'target_language': target_language,
-            'confidence_score': confidence_score,
-            'audio_available': translated_audio_path is not None,
-            'audio_url': translated_audio_url,
-            'audio_duration': audio_duration,
-            'voice_type': voice_type,
-            'processing_time': processing_time,
-            'file_size': file_size,
-            'download_url': f'/download_audio/{session_id}' if translated_audio_path else None
-        })
+            job = job_manager.submit(process_translation, *pipeline_args, session_id=session_id,
+                                     paths=(file_path,), **pipeline_kwargs)
+            if job is None:
+                if not isinstance(file_path, str):
+                    file_path.close()
+                if live_stream:
+                    live_stream.finish(failed=True)
+                if feed:
+                    feed.finish()
+                return jsonify({'error': 'Server busy, too many pending jobs. Please retry shortly.'}), 503
+
+            return jsonify({
+                'status': 'accepted',
+                'job_id': job['job_id'],
+                'session_id': session_id,
+                'status_url': f"/jobs/{job['job_id']}",
+                'result_url': f"/jobs/{job['job_id']}/result",
+                'audio_url': f"/stream_audio/{session_id}" if live_stream else None,
+                'events_url': f"/events/{session_id}" if feed else None,
+                **({'parent_session_id': session_id, 'target_languages': target_languages} if multi_target else {})
+            }), 202
+
+        return jsonify(process_translation(*pipeline_args, **pipeline_kwargs))
 
     except Exception as e:
         logger.error(f"Upload processing failed: {e}")
         return jsonify({'error': f'Processing failed: {str(e)}'}), 500
 
+batch_executor = ThreadPoolExecutor(max_workers=app.config['BATCH_CONCURRENCY'], thread_name_prefix='batch')
+
+def _run_batch_item(item):
+    """Pipeline run for one stored batch file, answering from an earlier session when possible"""
+    session_id, file_path, filename, file_size, source_language, target_language, voice_type, content_hash, user_id = item['args']
+    if app.config['REUSE_RESULTS']:
+        previous = find_reusable_translation(content_hash, source_language, target_language, voice_type)
+        if previous:
+            os.remove(file_path)
+            RESULT_REUSE.inc()
+            return reuse_translation(previous, session_id, filename, file_size, user_id)
+    return process_translation(*item['args'])
+
+def _batch_line(payload):
+    return json.dumps(payload, ensure_ascii=False) + '\n'
+
+@app.route('/upload/batch', methods=['POST'])
+def upload_batch():
+    """Translate several recordings (files and/or zip archives) with the same settings.
+
+    Files run through the pipeline in parallel on a shared bounded pool.
+    The response is NDJSON: a manifest line with every file's session id
+    and status, one line per file as it completes, then a summary. With
+    stream=false one JSON document is returned once all are done; with
+    async=true the files are queued as jobs and the manifest links them.
+    """
+    uploads = request.files.getlist('files') + request.files.getlist('file')
+    if not uploads:
+        return jsonify({'error': 'No files provided'}), 400
+
+    source_language = request.form.get('source_language', 'auto')
+    target_language = request.form.get('target_language', 'en')
+    voice_type = request.form.get('voice_type', 'standard')
+    user_id = request.form.get('user_id', '').strip()[:128] or None
+    batch_id = str(uuid.uuid4())
+    started = time.perf_counter()
+
+    items = []
+    try:
+        with BatchFiles(uploads, allowed_file, max_files=app.config['BATCH_MAX_FILES'],
+                        max_unpacked_bytes=app.config['BATCH_MAX_UNPACKED_MB'] * 1024 * 1024) as batch:
+            for index, entry in enumerate(batch.entries):
+                item = {'index': index, 'filename': entry.filename}
+                items.append(item)
+                if entry.error:
+                    item.update(status='rejected', error=entry.error)
+                    continue
+
+                session_id = str(uuid.uuid4())
+                file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{session_id}_{entry.filename}")
+                try:
+                    file_size, content_hash = save_upload(FileStorage(stream=entry.open()), file_path)
+                except (OSError, RuntimeError, zipfile.BadZipFile) as e:
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                    item.update(status='rejected', error=f'Could not read file: {e}')
+                    continue
+                item.update(session_id=session_id, status='queued', file_size=file_size,
+                            args=(session_id, file_path, entry.filename, file_size, source_language,
+                                  target_language, voice_type, content_hash, user_id))
+    except BatchError as e:
+        for item in items:
+            if 'args' in item:
+                os.remove(item['args'][1])
+        return jsonify({'error': str(e)}), 400
+
+    queued = [item for item in items if item['status'] == 'queued']
+    logger.info(f"📦 Batch {batch_id}: {len(queued)} files queued, {len(items) - len(queued)} rejected")
+
+    def manifest_entry(item):
+        return {key: item[key] for key in ('index', 'filename', 'session_id', 'status', 'error', 'job_id',
+                                           'status_url', 'result_url') if key in item}
+
+    if wants_async_upload():
+        for item in queued:
+            job = job_manager.submit(process_translation, *item['args'], session_id=item['session_id'],
+                                     paths=(item['args'][1],))
+            if job is None:
+                os.remove(item['args'][1])
+                item.update(status='rejected', error='Server busy, too many pending jobs')
+                continue
+            item.update(status='accepted', job_id=job['job_id'],
+                        status_url=f"/jobs/{job['job_id']}", result_url=f"/jobs/{job['job_id']}/result")
+        return jsonify({'batch_id': batch_id, 'files': [manifest_entry(item) for item in items]}), 202
+
+    def results():
+        futures = {batch_executor.submit(_run_batch_item, item): item for item in queued}
+        try:
+            for future in as_completed(futures):
+                item = futures[future]
+                line = {'type': 'result', 'index': item['index'], 'filename': item['filename'],
+                        'session_id': item['session_id']}
+                try:
+                    line.update(status='completed', result=future.result())
+                except Exception as e:
+                    logger.error(f"Batch {batch_id} file {item['filename']} failed: {e}")
+                    line.update(status='failed', error=str(e))
+                yield line
+        finally:
+            # Client went away: drop files that haven't started; running ones finish and are saved
+            for future, item in futures.items():
+                if future.cancel() and os.path.exists(item['args'][1]):
+                    os.remove(item['args'][1])
+
+    def summary(lines):
+        counts = {'completed': 0, 'failed': 0}
+        for line in lines:
+            counts[line['status']] += 1
+        return {'type': 'summary', 'batch_id': batch_id, **counts,
+                'rejected': len(items) - len(queued), 'processing_time': time.perf_counter() - started}
+
+    manifest = {'type': 'manifest', 'batch_id': batch_id, 'files': [manifest_entry(item) for item in items]}
+
+    if str(request.args.get('stream', request.form.get('stream', 'true'))).lower() in ('0', 'false', 'no'):
+        lines = sorted(results(), key=lambda line: line['index'])
+        return jsonify({**manifest, 'results': lines, 'summary': summary(lines)})
+
+    def generate():
+        yield _batch_line(manifest)
+        lines = []
+        for line in results():
+            lines.append(line)
+            yield _batch_line(line)
+        yield _batch_line(summary(lines))
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """Report status and progress of an asynchronous upload"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Return the translation result once an asynchronous upload has finished"""
+    job, result = job_manager.get_result(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    if job['status'] == JOB_COMPLETED:
+        return jsonify(result)
+    if job['status'] == JOB_FAILED:
+        return jsonify({'error': f"Processing failed: {job['error']}", 'job': job}), 500
+
+    # Still queued or running
+    return jsonify(job), 202
+
+@app.route('/events/<session_id>')
+def session_events(session_id):
+    """Server-Sent Events feed of a session's pipeline stages with timings"""
+    feed = progress_feeds.get(session_id)
+    if not feed:
+        return jsonify({'error': 'No progress feed for this session'}), 404
+
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_event_id = 0
+
+    def generate():
+        for item in feed.iter_events(last_event_id=last_event_id):
+            if item is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield format_sse(*item)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def expired_audio_response(expired_at):
+    return jsonify({
+        'error': 'expired',
+        'message': 'The audio for this session was removed by the storage retention policy',
+        'expired_at': expired_at
+    }), 410
+
+def load_audio_metadata(session_id, use_cache=True):
+    """Delivery metadata of a session's voice file, or None if there is no audio.
+
+    Cached per session: repeat plays and Range requests skip the database
+    query and the existence check. The strong ETag is the file's sha256,
+    computed once and stored in translations.audio_hash.
+    """
+    if use_cache:
+        metadata = audio_metadata.get(session_id)
+        if metadata:
+            return metadata
+
+    connection = get_db_connection()
+    if not connection:
+        raise sqlite3.Error('Database connection failed')
+    try:
+        result = connection.execute("""
+        SELECT translated_audio_path, target_language, detected_source_language,
+               expired_at, last_accessed_at, audio_hash
+        FROM translations WHERE session_id = ?
+        """, (session_id,)).fetchone()
+    finally:
+        connection.close()
+
+    if not result:
+        return None
+    if result['expired_at']:
+        metadata = {'expired_at': result['expired_at']}
+        audio_metadata.put(session_id, metadata)
+        return metadata
+
+    path = result['translated_audio_path']
+    if not path or not os.path.exists(path):
+        return None
+
+    audio_hash = result['audio_hash']
+    if not audio_hash:
+        audio_hash = file_content_hash(path)
+        with database.transaction() as cursor:
+            cursor.execute("UPDATE translations SET audio_hash = ? WHERE session_id = ?", (audio_hash, session_id))
+
+    all_languages = get_comprehensive_language_support()
+    source_lang_name = all_languages.get(result['detected_source_language'], 'Unknown')
+    target_lang_name = all_languages.get(result['target_language'], 'Unknown')
+    extension = os.path.splitext(path)[1] or '.mp3'
+    metadata = {
+        'expired_at': None,
+        'path': path,
+        'mimetype': audio_mimetype(path),
+        'etag': audio_hash,
+        'download_name': f"voice_translation_{source_lang_name}_to_{target_lang_name}_{session_id}{extension}",
+        'last_accessed_at': result['last_accessed_at']
+    }
+    audio_metadata.put(session_id, metadata)
+    return metadata
+
+def record_audio_access(session_id, metadata):
+    """Remember when a session's audio was last served; retention evicts the least recently streamed first"""
+    now = time.time()
+    last_accessed_at = metadata.get('last_accessed_at')
+    if last_accessed_at and now - last_accessed_at < AUDIO_ACCESS_TOUCH_INTERVAL:
+        return
+    metadata['last_accessed_at'] = now
+    try:
+        with database.transaction() as cursor:
+            cursor.execute("UPDATE translations SET last_accessed_at = ? WHERE session_id = ?", (now, session_id))
+    except sqlite3.Error as e:
+        logger.warning(f"Could not record audio access for {session_id}: {e}")
+
+def send_session_audio(session_id, as_attachment=False):
+    """Serve a session's voice with Range (206), strong ETag and If-None-Match (304) support"""
+    for use_cache in (True, False):
+        metadata = load_audio_metadata(session_id, use_cache=use_cache)
+        if metadata is None:
+            return jsonify({'error': 'Audio file not found'}), 404
+        if metadata['expired_at']:
+            return expired_audio_response(metadata['expired_at'])
+        try:
+            response = send_file(
+                metadata['path'],
+                mimetype=metadata['mimetype'],
+                as_attachment=as_attachment,
+                download_name=metadata['download_name'] if as_attachment else None,
+                conditional=True,
+                etag=metadata['etag'],
+                max_age=app.config['AUDIO_CACHE_MAX_AGE']
+            )
+        except FileNotFoundError:
+            # Removed behind the cache's back (e.g. by the retention CLI); look it up again
+            audio_metadata.invalidate(session_id)
+            continue
+        # Per-user audio: browsers may cache it, shared proxies shouldn't
+        response.cache_control.public = False
+        response.cache_control.private = True
+        record_audio_access(session_id, metadata)
+        return response
+    return jsonify({'error': 'Audio file not found'}), 404
+
 @app.route('/stream_audio/<session_id>')
 def stream_audio(session_id):
     """Stream audio file for real-time playback"""
     try:
-        connection = get_db_connection()
-        if connection:
-            cursor = connection.cursor()
-            cursor.execute(
-                "SELECT translated_audio_path FROM translations WHERE session_id = ?",
-                (session_id,)
+        # Voice still being generated: relay segments as they are synthesized. Once it is
+        # complete the saved file is served instead, with Range, ETag and caching support
+        live_stream = live_audio.get(session_id)
+        if live_stream and not live_stream.done:
+            return Response(
+                stream_with_context(live_stream.iter_chunks()),
+                mimetype=live_stream.mimetype,
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
             )
-            result = cursor.fetchone()
-            cursor.close()
-            connection.close()
-            
-            if result and result['translated_audio_path'] and os.path.exists(result['translated_audio_path']):
-                return send_file(
-                    result['translated_audio_path'],
-                    mimetype='audio/mpeg',
-                    as_attachment=False,
-                    conditional=True
-                )
-            else:
-                return jsonify({'error': 'Audio file not found'}), 404
         
-        return jsonify({'error': 'Database error'}), 500
+        return send_session_audio(session_id)
         
+    except HTTPException:
+        raise  # e.g. 416 for a Range beyond the end of the file
+    except sqlite3.Error as e:
+        logger.error(f"Audio streaming failed: {e}")
+        return jsonify({'error': 'Database error'}), 500
     except Exception as e:
         logger.error(f"Audio streaming failed: {e}")
         return jsonify({'error': 'Streaming failed'}), 500
@@ -653,34 +1493,12 @@ def stream_audio(session_id):
 def download_audio(session_id):
     """Download the translated audio file"""
     try:
-        connection = get_db_connection()
-        if connection:
-            cursor = connection.cursor()
-            cursor.execute(
-                "SELECT translated_audio_path, target_language, detected_source_language FROM translations WHERE session_id = ?",
-                (session_id,)
-            )
-            result = cursor.fetchone()
-            cursor.close()
-            connection.close()
-            
-            if result and result['translated_audio_path'] and os.path.exists(result['translated_audio_path']):
-                all_languages = get_comprehensive_language_support()
-                source_lang_name = all_languages.get(result['detected_source_language'], 'Unknown')
-                target_lang_name = all_languages.get(result['target_language'], 'Unknown')
-                download_name = f"voice_translation_{source_lang_name}_to_{target_lang_name}_{session_id}.mp3"
-                
-                return send_file(
-                    result['translated_audio_path'],
-                    as_attachment=True,
-                    download_name=download_name,
-                    mimetype='audio/mpeg'
-                )
-            else:
-                return jsonify({'error': 'Audio file not found'}), 404
-        
+        return send_session_audio(session_id, as_attachment=True)
+    except HTTPException:
+        raise  # e.g. 416 for a Range beyond the end of the file
+    except sqlite3.Error as e:
+        logger.error(f"Audio download failed: {e}")
         return jsonify({'error': 'Database error'}), 500
-        
     except Exception as e:
         logger.error(f"Audio download failed: {e}")
         return jsonify({'error': 'Download failed'}), 500
@@ -745,28 +1563,64 @@ def get_voice_options():
         'default': 'standard'
     })
 
+@app.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Translation and TTS cache hit/miss counters"""
+    if not PROCESSING_AVAILABLE:
+        return jsonify({'error': 'Audio processing not available'}), 503
+    return jsonify({
+        'translation_cache': translation_cache.stats(),
+        'tts_cache': tts_cache.stats()
+    })
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/timings/<session_id>', methods=['GET'])
+def get_stage_timings(session_id):
+    """Recorded pipeline stage spans of one session"""
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'error': 'Database error'}), 500
+    try:
+        spans = [dict(row) for row in connection.execute("""
+        SELECT stage, started_offset, duration FROM stage_timings
+        WHERE session_id = ? ORDER BY started_offset
+        """, (session_id,))]
+    finally:
+        connection.close()
+    if not spans:
+        return jsonify({'error': 'No timings for this session'}), 404
+    return jsonify({'session_id': session_id, 'stages': spans})
+
 @app.route('/history', methods=['GET'])
 def get_history():
+    """Translation history, newest first, one page at a time
+
+    Query parameters: limit (default 100, max 500), cursor (next_cursor of the
+    previous page), fields (comma-separated projection), target_language and
+    detected_language (comma-separated), from/to (ISO date or datetime, UTC)
+    and q (full-text search over transcripts and translations).
+    """
+    try:
+        sql, params, fields, limit = build_history_query(
+            request.args, search_available=app.config.get('HISTORY_SEARCH', False))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     try:
         connection = get_db_connection()
         if connection:
-            cursor = connection.cursor()
-            cursor.execute("""
-            SELECT session_id, original_filename, source_language, detected_source_language, 
-                   target_language, original_text, translated_text, translated_audio_url,
-                   file_size, processing_time, confidence_score, voice_type, 
-                   audio_duration, created_at
-            FROM translations 
-            ORDER BY created_at DESC 
-            LIMIT 100
-            """)
-            
-            history = [dict(row) for row in cursor.fetchall()]
-            cursor.close()
-            connection.close()
+            try:
+                history, next_cursor = page_from_rows(connection.execute(sql, params).fetchall(), fields, limit)
+            finally:
+                connection.close()
             return jsonify({
                 'history': history,
-                'total': len(history)
+                'total': len(history),
+                'next_cursor': next_cursor
             })
         
         return jsonify({'error': 'Database connection failed'}), 500
@@ -785,5 +1639,7 @@ if __name__ == '__main__':
     logger.info("📝 Signup page: http://localhost:5000/signup")
     logger.info("🎵 Voice streaming: /stream_audio/<session_id>")
     logger.info("💾 Audio download: /download_audio/<session_id>")
+    logger.info("📈 Metrics: /metrics")
+    logger.info(f"⚙️  Async jobs: /jobs/<job_id> ({app.config['JOB_EXECUTOR']} pool, {app.config['JOB_WORKERS']} workers)")
     
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
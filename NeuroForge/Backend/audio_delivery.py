@@ -0,0 +1,61 @@
+"""
+Lookup cache and validators for /stream_audio and /download_audio
+Session audio metadata (path, mimetype, strong content-hash ETag) is cached in
+memory so repeat plays and Range requests skip the database and filesystem checks
+"""
+
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+def file_content_hash(path, chunk_size=64 * 1024):
+    """sha256 of the file's bytes, used as its strong ETag"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class AudioMetadataCache:
+    """LRU of session_id -> delivery metadata with a TTL, so changes made by
+    another process (e.g. the retention CLI) are picked up eventually"""
+
+    def __init__(self, max_entries=10000, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def get(self, session_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry and now - entry[0] <= self.ttl:
+                self._entries.move_to_end(session_id)
+                self._stats['hits'] += 1
+                return entry[1]
+            if entry:
+                del self._entries[session_id]
+            self._stats['misses'] += 1
+            return None
+
+    def put(self, session_id, metadata):
+        with self._lock:
+            self._entries[session_id] = (time.monotonic(), metadata)
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, session_id):
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
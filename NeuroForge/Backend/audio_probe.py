@@ -0,0 +1,339 @@
+"""
+Audio metadata from container and frame headers, without decoding PCM
+WAV, MP3, FLAC and Ogg (Vorbis/Opus) are parsed directly; anything else goes
+through one ffprobe call when it is installed. Results are cached per file
+(path, size and mtime), so repeated probes of the same output are free.
+"""
+
+import os
+import json
+import struct
+import shutil
+import threading
+import subprocess
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+MP3_BITRATES = {
+    # (MPEG version 1, layer) and (MPEG version 2/2.5, layer) -> kbps by index
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MP3_SAMPLE_RATES = {1: [44100, 48000, 32000], 2: [22050, 24000, 16000], 2.5: [11025, 12000, 8000]}
+
+def _result(fmt, duration, channels, frame_rate, sample_width, file_size, bitrate=None):
+    return {
+        'duration': duration,
+        'channels': channels,
+        'frame_rate': frame_rate,
+        'sample_width': sample_width,
+        'format': fmt,
+        'file_size': file_size,
+        'bitrate': bitrate
+    }
+
+def probe_wav(f, file_size):
+    header = f.read(12)
+    if len(header) < 12 or header[8:12] != b'WAVE' or header[:4] not in (b'RIFF', b'RIFX'):
+        return None
+    endian = '<' if header[:4] == b'RIFF' else '>'
+    fmt = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            return None
+        chunk_id, chunk_size = chunk[:4], struct.unpack(endian + 'I', chunk[4:])[0]
+        if chunk_id == b'fmt ':
+            body = f.read(chunk_size)
+            _, channels, sample_rate, byte_rate, _, bits = struct.unpack(endian + 'HHIIHH', body[:16])
+            fmt = (channels, sample_rate, byte_rate, bits)
+            if chunk_size % 2:
+                f.seek(1, os.SEEK_CUR)
+        elif chunk_id == b'data':
+            if not fmt or not fmt[2]:
+                return None
+            # Streamed WAVs may leave the data size unset; use what is on disk
+            available = file_size - f.tell()
+            data_size = available if chunk_size in (0, 0xFFFFFFFF) else min(chunk_size, available)
+            channels, sample_rate, byte_rate, bits = fmt
+            return _result('WAV', data_size / byte_rate, channels, sample_rate, bits // 8, file_size, byte_rate * 8)
+        else:
+            f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+
+def _mp3_frame(data, offset):
+    """(frame length, samples, sample rate, channels, kbps) of a frame header at offset, or None"""
+    if offset + 4 > len(data):
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version_bits, layer_bits = (b1 >> 3) & 3, (b1 >> 1) & 3
+    bitrate_index, rate_index = b2 >> 4, (b2 >> 2) & 3
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    version = {3: 1, 2: 2, 0: 2.5}[version_bits]
+    layer = 4 - layer_bits
+    kbps = MP3_BITRATES[(1 if version == 1 else 2, layer)][bitrate_index]
+    sample_rate = MP3_SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 1
+    channels = 1 if (b3 >> 6) == 3 else 2
+    if layer == 1:
+        samples = 384
+        length = (12 * kbps * 1000 // sample_rate + padding) * 4
+    else:
+        samples = 1152 if layer == 2 or version == 1 else 576
+        length = samples // 8 * kbps * 1000 // sample_rate + padding
+    return length, samples, sample_rate, channels, kbps
+
+MP3_READ_CHUNK = 64 * 1024
+
+def _info_tag(data, offset, length):
+    """Position of a Layer III frame's Xing/Info or VBRI tag and its name, or (None, None)"""
+    b1, b3 = data[offset + 1], data[offset + 3]
+    if (b1 >> 1) & 3 != 1:
+        return None, None
+    # Xing/Info directly follows the side info: 17/32 bytes (mono/stereo) for MPEG1, 9/17 for MPEG2/2.5
+    mono = (b3 >> 6) == 3
+    side_info = (17 if mono else 32) if (b1 >> 3) & 3 == 3 else (9 if mono else 17)
+    tag = offset + 4 + side_info
+    if tag + 4 <= offset + length and data[tag:tag + 4] in (b'Xing', b'Info'):
+        return tag, 'Xing'
+    # VBRI always sits 32 bytes after the header
+    if length >= 40 and data[offset + 36:offset + 40] == b'VBRI':
+        return offset + 36, 'VBRI'
+    return None, None
+
+def _info_totals(data, tag, kind):
+    """(frames, stream bytes) declared by a Xing/Info or VBRI tag; None where absent"""
+    if kind == 'VBRI':
+        if tag + 18 > len(data):
+            return None, None
+        return struct.unpack('>I', data[tag + 14:tag + 18])[0], struct.unpack('>I', data[tag + 10:tag + 14])[0]
+    flags = struct.unpack('>I', data[tag + 4:tag + 8])[0] if tag + 8 <= len(data) else 0
+    position = tag + 8
+    frames = stream_bytes = None
+    if flags & 0x1 and position + 4 <= len(data):
+        frames = struct.unpack('>I', data[position:position + 4])[0]
+        position += 4
+    if flags & 0x2 and position + 4 <= len(data):
+        stream_bytes = struct.unpack('>I', data[position:position + 4])[0]
+    return frames, stream_bytes
+
+def _skip_id3(data, offset):
+    if data[offset:offset + 3] == b'ID3' and offset + 10 <= len(data):
+        size = data[offset + 6:offset + 10]
+        tag_size = (size[0] << 21) | (size[1] << 14) | (size[2] << 7) | size[3]
+        footer = 10 if data[offset + 5] & 0x10 else 0
+        return offset + 10 + tag_size + footer
+    return offset
+
+class _Window:
+    """Sliding read window over a file, so large MP3s are walked without loading them whole"""
+
+    def __init__(self, f):
+        self.f = f
+        self.data = b''
+        self.base = 0
+
+    def at(self, offset, size):
+        """Buffer holding file bytes [offset, offset + size) where the file has them, and offset's position in it"""
+        if offset < self.base or offset + size > self.base + len(self.data):
+            if offset >= self.base + len(self.data):
+                self.f.seek(offset)
+                self.data = b''
+            else:
+                self.data = self.data[offset - self.base:]
+            self.base = offset
+            self.data += self.f.read(max(MP3_READ_CHUNK, size - len(self.data)))
+        return self.data, offset - self.base
+
+def probe_mp3(f, file_size):
+    """Walk every frame header: exact for CBR, VBR and concatenated streams such as joined gTTS segments.
+
+    The file is read through a bounded window. A leading Xing/Info or VBRI
+    frame whose byte count covers the whole file answers without walking.
+    """
+    window = _Window(f)
+    data, _ = window.at(0, 10)
+    offset = _skip_id3(data, 0)
+    start = offset
+    frame_bytes = 0
+    samples_total = 0
+    frames = 0
+    sample_rate = channels = None
+    bits_total = 0
+    while offset < file_size:
+        # Room for the largest frame (Layer II at 384 kbps / 8 kHz) and the header after it
+        data, position = window.at(offset, 7000)
+        frame = _mp3_frame(data, position)
+        # A sync word only counts when the next frame (or the end of the file) follows it
+        if frame and frame[0] > 0:
+            following = position + frame[0]
+            if following < len(data) and data[following:following + 3] != b'ID3' \
+                    and data[following:following + 3] != b'TAG' and not _mp3_frame(data, following):
+                frame = None
+        if frame is None or frame[0] <= 0:
+            # Resynchronise past junk or an embedded ID3 tag
+            skipped = _skip_id3(data, position)
+            if skipped != position:
+                offset += skipped - position
+                continue
+            next_sync = data.find(b'\xff', position + 1)
+            if next_sync < 0:
+                offset += len(data) - position
+                continue
+            offset += next_sync - position
+            continue
+        length, samples, rate, frame_channels, kbps = frame
+        tag, kind = _info_tag(data, position, length)
+        if tag is None:
+            samples_total += samples
+            frames += 1
+            bits_total += kbps * 1000 * samples / rate
+        elif not frames and offset == start:
+            declared_frames, stream_bytes = _info_totals(data, tag, kind)
+            # Joined segments each carry their own header; only trust one that spans the file
+            if declared_frames and stream_bytes and stream_bytes >= 0.98 * (file_size - start):
+                duration = declared_frames * samples / rate
+                return _result('MP3', duration, frame_channels, rate, 2, file_size,
+                               int(stream_bytes * 8 / duration) if duration else None)
+        sample_rate, channels = sample_rate or rate, channels or frame_channels
+        frame_bytes += length
+        offset += length
+    # Chance sync words in non-MP3 data never add up to most of the file
+    if not frames or frame_bytes < (file_size - start) / 2:
+        return None
+    duration = samples_total / sample_rate
+    # MP3 decodes to 16-bit PCM, which is what pydub reports for it
+    return _result('MP3', duration, channels, sample_rate, 2, file_size, int(bits_total / duration) if duration else None)
+
+def probe_flac(f, file_size):
+    if f.read(4) != b'fLaC':
+        return None
+    header = f.read(4)
+    if len(header) < 4 or header[0] & 0x7F != 0:  # first block must be STREAMINFO
+        return None
+    info = f.read(34)
+    if len(info) < 34:
+        return None
+    packed = int.from_bytes(info[10:18], 'big')
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    bits = ((packed >> 36) & 0x1F) + 1
+    total_samples = packed & 0xFFFFFFFFF
+    if not sample_rate:
+        return None
+    duration = total_samples / sample_rate
+    return _result('FLAC', duration, channels, sample_rate, (bits + 7) // 8, file_size,
+                   int(file_size * 8 / duration) if duration else None)
+
+def probe_ogg(f, file_size):
+    page = f.read(4096)
+    if page[:4] != b'OggS':
+        return None
+    segments = page[26]
+    packet = page[27 + segments:]
+    if packet[:7] == b'\x01vorbis':
+        channels, sample_rate = packet[11], struct.unpack('<I', packet[12:16])[0]
+        codec, pre_skip, granule_rate = 'OGG', 0, sample_rate
+    elif packet[:8] == b'OpusHead':
+        channels, pre_skip, sample_rate = packet[9], struct.unpack('<H', packet[10:12])[0], struct.unpack('<I', packet[12:16])[0]
+        codec, granule_rate = 'OPUS', 48000  # Opus granule positions always count 48 kHz samples
+    else:
+        return None
+
+    # The last page's granule position is the stream's total sample count
+    f.seek(max(0, file_size - 65536))
+    tail = f.read()
+    last = tail.rfind(b'OggS')
+    if last < 0 or last + 14 > len(tail):
+        return None
+    granule = struct.unpack('<q', tail[last + 6:last + 14])[0]
+    duration = max(0, granule - pre_skip) / granule_rate
+    return _result(codec, duration, channels, sample_rate, None, file_size,
+                   int(file_size * 8 / duration) if duration else None)
+
+PROBES = {'.wav': probe_wav, '.mp3': probe_mp3, '.flac': probe_flac, '.ogg': probe_ogg, '.opus': probe_ogg}
+
+def probe_with_ffprobe(path, file_size):
+    ffprobe = shutil.which('ffprobe')
+    if not ffprobe:
+        return None
+    try:
+        completed = subprocess.run(
+            [ffprobe, '-v', 'error', '-select_streams', 'a:0',
+             '-show_entries', 'format=duration,format_name,bit_rate:stream=channels,sample_rate',
+             '-of', 'json', path],
+            capture_output=True, text=True, timeout=15, check=True
+        )
+        probed = json.loads(completed.stdout)
+        stream = (probed.get('streams') or [{}])[0]
+        container = probed.get('format', {})
+        return _result(
+            container.get('format_name', '').split(',')[0].upper(),
+            float(container.get('duration', 0.0)),
+            stream.get('channels'),
+            int(stream['sample_rate']) if stream.get('sample_rate') else None,
+            None,
+            file_size,
+            int(container['bit_rate']) if container.get('bit_rate') else None
+        )
+    except (subprocess.SubprocessError, ValueError, KeyError) as e:
+        logger.debug(f"ffprobe failed for {path}: {e}")
+        return None
+
+class AudioProbe:
+    """Header probe with an LRU cache keyed on (path, size, mtime)"""
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def probe(self, path):
+        """Metadata dict (duration, channels, frame_rate, sample_width, format, file_size, bitrate) or None"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return dict(self._cache[key])
+
+        info = self._probe_uncached(path, stat.st_size)
+        if info:
+            with self._lock:
+                self._cache[key] = info
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+            info = dict(info)
+        return info
+
+    def _probe_uncached(self, path, file_size):
+        extension = os.path.splitext(path)[1].lower()
+        # Try the parser for the extension first, then the others (uploads can be misnamed)
+        parsers = [PROBES[extension]] if extension in PROBES else []
+        parsers += [parser for parser in (probe_wav, probe_flac, probe_ogg, probe_mp3) if parser not in parsers]
+        for parser in parsers:
+            try:
+                with open(path, 'rb') as f:
+                    info = parser(f, file_size)
+                if info:
+                    return info
+            except (OSError, struct.error, IndexError, ValueError) as e:
+                logger.debug(f"{parser.__name__} could not read {path}: {e}")
+        return probe_with_ffprobe(path, file_size)
+
+_default_probe = AudioProbe()
+
+def probe_audio(path):
+    """Probe with the process-wide cache"""
+    return _default_probe.probe(path)
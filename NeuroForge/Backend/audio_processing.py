@@ -1,9 +1,21 @@
 import os
+import io
+import re
+import time
+import shutil
+import subprocess
 import speech_recognition as sr
-from deep_translator import GoogleTranslator
-from gtts import gTTS
 from pydub import AudioSegment
+from pydub.silence import detect_nonsilent
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from translation_cache import cache_from_environment
+from tts_cache import tts_cache_from_environment
+from engines import create_recognizer, get_engine
+from metrics import external_call
+from audio_probe import probe_audio
+from language_id import rank_languages
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,126 +35,463 @@ else:
     logger.warning("⚠️ FFmpeg not found. Audio conversion may fail.")
 
 # Initialize recognizer with optimized settings
-recognizer = sr.Recognizer()
-recognizer.energy_threshold = 300
-recognizer.dynamic_energy_threshold = True
-recognizer.pause_threshold = 0.8
-recognizer.operation_timeout = None
-recognizer.phrase_timeout = None
-recognizer.non_speaking_duration = 0.5
-
-def audio_to_text(file_path, src_lang="en-US"):
-    """Enhanced audio to text conversion"""
-    temp_files = []
-    
-    try:
-        wav_file = f"temp_{os.path.basename(file_path)}.wav"
-        temp_files.append(wav_file)
-        
-        file_format = os.path.splitext(file_path)[1][1:].lower()
-        
-        # Enhanced audio preprocessing
-        audio = AudioSegment.from_file(file_path, format=file_format)
-        
+recognizer = create_recognizer()
+
+# Number of candidate languages recognized at the same time during auto-detection
+DETECTION_WORKERS = int(os.environ.get('NEUROFORGE_DETECTION_WORKERS', 6))
+
+# Local language ID on a first-pass transcript narrows auto-detection to a few candidates
+LANGUAGE_ID_ENABLED = os.environ.get('NEUROFORGE_LANGUAGE_ID', 'true').lower() in ('1', 'true', 'yes')
+LANGUAGE_ID_KEEP = int(os.environ.get('NEUROFORGE_LANGUAGE_ID_KEEP', 2))  # second-pass recognitions at most
+LANGUAGE_ID_ACCEPT = float(os.environ.get('NEUROFORGE_LANGUAGE_ID_ACCEPT', 0.2))  # score floor of a top-ranked first pass
+
+# Long-audio mode: recordings longer than this are split at silences and transcribed chunk by chunk
+LONG_AUDIO_THRESHOLD = float(os.environ.get('NEUROFORGE_LONG_AUDIO_THRESHOLD', 60))  # seconds
+CHUNK_MAX_DURATION = float(os.environ.get('NEUROFORGE_CHUNK_MAX_DURATION', 30))  # seconds
+CHUNK_MIN_SILENCE = 500  # ms of silence that counts as a split point
+TRANSCRIPTION_WORKERS = int(os.environ.get('NEUROFORGE_TRANSCRIPTION_WORKERS', 4))
+
+# Long translations are sent as sentence/paragraph-aligned segments, several at a time
+TRANSLATION_SEGMENT_CHARS = int(os.environ.get('NEUROFORGE_TRANSLATION_SEGMENT_CHARS', 4500))  # GoogleTranslator max is 5000
+TRANSLATION_WORKERS = int(os.environ.get('NEUROFORGE_TRANSLATION_WORKERS', 4))
+
+# Speech is synthesized as sentence-sized segments, several at a time, then joined
+TTS_SEGMENT_CHARS = int(os.environ.get('NEUROFORGE_TTS_SEGMENT_CHARS', 300))
+TTS_WORKERS = int(os.environ.get('NEUROFORGE_TTS_WORKERS', 4))
+
+# Playback speed of the "fast" voice (pitch is preserved)
+FAST_VOICE_TEMPO = float(os.environ.get('NEUROFORGE_FAST_VOICE_TEMPO', 1.25))
+
+# Paragraph breaks, and sentence ends in Latin, Devanagari and CJK punctuation
+TEXT_BOUNDARY = re.compile(r'(\n\s*\n|(?<=[.!?।॥])\s+|(?<=[。！？]))')
+
+# Cache for translate_text (in-process LRU + translation_cache table in neuroforge.db)
+translation_cache = cache_from_environment()
+
+# Content-addressed cache for text_to_speech output (output_audio/tts_cache)
+tts_cache = tts_cache_from_environment()
+
+# Prefixes of audio_to_text results that are error messages rather than transcripts
+FAILED_TRANSCRIPT_PREFIXES = ('Could not', 'Speech recognition service error', 'Error processing audio')
+
+class PreparedAudio:
+    """Audio decoded and preprocessed once so it can be recognized many times.
+
+    The source can be a file path or an in-memory upload (bytes or a readable
+    file object such as BytesIO or a SpooledTemporaryFile); for in-memory
+    sources file_format must be given. Holds the 16 kHz mono, high-pass
+    filtered recording plus the AudioData captured after ambient noise
+    calibration. Nothing is written to disk. Instances are read-only after
+    construction and safe to share between recognition threads.
+    """
+
+    def __init__(self, source, file_format=None):
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+
+        if isinstance(source, str):
+            self.file_path = source
+            self.format = file_format or os.path.splitext(source)[1][1:].lower()
+            file_size = os.path.getsize(source)
+        else:
+            self.file_path = None
+            self.format = (file_format or '').lower()
+            source.seek(0, os.SEEK_END)
+            file_size = source.tell()
+            source.seek(0)
+
+        audio = AudioSegment.from_file(source, format=self.format or None)
+
+        # Keep the original properties for get_audio_info
+        self.info = {
+            'duration': len(audio) / 1000.0,
+            'channels': audio.channels,
+            'frame_rate': audio.frame_rate,
+            'sample_width': audio.sample_width,
+            'format': self.format.upper(),
+            'file_size': file_size
+        }
+
         # Optimize for speech recognition
         audio = audio.normalize()
         if audio.channels > 1:
             audio = audio.set_channels(1)
         if audio.frame_rate != 16000:
             audio = audio.set_frame_rate(16000)
-        
+
         # Apply noise reduction
         audio = audio.high_pass_filter(80)
-        
-        # Export optimized audio
-        audio.export(wav_file, format="wav")
-        
-        # Speech recognition
-        with sr.AudioFile(wav_file) as source:
-            recognizer.adjust_for_ambient_noise(source, duration=0.5)
-            audio_data = recognizer.record(source)
-            
+        self.audio = audio
+
+        # Export optimized audio to memory
+        wav_buffer = io.BytesIO()
+        audio.export(wav_buffer, format="wav")
+        wav_buffer.seek(0)
+
+        # Calibrate and capture the recording once
+        with sr.AudioFile(wav_buffer) as wav_source:
+            calibration_recognizer = create_recognizer()
+            calibration_recognizer.adjust_for_ambient_noise(wav_source, duration=0.5)
+            self.energy_threshold = calibration_recognizer.energy_threshold
+            self.audio_data = calibration_recognizer.record(wav_source)
+
+        self._chunks = {}
+        self._chunks_lock = threading.Lock()
+
+    @property
+    def duration(self):
+        return self.info['duration']
+
+    def chunk_ranges(self, max_duration=None):
+        """(start_ms, end_ms) ranges split at silences; computed once per upload and length"""
+        max_ms = int((max_duration or CHUNK_MAX_DURATION) * 1000)
+        with self._chunks_lock:
+            if max_ms not in self._chunks:
+                self._chunks[max_ms] = split_at_silence(self.audio, max_ms)
+            return self._chunks[max_ms]
+
+def split_at_silence(audio, max_chunk_ms, min_silence_len=CHUNK_MIN_SILENCE):
+    """Split audio into (start_ms, end_ms) ranges no longer than max_chunk_ms.
+
+    Cuts are placed in the middle of silent stretches so words stay whole;
+    speech that runs longer than max_chunk_ms without a pause is cut hard.
+    """
+    total_ms = len(audio)
+    if total_ms <= max_chunk_ms:
+        return [(0, total_ms)]
+
+    silence_thresh = audio.dBFS - 16 if audio.dBFS != float('-inf') else -50
+    speech = detect_nonsilent(audio, min_silence_len=min_silence_len,
+                              silence_thresh=silence_thresh, seek_step=10)
+    if not speech:
+        return []
+
+    # Candidate cut points: middle of each pause between speech ranges
+    cuts = [(speech[i][1] + speech[i + 1][0]) // 2 for i in range(len(speech) - 1)]
+
+    ranges = []
+    start = 0
+    last_cut = None
+    for cut in cuts + [total_ms]:
+        while cut - start > max_chunk_ms:
+            if last_cut is not None and last_cut > start:
+                ranges.append((start, last_cut))
+                start = last_cut
+            else:
+                ranges.append((start, start + max_chunk_ms))
+                start += max_chunk_ms
+            last_cut = None
+        last_cut = cut
+    if start < total_ms:
+        ranges.append((start, total_ms))
+    return ranges
+
+def transcribe_long_audio(prepared, src_lang="en-US", max_workers=None, max_chunk_duration=None):
+    """Transcribe silence-split chunks of a PreparedAudio concurrently and join them in order.
+
+    A chunk that can't be recognized only loses its own text; the call fails
+    only when no chunk produced any text.
+    """
+    ranges = prepared.chunk_ranges(max_chunk_duration)
+    if not ranges:
+        return f"Could not understand audio in {src_lang}"
+
+    audio = prepared.audio
+
+    def recognize_chunk(chunk_range):
+        start_ms, end_ms = chunk_range
+        segment = audio[start_ms:end_ms]
+        chunk_data = sr.AudioData(segment.raw_data, segment.frame_rate, segment.sample_width)
+        with external_call('asr', ignore=sr.UnknownValueError):
+            return get_engine('asr').recognize(chunk_data, src_lang, energy_threshold=prepared.energy_threshold)
+
+    workers = max(1, min(max_workers or TRANSCRIPTION_WORKERS, len(ranges)))
+    texts = [None] * len(ranges)
+    errors = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='asr-chunk') as executor:
+        futures = {executor.submit(recognize_chunk, chunk_range): index for index, chunk_range in enumerate(ranges)}
+        for future in as_completed(futures):
+            index = futures[future]
             try:
-                text = recognizer.recognize_google(audio_data, language=src_lang)
-                return text
+                texts[index] = future.result()
             except sr.UnknownValueError:
-                return f"Could not understand audio in {src_lang}"
-            except sr.RequestError as e:
-                return f"Speech recognition service error: {e}"
+                logger.debug(f"Chunk {index + 1}/{len(ranges)} had no recognizable speech")
+            except Exception as e:
+                logger.warning(f"Chunk {index + 1}/{len(ranges)} transcription failed: {e}")
+                errors.append(e)
+
+    transcript = ' '.join(text.strip() for text in texts if text and text.strip())
+    logger.info(f"Long audio transcribed: {sum(1 for t in texts if t)}/{len(ranges)} chunks recognized")
+
+    if transcript:
+        return transcript
+    if errors:
+        return f"Speech recognition service error: {errors[0]}"
+    return f"Could not understand audio in {src_lang}"
+
+def prepare_audio(source, file_format=None):
+    """Decode and preprocess an audio file or in-memory upload, or None on failure"""
+    try:
+        return PreparedAudio(source, file_format=file_format)
+    except Exception as e:
+        logger.error(f"Audio preparation failed: {e}")
+        return None
+
+def audio_to_text(file_path, src_lang="en-US", long_audio=None):
+    """Enhanced audio to text conversion
+
+    file_path may also be a PreparedAudio, in which case no decoding is done.
+    No temporary files are written. long_audio forces (True) or disables
+    (False) chunked transcription; by default recordings longer than
+    LONG_AUDIO_THRESHOLD are chunked.
+    """
+    try:
+        prepared = file_path if isinstance(file_path, PreparedAudio) else PreparedAudio(file_path)
+        
+        if long_audio is None:
+            long_audio = prepared.duration > LONG_AUDIO_THRESHOLD
+        if long_audio:
+            return transcribe_long_audio(prepared, src_lang=src_lang)
+
+        # Speech recognition through the configured ASR engine
+        try:
+            with external_call('asr', ignore=sr.UnknownValueError):
+                text = get_engine('asr').recognize(prepared.audio_data, src_lang,
+                                                   energy_threshold=prepared.energy_threshold)
+            return text
+        except sr.UnknownValueError:
+            return f"Could not understand audio in {src_lang}"
+        except sr.RequestError as e:
+            return f"Speech recognition service error: {e}"
                 
     except Exception as e:
         logger.error(f"Audio to text conversion failed: {e}")
         return f"Error processing audio: {str(e)}"
-    
-    finally:
-        # Cleanup temporary files
-        for temp_file in temp_files:
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
-
-def translate_text(text, src_lang="en", target_lang="hi"):
+
+def _split_keeping_separators(pattern, text):
+    """Split text so that joining the pieces gives back the original exactly"""
+    parts = pattern.split(text)
+    pieces = [parts[i] + (parts[i + 1] if i + 1 < len(parts) else '') for i in range(0, len(parts), 2)]
+    return [piece for piece in pieces if piece]
+
+def split_text_segments(text, max_chars=TRANSLATION_SEGMENT_CHARS):
+    """Split text into segments of at most max_chars on paragraph and sentence boundaries.
+
+    Sentences longer than max_chars are split between words, and only words
+    longer than that are cut. Joining the segments gives back the original text.
+    """
+    units = []
+    for sentence in _split_keeping_separators(TEXT_BOUNDARY, text):
+        if len(sentence) <= max_chars:
+            units.append(sentence)
+            continue
+        for word in _split_keeping_separators(re.compile(r'(\s+)'), sentence):
+            units.extend(word[i:i + max_chars] for i in range(0, len(word), max_chars))
+
+    segments = []
+    current = ''
+    for unit in units:
+        if current and len(current) + len(unit) > max_chars:
+            segments.append(current)
+            current = ''
+        current += unit
+    if current:
+        segments.append(current)
+    return segments
+
+def _translate_segments(segments, src_lang, target_lang, max_workers=None):
+    """Translate segments concurrently, preserving order and surrounding whitespace"""
+    # Translator clients keep request state, so each worker thread reuses its own client
+    clients = threading.local()
+    engine = get_engine('mt')
+
+    def translate_segment(segment):
+        body = segment.strip()
+        if not body:
+            return segment
+
+        translated = translation_cache.get(body, src_lang, target_lang, engine.name, segment=True)
+        if translated is None:
+            translator = getattr(clients, 'translator', None)
+            if translator is None:
+                translator = clients.translator = engine.translator(src_lang, target_lang)
+            started = time.perf_counter()
+            with external_call('mt'):
+                translated = translator.translate(body) or body
+            translation_cache.put(body, src_lang, target_lang, engine.name, translated, latency=time.perf_counter() - started)
+
+        leading = segment[:len(segment) - len(segment.lstrip())]
+        trailing = segment[len(segment.rstrip()):]
+        return f"{leading}{translated}{trailing}"
+
+    workers = max(1, min(max_workers or TRANSLATION_WORKERS, len(segments)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='translate') as executor:
+        return list(executor.map(translate_segment, segments))
+
+def translate_text(text, src_lang="en", target_lang="hi", max_workers=None):
     """Enhanced text translation"""
     try:
         if not text or text.strip() == "":
             return "No text to translate"
         
-        # Handle long text by splitting into chunks
-        if len(text) > 5000:
-            chunks = [text[i:i+4000] for i in range(0, len(text), 4000)]
-            translated_chunks = []
-            
-            for chunk in chunks:
-                translator = GoogleTranslator(source=src_lang, target=target_lang)
-                translated_chunk = translator.translate(chunk)
-                translated_chunks.append(translated_chunk)
-            
-            return ' '.join(translated_chunks)
+        # Serve repeated phrases from the translation cache
+        engine = get_engine('mt')
+        cached = translation_cache.get(text, src_lang, target_lang, engine.name)
+        if cached is not None:
+            return cached
+        
+        started = time.perf_counter()
+        
+        # Handle long text by translating sentence-aligned segments concurrently
+        if len(text) > TRANSLATION_SEGMENT_CHARS:
+            segments = split_text_segments(text)
+            translated = ''.join(_translate_segments(segments, src_lang, target_lang, max_workers))
+            logger.info(f"Translated {len(segments)} segments ({len(text)} characters)")
         else:
-            translator = GoogleTranslator(source=src_lang, target=target_lang)
-            translated = translator.translate(text)
-            return translated
+            translator = engine.translator(src_lang, target_lang)
+            with external_call('mt'):
+                translated = translator.translate(text)
+        
+        translation_cache.put(text, src_lang, target_lang, engine.name, translated, latency=time.perf_counter() - started)
+        return translated
             
     except Exception as e:
         logger.error(f"Translation failed: {e}")
         return f"Translation error: {str(e)}"
 
-def text_to_speech(text, lang="hi", out_file="output.mp3", voice_type="standard"):
-    """Enhanced text to speech with voice options"""
+def synthesize_speech_segments(text, lang="hi", slow=False, max_workers=None, on_segment=None):
+    """Synthesize sentence-sized segments of text concurrently.
+
+    Returns the audio bytes (in the TTS engine's audio_format) of each
+    segment in text order. on_segment, if given, is called with each
+    segment's bytes in text order as soon as that segment and all before it
+    are ready.
+    """
+    segments = [segment.strip() for segment in split_text_segments(text, TTS_SEGMENT_CHARS)]
+    segments = [segment for segment in segments if segment]
+    engine = get_engine('tts')
+
+    def synthesize(segment):
+        with external_call('tts'):
+            return engine.synthesize(segment, lang, slow=slow)
+
+    workers = max(1, min(max_workers or TTS_WORKERS, len(segments)))
+    audio_segments = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tts') as executor:
+        for audio_bytes in executor.map(synthesize, segments):
+            audio_segments.append(audio_bytes)
+            if on_segment:
+                on_segment(audio_bytes)
+    return audio_segments
+
+def join_audio_segments(audio_segments, audio_format, output):
+    """Write segments as one file. MP3 frames join by concatenation (as gTTS does
+    for its own chunks); other formats carry headers and are re-muxed with pydub."""
+    if audio_format == 'mp3':
+        for audio_bytes in audio_segments:
+            output.write(audio_bytes)
+        return
+
+    joined = AudioSegment.empty()
+    for audio_bytes in audio_segments:
+        joined += AudioSegment.from_file(io.BytesIO(audio_bytes), format=audio_format)
+    joined.export(output, format=audio_format)
+
+def _atempo_filter(tempo):
+    # Older ffmpeg builds limit each atempo stage to 0.5-2.0, so chain stages for larger factors
+    stages = []
+    while tempo > 2.0:
+        stages.append(2.0)
+        tempo /= 2.0
+    while tempo < 0.5:
+        stages.append(0.5)
+        tempo /= 0.5
+    stages.append(tempo)
+    return ','.join(f'atempo={stage:g}' for stage in stages)
+
+def change_tempo(audio_bytes, audio_format, tempo):
+    """Change the playback speed of encoded audio in memory, decoding and encoding once.
+
+    Runs a single ffmpeg atempo pass over pipes; without ffmpeg (only WAV can
+    be decoded then) pydub's speedup is applied to the in-memory audio.
+    """
+    converter = shutil.which(AudioSegment.converter)
+    if converter:
+        completed = subprocess.run(
+            [converter, '-hide_banner', '-loglevel', 'error',
+             '-f', audio_format, '-i', 'pipe:0',
+             '-filter:a', _atempo_filter(tempo),
+             '-f', audio_format, 'pipe:1'],
+            input=audio_bytes, capture_output=True, timeout=120
+        )
+        if completed.returncode != 0 or not completed.stdout:
+            raise RuntimeError(f"ffmpeg atempo failed: {completed.stderr.decode('utf-8', 'replace').strip()}")
+        return completed.stdout
+
+    audio = AudioSegment.from_file(io.BytesIO(audio_bytes), format=audio_format)
+    output = io.BytesIO()
+    audio.speedup(playback_speed=tempo).export(output, format=audio_format)
+    return output.getvalue()
+
+def text_to_speech(text, lang="hi", out_file="output.mp3", voice_type="standard", on_segment=None):
+    """Enhanced text to speech with voice options
+
+    The whole text is spoken: it is synthesized in concurrent sentence
+    segments that are joined into out_file. on_segment receives each
+    segment's audio in order while synthesis is still running (not for cache
+    hits, not for the "fast" voice, which is only final once sped up, and
+    only for MP3 engines, whose segments can be played back to back).
+    Returns the path of the generated audio, which is out_file unless a
+    cached synthesis had to be shared by reference.
+    """
     try:
         if not text or text.strip() == "":
             raise ValueError("No text provided for TTS")
         
-        # Handle text length limitations
-        if len(text) > 1000:
-            text = text[:1000] + "..."
+        engine = get_engine('tts')
+        
+        # Identical text/language/voice was synthesized before: skip synthesis and post-processing
+        cached_file = tts_cache.lookup(text, lang, voice_type, out_file, engine.name, FAST_VOICE_TEMPO)
+        if cached_file:
+            logger.info(f"TTS cache hit: {cached_file}")
+            return cached_file
         
         # Configure TTS based on voice type
         slow_speech = voice_type == "slow"
         
-        # Create TTS object
-        tts = gTTS(text=text, lang=lang, slow=slow_speech)
+        audio_format = engine.audio_format
+        cacheable = True
         
-        # Save to file
-        tts.save(out_file)
+        # Synthesize segments in parallel and write the joined audio once
+        audio_segments = synthesize_speech_segments(
+            text, lang=lang, slow=slow_speech,
+            on_segment=on_segment if voice_type != "fast" and audio_format == 'mp3' else None
+        )
+        if voice_type == "fast":
+            # Speed the joined audio up in memory so out_file is written only once
+            joined = io.BytesIO()
+            join_audio_segments(audio_segments, audio_format, joined)
+            audio_bytes = joined.getvalue()
+            try:
+                audio_bytes = change_tempo(audio_bytes, audio_format, FAST_VOICE_TEMPO)
+                logger.info("Applied fast speech processing")
+            except Exception as e:
+                # Normal-speed audio must not be cached under the fast voice's key
+                cacheable = False
+                logger.warning(f"Could not apply fast speech: {e}")
+            with open(out_file, 'wb') as output:
+                output.write(audio_bytes)
+        else:
+            with open(out_file, 'wb') as output:
+                join_audio_segments(audio_segments, audio_format, output)
         
         if os.path.exists(out_file):
             file_size = os.path.getsize(out_file)
             if file_size > 0:
-                logger.info(f"TTS audio generated: {out_file} ({file_size} bytes)")
-                
-                # Post-process audio based on voice type
-                if voice_type == "fast":
-                    try:
-                        audio = AudioSegment.from_file(out_file)
-                        faster_audio = audio.speedup(playback_speed=1.25)
-                        faster_audio.export(out_file, format="mp3")
-                        logger.info("Applied fast speech processing")
-                    except Exception as e:
-                        logger.warning(f"Could not apply fast speech: {e}")
+                logger.info(f"TTS audio generated: {out_file} ({file_size} bytes, {len(audio_segments)} segments)")
                 
+                if cacheable:
+                    tts_cache.store(text, lang, voice_type, out_file, engine.name, FAST_VOICE_TEMPO)
                 return out_file
             else:
                 raise FileNotFoundError("TTS file was created but is empty")
@@ -153,36 +502,139 @@ def text_to_speech(text, lang="hi", out_file="output.mp3", voice_type="standard"
         logger.error(f"Text to speech conversion failed: {e}")
         raise e
 
+def is_usable_transcript(text):
+    """Check that an audio_to_text result is real text and not an error message"""
+    return bool(text) and not text.startswith(FAILED_TRANSCRIPT_PREFIXES) and len(text.strip()) > 5
+
+def run_language_detection(file_path, candidates, score_fn, threshold, max_workers=None):
+    """Recognize the audio in several candidate languages at the same time.
+
+    candidates is a list of (language_code, speech_recognition_code) pairs in
+    order of preference. Returns (language_code, text, confidence) for the best
+    candidate, or (None, None, 0.0) if nothing was recognized. As soon as one
+    candidate scores above threshold the attempts that haven't started yet are
+    cancelled and the result of the ones still running is ignored.
+    """
+    if not candidates:
+        return None, None, 0.0
+
+    # Decode once and share the prepared audio between all attempts
+    if not isinstance(file_path, PreparedAudio):
+        file_path = prepare_audio(file_path)
+        if file_path is None:
+            return None, None, 0.0
+
+    workers = max(1, min(max_workers or DETECTION_WORKERS, len(candidates)))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='lang-detect')
+    futures = {
+        executor.submit(audio_to_text, file_path, src_lang=sr_lang): (index, lang)
+        for index, (lang, sr_lang) in enumerate(candidates)
+    }
+
+    best_lang = None
+    best_text = None
+    best_confidence = 0.0
+    best_index = len(candidates)
+
+    try:
+        for future in as_completed(futures):
+            index, lang = futures[future]
+            try:
+                text_result = future.result()
+            except Exception as e:
+                logger.debug(f"Language detection failed for {lang}: {e}")
+                continue
+
+            if not is_usable_transcript(text_result):
+                continue
+
+            confidence = score_fn(text_result)
+            # Ties go to the earlier (preferred) candidate, as in the sequential search
+            if confidence > best_confidence or (confidence == best_confidence and index < best_index):
+                best_lang, best_text, best_confidence, best_index = lang, text_result, confidence, index
+
+            if confidence > threshold:
+                logger.info(f"Language detected early: {lang} (confidence {confidence:.2f})")
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return best_lang, best_text, best_confidence
+
+def identify_language(file_path, candidates, score_fn, threshold, keep=None, max_workers=None):
+    """Auto-detection with one first-pass recognition and local language ID.
+
+    The first (most likely) candidate is recognized and its transcript scored
+    offline by script and n-grams (see language_id). If that language ranks
+    top with a score of at least LANGUAGE_ID_ACCEPT it is accepted without
+    further recognition calls. Otherwise a second pass runs
+    run_language_detection over at most `keep` candidates: the next one in
+    preference (history) order, which covers speech the ranking can't see
+    through, and the best ranked others. Takes and returns the same values
+    as run_language_detection (confidence is always score_fn's), which it
+    falls back to when disabled or when the first pass recognizes nothing.
+    """
+    keep = keep or LANGUAGE_ID_KEEP
+    if not LANGUAGE_ID_ENABLED or len(candidates) <= keep + 1:
+        return run_language_detection(file_path, candidates, score_fn, threshold, max_workers)
+
+    if not isinstance(file_path, PreparedAudio):
+        file_path = prepare_audio(file_path)
+        if file_path is None:
+            return None, None, 0.0
+
+    first_lang, first_sr_lang = candidates[0]
+    first_text = audio_to_text(file_path, src_lang=first_sr_lang)
+    if not is_usable_transcript(first_text):
+        return run_language_detection(file_path, candidates[1:], score_fn, threshold, max_workers)
+    first_confidence = score_fn(first_text)
+
+    ranking = rank_languages(first_text, [lang for lang, _ in candidates])
+    if ranking and ranking[0][0] == first_lang and ranking[0][1] >= LANGUAGE_ID_ACCEPT:
+        logger.info(f"Language identified locally: {first_lang} (score {ranking[0][1]:.2f}, 1 recognition)")
+        return first_lang, first_text, first_confidence
+
+    # Ranking order is best first and keeps the preference order among equal scores
+    ranked = [lang for lang, score in ranking if lang != first_lang and score > 0]
+    likely = ranked[:keep - 1]
+    if candidates[1][0] not in likely:
+        likely.append(candidates[1][0])
+    likely += [lang for lang in ranked if lang not in likely][:keep - len(likely)]
+    by_lang = dict(candidates)
+    pruned = [(lang, by_lang[lang]) for lang in likely]
+    logger.info(f"Language ID narrowed {len(candidates)} candidates to {first_lang} + {[lang for lang, _ in pruned]}")
+
+    best_lang, best_text, best_confidence = run_language_detection(file_path, pruned, score_fn, threshold, max_workers)
+    # A first pass that doesn't even read as its own language only wins when nothing else was recognized
+    first_consistent = bool(ranking) and ranking[0][0] == first_lang
+    if best_lang is None or (first_consistent and first_confidence > best_confidence):
+        return first_lang, first_text, first_confidence
+    return best_lang, best_text, best_confidence
+
 def detect_language_from_audio(file_path, max_attempts=5):
-    """Advanced language detection from audio"""
+    """Advanced language detection from audio (file path or PreparedAudio)"""
     common_languages = ['en-US', 'es-ES', 'fr-FR', 'de-DE', 'it-IT', 'pt-PT', 
                        'ru-RU', 'ja-JP', 'ko-KR', 'zh-CN', 'ar-SA', 'hi-IN']
     
-    best_result = None
-    best_confidence = 0.0
-    detected_lang = 'en'
-    
-    for lang in common_languages[:max_attempts]:
-        try:
-            text_result = audio_to_text(file_path, src_lang=lang)
-            if text_result and not text_result.startswith('Could not') and len(text_result.strip()) > 5:
-                confidence = min(len(text_result.strip()) / 50.0, 1.0)
-                if confidence > best_confidence:
-                    best_confidence = confidence
-                    best_result = text_result
-                    detected_lang = lang.split('-')[0]
-                    
-                if confidence > 0.7:
-                    break
-                    
-        except Exception as e:
-            logger.debug(f"Language detection failed for {lang}: {e}")
-            continue
+    candidates = [(lang.split('-')[0], lang) for lang in common_languages[:max_attempts]]
+    detected_lang, _, _ = identify_language(
+        file_path,
+        candidates,
+        score_fn=lambda text: min(len(text.strip()) / 50.0, 1.0),
+        threshold=0.7
+    )
     
-    return detected_lang
+    return detected_lang or 'en'
 
 def get_audio_info(file_path):
-    """Get comprehensive audio file information"""
+    """Get comprehensive audio file information (file path or PreparedAudio)"""
+    if isinstance(file_path, PreparedAudio):
+        return dict(file_path.info)
+
+    info = probe_audio(file_path)
+    if info:
+        return info
+
     try:
         audio = AudioSegment.from_file(file_path)
         return {
@@ -225,8 +677,11 @@ if __name__ == "__main__":
     # Test the enhanced voice functions
     input_file = input("Enter full path to your audio file: ").strip('"')
     
+    # Decode and preprocess once for all passes below
+    prepared_input = prepare_audio(input_file) or input_file
+    
     # Get audio info
-    audio_info = get_audio_info(input_file)
+    audio_info = get_audio_info(prepared_input)
     if audio_info:
         print(f"📊 Audio Info: {audio_info}")
     
@@ -235,7 +690,7 @@ if __name__ == "__main__":
     
     if detect_lang:
         print("🔍 Detecting language...")
-        source_lang = detect_language_from_audio(input_file)
+        source_lang = detect_language_from_audio(prepared_input)
         print(f"🌍 Detected language: {source_lang}")
     else:
         source_lang = input("Enter source language code: ")
@@ -246,7 +701,7 @@ if __name__ == "__main__":
     # Process with voice generation
     print("🎤 Converting speech to text...")
     sr_lang = f"{source_lang}-US" if '-' not in source_lang else source_lang
-    text = audio_to_text(input_file, src_lang=sr_lang)
+    text = audio_to_text(prepared_input, src_lang=sr_lang)
     print("📝 Text:", text)
 
     if source_lang != target_lang and not text.startswith('Could not'):
@@ -0,0 +1,103 @@
+"""
+File expansion for /upload/batch
+Turns the request's uploads (audio files and/or zip archives of them) into a
+flat list of entries, checking counts and unpacked sizes before anything is
+written
+"""
+
+import os
+import zipfile
+from werkzeug.utils import secure_filename
+
+class BatchError(ValueError):
+    """The batch as a whole is invalid (too many files, too large, corrupt archive)"""
+
+class BatchEntry:
+    """One file of a batch: a direct upload or an archive member"""
+
+    def __init__(self, filename, stream=None, archive=None, member=None, error=None):
+        self.filename = filename
+        self.error = error
+        self._stream = stream
+        self._archive = archive
+        self._member = member
+
+    def open(self):
+        """Readable stream of the file's bytes"""
+        if self._archive is not None:
+            return self._archive.open(self._member)
+        return self._stream
+
+def _is_zip(upload):
+    if upload.filename.lower().endswith('.zip'):
+        return True
+    try:
+        is_zip = zipfile.is_zipfile(upload.stream)
+    finally:
+        upload.stream.seek(0)
+    return is_zip
+
+class BatchFiles:
+    """Context manager over the entries of a batch; keeps archives open while they are read.
+
+    Archive members are never extracted by their stored path: only the
+    sanitized base name is kept, so '../' or absolute member names can't
+    escape the upload folder (zip-slip).
+    """
+
+    def __init__(self, uploads, allowed_file, max_files=50, max_unpacked_bytes=500 * 1024 * 1024):
+        self.entries = []
+        self._archives = []
+        unpacked = 0
+        try:
+            for upload in uploads:
+                if not upload or not upload.filename:
+                    continue
+                if not _is_zip(upload):
+                    filename = secure_filename(upload.filename)
+                    error = None if filename and allowed_file(filename) else 'File type not supported'
+                    self.entries.append(BatchEntry(filename or upload.filename, stream=upload.stream, error=error))
+                    continue
+
+                try:
+                    archive = zipfile.ZipFile(upload.stream)
+                except zipfile.BadZipFile:
+                    raise BatchError(f'{upload.filename} is not a valid zip archive')
+                self._archives.append(archive)
+                for member in archive.infolist():
+                    base_name = os.path.basename(member.filename.replace('\\', '/'))
+                    # Folders and macOS resource forks aren't recordings
+                    if member.is_dir() or not base_name or base_name.startswith('.') \
+                            or member.filename.startswith('__MACOSX/'):
+                        continue
+                    filename = secure_filename(base_name)
+                    if not filename or not allowed_file(filename):
+                        self.entries.append(BatchEntry(filename or base_name, error='File type not supported'))
+                        continue
+                    if member.flag_bits & 0x1:
+                        self.entries.append(BatchEntry(filename, error='Encrypted archive members are not supported'))
+                        continue
+                    # Members can't decompress beyond their declared size, so this bounds zip bombs
+                    unpacked += member.file_size
+                    if unpacked > max_unpacked_bytes:
+                        raise BatchError(f'Archive contents exceed {max_unpacked_bytes // (1024 * 1024)} MB')
+                    self.entries.append(BatchEntry(filename, archive=archive, member=member))
+
+            if not self.entries:
+                raise BatchError('No files in batch')
+            if len(self.entries) > max_files:
+                raise BatchError(f'Too many files in batch ({len(self.entries)}, limit {max_files})')
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        for archive in self._archives:
+            archive.close()
+        self._archives = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
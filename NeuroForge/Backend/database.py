@@ -0,0 +1,235 @@
+"""
+SQLite data access for NeuroForge
+Pooled connections in WAL journal mode, so readers such as /history no longer
+wait behind upload writes; routes, init_database and the translation cache all
+go through get_database()
+"""
+
+import os
+import time
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATABASE_PATH = 'neuroforge.db'
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+class PooledConnection:
+    """A lease on the calling thread's connection.
+
+    Behaves like sqlite3.Connection; close() hands the connection back to the
+    pool instead of closing it (uncommitted changes are rolled back, as a real
+    close would). Nested leases in one thread share the connection.
+    """
+
+    def __init__(self, database, connection):
+        self._database = database
+        self._connection = connection
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __enter__(self):
+        return self._connection.__enter__()
+
+    def __exit__(self, exc_type, exc, traceback):
+        return self._connection.__exit__(exc_type, exc, traceback)
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self._database._release(self._connection)
+
+class Database:
+    """Connection pool with WAL, tuned pragmas and busy handling.
+
+    A thread keeps one connection for as long as it holds any lease, so nested
+    helpers share it; once released the connection goes back to a bounded idle
+    pool for the next thread. That suits both long-lived job workers and
+    servers that start a thread per request.
+    """
+
+    def __init__(self, path=DEFAULT_DATABASE_PATH, busy_timeout=30.0, synchronous='NORMAL',
+                 cache_size_kb=16384, wal=True, max_idle=8, write_retries=5):
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"synchronous must be one of {', '.join(SYNCHRONOUS_MODES)}")
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.synchronous = synchronous
+        self.cache_size_kb = cache_size_kb
+        self.wal = wal
+        self.max_idle = max_idle
+        self.write_retries = write_retries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._idle = []
+        self._pid = os.getpid()
+        self._stats = {'opened': 0, 'closed': 0, 'leases': 0, 'reused': 0, 'busy_retries': 0}
+
+    def connection(self):
+        """Lease a connection for the calling thread"""
+        state = self._thread_state()
+        if state['connection'] is None:
+            state['connection'] = self._acquire()
+        state['leases'] += 1
+        self._count('leases')
+        return PooledConnection(self, state['connection'])
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction (BEGIN IMMEDIATE) that retries while another writer holds the lock.
+
+        Yields a cursor; commits on success and rolls back on error. Nested in
+        another transaction() of this thread, the work runs in a SAVEPOINT that
+        is rolled back on its own on error. Any other open transaction on the
+        connection (a lease that wrote without committing) is an error: joining
+        it would leave this work uncommitted.
+        """
+        connection = self.connection()
+        state = self._thread_state()
+        if state['transactions']:
+            savepoint = f"nested_{state['transactions']}"
+            state['transactions'] += 1
+            cursor = connection.cursor()
+            try:
+                connection.execute(f"SAVEPOINT {savepoint}")
+                try:
+                    yield cursor
+                    connection.execute(f"RELEASE SAVEPOINT {savepoint}")
+                except Exception:
+                    connection.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                    connection.execute(f"RELEASE SAVEPOINT {savepoint}")
+                    raise
+            finally:
+                state['transactions'] -= 1
+                cursor.close()
+                connection.close()
+            return
+        if connection.in_transaction:
+            connection.close()
+            raise sqlite3.ProgrammingError(
+                "transaction() inside a transaction it did not open; commit or close the other lease first")
+        try:
+            for attempt in range(self.write_retries + 1):
+                try:
+                    connection.execute("BEGIN IMMEDIATE")
+                    break
+                except sqlite3.OperationalError as e:
+                    if ('locked' not in str(e) and 'busy' not in str(e)) or attempt == self.write_retries:
+                        raise
+                    self._count('busy_retries')
+                    time.sleep(min(0.05 * 2 ** attempt, 1.0))
+            cursor = connection.cursor()
+            state['transactions'] += 1
+            try:
+                yield cursor
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                state['transactions'] -= 1
+                cursor.close()
+        finally:
+            connection.close()
+
+    def close_idle(self):
+        """Close pooled connections not currently leased (e.g. at shutdown)"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._close(connection)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['idle_connections'] = len(self._idle)
+        stats['journal_mode'] = 'wal' if self.wal else 'delete'
+        return stats
+
+    def _thread_state(self):
+        state = getattr(self._local, 'state', None)
+        if state is None or state['pid'] != os.getpid():
+            state = self._local.state = {'pid': os.getpid(), 'connection': None, 'leases': 0, 'transactions': 0}
+        return state
+
+    def _acquire(self):
+        with self._lock:
+            # A forked worker inherits the parent's pool; never share connections across processes
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._idle = []
+            if self._idle:
+                self._stats['reused'] += 1
+                return self._idle.pop()
+        return self._open()
+
+    def _open(self):
+        # Connections move between threads, but only ever serve one lease-holding thread at a time
+        connection = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        if self.wal:
+            mode = connection.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            if mode.lower() != 'wal':
+                logger.warning(f"SQLite WAL mode unavailable for {self.path}, using {mode}")
+        connection.execute(f"PRAGMA synchronous={self.synchronous}")
+        connection.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+        connection.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+        connection.execute("PRAGMA temp_store=MEMORY")
+        self._count('opened')
+        return connection
+
+    def _release(self, connection):
+        state = self._thread_state()
+        if state['connection'] is not connection:
+            return
+        state['leases'] -= 1
+        if state['leases'] > 0:
+            return
+
+        state['connection'] = None
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except sqlite3.Error:
+            self._close(connection)
+            return
+        with self._lock:
+            if len(self._idle) < self.max_idle and self._pid == os.getpid():
+                self._idle.append(connection)
+                return
+        self._close(connection)
+
+    def _close(self, connection):
+        try:
+            connection.close()
+        except sqlite3.Error:
+            pass
+        self._count('closed')
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+def get_database(path=None):
+    """The shared pool for a database file (NEUROFORGE_DATABASE_PATH by default)"""
+    path = path or os.environ.get('NEUROFORGE_DATABASE_PATH', DEFAULT_DATABASE_PATH)
+    with _databases_lock:
+        database = _databases.get(path)
+        if database is None:
+            database = _databases[path] = Database(
+                path,
+                busy_timeout=float(os.environ.get('NEUROFORGE_DB_BUSY_TIMEOUT', 30)),
+                synchronous=os.environ.get('NEUROFORGE_DB_SYNCHRONOUS', 'NORMAL').upper(),
+                cache_size_kb=int(os.environ.get('NEUROFORGE_DB_CACHE_KB', 16384)),
+                wal=os.environ.get('NEUROFORGE_DB_WAL', 'true').lower() in ('1', 'true', 'yes'),
+                max_idle=int(os.environ.get('NEUROFORGE_DB_POOL_SIZE', 8))
+            )
+        return database
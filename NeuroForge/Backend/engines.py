@@ -0,0 +1,251 @@
+"""
+Pluggable speech recognition (ASR), machine translation (MT) and text-to-speech (TTS) engines
+'google' uses the hosted Google services; 'local' provides deterministic offline
+stand-ins with configurable latency so the pipeline can be benchmarked without network
+Select with NEUROFORGE_ASR_ENGINE / NEUROFORGE_MT_ENGINE / NEUROFORGE_TTS_ENGINE
+(or NEUROFORGE_ENGINES for all three)
+"""
+
+import os
+import io
+import time
+import random
+import hashlib
+import threading
+import logging
+import speech_recognition as sr
+from deep_translator import GoogleTranslator
+from gtts import gTTS
+from pydub import AudioSegment
+from pydub.generators import Sine, WhiteNoise
+
+logger = logging.getLogger(__name__)
+
+def create_recognizer():
+    """Create a recognizer with optimized settings"""
+    new_recognizer = sr.Recognizer()
+    new_recognizer.energy_threshold = 300
+    new_recognizer.dynamic_energy_threshold = True
+    new_recognizer.pause_threshold = 0.8
+    new_recognizer.operation_timeout = None
+    new_recognizer.phrase_timeout = None
+    new_recognizer.non_speaking_duration = 0.5
+    return new_recognizer
+
+# Google engines
+
+class GoogleSpeechEngine:
+    """Google Web Speech API through speech_recognition"""
+    name = 'google'
+
+    def recognize(self, audio_data, language, energy_threshold=None):
+        """Return the transcript; raises sr.UnknownValueError / sr.RequestError like recognize_google"""
+        call_recognizer = create_recognizer()
+        if energy_threshold is not None:
+            call_recognizer.energy_threshold = energy_threshold
+        return call_recognizer.recognize_google(audio_data, language=language)
+
+class GoogleTranslateEngine:
+    """Google Translate through deep_translator"""
+    name = 'google'
+
+    def translator(self, source, target):
+        """A client with a translate(text) method; clients are not thread-safe"""
+        return GoogleTranslator(source=source, target=target)
+
+class GoogleTtsEngine:
+    """Google Text-to-Speech through gTTS (MP3 output)"""
+    name = 'google'
+    audio_format = 'mp3'
+
+    def synthesize(self, text, lang, slow=False):
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang, slow=slow).write_to_fp(buffer)
+        return buffer.getvalue()
+
+# Local deterministic stand-ins
+
+LOCAL_VOCABULARY = [
+    'audio', 'voice', 'translation', 'system', 'language', 'sample', 'people', 'morning',
+    'today', 'market', 'water', 'school', 'village', 'weather', 'family', 'travel',
+    'music', 'story', 'river', 'city', 'work', 'friend', 'time', 'world'
+]
+
+class LocalLatency:
+    """Sleeps for latency +/- jitter seconds (seeded, so runs are repeatable)"""
+
+    def __init__(self, latency=0.05, jitter=0.02, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def wait(self, extra=0.0):
+        with self._lock:
+            delay = self.latency + extra + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+def _seeded_random(*parts):
+    digest = hashlib.sha256('\x1f'.join(str(part) for part in parts).encode('utf-8', 'surrogatepass')).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+class LocalSpeechEngine:
+    """Fake ASR: the transcript is a pure function of the audio and language.
+
+    Each clip is assigned a "spoken" language from its content hash; that
+    language gets a full transcript (words scale with clip length) and any
+    other language a much shorter one, so auto-detection behaves plausibly.
+    Silent audio raises UnknownValueError.
+    """
+    name = 'local'
+    spoken_languages = ['en', 'hi', 'mr', 'es', 'fr', 'de', 'ta', 'bn']
+
+    def __init__(self, latency=None, words_per_second=2.5):
+        self.latency = latency or LocalLatency()
+        self.words_per_second = words_per_second
+
+    def recognize(self, audio_data, language, energy_threshold=None):
+        frame_data = audio_data.get_raw_data()
+        duration = len(frame_data) / float(audio_data.sample_rate * audio_data.sample_width)
+        self.latency.wait(extra=duration * 0.01)
+
+        segment = AudioSegment(data=frame_data, sample_width=audio_data.sample_width,
+                               frame_rate=audio_data.sample_rate, channels=1)
+        if segment.rms < 10:
+            raise sr.UnknownValueError()
+
+        content_key = hashlib.sha256(frame_data).hexdigest()
+        spoken = _seeded_random('spoken', content_key).choice(self.spoken_languages)
+        word_count = max(3, int(duration * self.words_per_second))
+        if language.split('-')[0].lower() != spoken:
+            word_count = max(1, word_count // 4)
+
+        rng = _seeded_random('asr', content_key, language)
+        return ' '.join(rng.choice(LOCAL_VOCABULARY) for _ in range(word_count))
+
+class LocalTranslator:
+    def __init__(self, source, target, latency):
+        self.source = source
+        self.target = target
+        self.latency = latency
+
+    def translate(self, text):
+        self.latency.wait(extra=len(text) * 0.00001)
+        if self.source == self.target:
+            return text
+        return ' '.join(self._pseudo_word(word) for word in text.split())
+
+    def _pseudo_word(self, word):
+        rng = _seeded_random('mt', self.target, word)
+        letters = 'aeioukmnrstlvhpd'
+        return ''.join(rng.choice(letters) for _ in range(max(1, len(word))))
+
+class LocalTranslateEngine:
+    """Fake MT: a deterministic word-by-word pseudo-translation per target language"""
+    name = 'local'
+
+    def __init__(self, latency=None):
+        self.latency = latency or LocalLatency()
+
+    def translator(self, source, target):
+        return LocalTranslator(source, target, self.latency)
+
+class LocalTtsEngine:
+    """Fake TTS producing real audio: one tone (or noise burst) per word.
+
+    WAV output by default since MP3 encoding needs ffmpeg; set
+    audio_format='mp3' when ffmpeg is installed.
+    """
+    name = 'local'
+
+    def __init__(self, latency=None, audio_format='wav', sample_rate=16000, signal='tone'):
+        self.latency = latency or LocalLatency()
+        self.audio_format = audio_format
+        self.sample_rate = sample_rate
+        self.signal = signal
+
+    def synthesize(self, text, lang, slow=False):
+        self.latency.wait(extra=len(text) * 0.0005)
+        word_ms = 450 if slow else 300
+        gap = AudioSegment.silent(duration=80, frame_rate=self.sample_rate)
+        audio = AudioSegment.silent(duration=0, frame_rate=self.sample_rate)
+
+        for word in text.split():
+            if self.signal == 'noise':
+                sound = WhiteNoise(sample_rate=self.sample_rate).to_audio_segment(duration=word_ms, volume=-20)
+            else:
+                frequency = 220 + _seeded_random('tts', lang, word).randint(0, 440)
+                sound = Sine(frequency, sample_rate=self.sample_rate).to_audio_segment(duration=word_ms, volume=-12)
+            audio += sound.fade_in(10).fade_out(10) + gap
+
+        buffer = io.BytesIO()
+        audio.export(buffer, format=self.audio_format)
+        return buffer.getvalue()
+
+# Registry
+
+def _local_latency(kind):
+    return LocalLatency(
+        latency=float(os.environ.get(f'NEUROFORGE_LOCAL_{kind}_LATENCY', os.environ.get('NEUROFORGE_LOCAL_LATENCY', 0.05))),
+        jitter=float(os.environ.get('NEUROFORGE_LOCAL_JITTER', 0.02)),
+        seed=int(os.environ.get('NEUROFORGE_LOCAL_SEED', 0))
+    )
+
+ENGINE_FACTORIES = {
+    'asr': {
+        'google': GoogleSpeechEngine,
+        'local': lambda: LocalSpeechEngine(latency=_local_latency('ASR'))
+    },
+    'mt': {
+        'google': GoogleTranslateEngine,
+        'local': lambda: LocalTranslateEngine(latency=_local_latency('MT'))
+    },
+    'tts': {
+        'google': GoogleTtsEngine,
+        'local': lambda: LocalTtsEngine(
+            latency=_local_latency('TTS'),
+            audio_format=os.environ.get('NEUROFORGE_LOCAL_TTS_FORMAT', 'wav'),
+            signal=os.environ.get('NEUROFORGE_LOCAL_TTS_SIGNAL', 'tone')
+        )
+    }
+}
+
+_active_engines = {}
+_engines_lock = threading.Lock()
+
+def register_engine(kind, name, factory):
+    """Make a backend selectable by name; factory is called with no arguments"""
+    ENGINE_FACTORIES[kind][name] = factory
+
+def configured_engine_name(kind):
+    default = os.environ.get('NEUROFORGE_ENGINES', 'google')
+    return os.environ.get(f'NEUROFORGE_{kind.upper()}_ENGINE', default)
+
+def get_engine(kind):
+    """The active engine for 'asr', 'mt' or 'tts'"""
+    engine = _active_engines.get(kind)
+    if engine is None:
+        with _engines_lock:
+            engine = _active_engines.get(kind)
+            if engine is None:
+                engine = _build_engine(kind, configured_engine_name(kind))
+                _active_engines[kind] = engine
+    return engine
+
+def configure_engines(asr=None, mt=None, tts=None):
+    """Switch engines at runtime, e.g. configure_engines(asr='local', mt='local', tts='local')"""
+    with _engines_lock:
+        for kind, name in (('asr', asr), ('mt', mt), ('tts', tts)):
+            if name:
+                _active_engines[kind] = _build_engine(kind, name)
+
+def engine_names():
+    return {kind: get_engine(kind).name for kind in ENGINE_FACTORIES}
+
+def _build_engine(kind, name):
+    factories = ENGINE_FACTORIES[kind]
+    if name not in factories:
+        raise ValueError(f"Unknown {kind} engine '{name}'. Available: {', '.join(factories)}")
+    logger.info(f"🔌 {kind.upper()} engine: {name}")
+    return factories[name]()
@@ -0,0 +1,199 @@
+"""
+Query building for /history: keyset pagination, filters, field projection and
+full-text search over transcripts through an FTS5 index kept in sync by triggers
+"""
+
+import re
+import json
+import base64
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+HISTORY_FIELDS = [
+    'session_id', 'original_filename', 'source_language', 'detected_source_language',
+    'target_language', 'original_text', 'translated_text', 'translated_audio_url',
+    'file_size', 'processing_time', 'confidence_score', 'voice_type',
+    'audio_duration', 'created_at', 'expired_at', 'parent_session_id'
+]
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+SEARCH_INDEX_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS translations_fts USING fts5(
+        original_text, translated_text,
+        content='translations', content_rowid='id',
+        tokenize="unicode61 remove_diacritics 2 categories 'L* N* Co M*'"
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS translations_fts_insert AFTER INSERT ON translations BEGIN
+        INSERT INTO translations_fts(rowid, original_text, translated_text)
+        VALUES (new.id, new.original_text, new.translated_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS translations_fts_delete AFTER DELETE ON translations BEGIN
+        INSERT INTO translations_fts(translations_fts, rowid, original_text, translated_text)
+        VALUES ('delete', old.id, old.original_text, old.translated_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS translations_fts_update
+    AFTER UPDATE OF original_text, translated_text ON translations BEGIN
+        INSERT INTO translations_fts(translations_fts, rowid, original_text, translated_text)
+        VALUES ('delete', old.id, old.original_text, old.translated_text);
+        INSERT INTO translations_fts(rowid, original_text, translated_text)
+        VALUES (new.id, new.original_text, new.translated_text);
+    END
+    """
+]
+
+HISTORY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_translations_history ON translations(created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_translations_target_history ON translations(target_language, created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_translations_detected_history ON translations(detected_source_language, created_at DESC, id DESC)"
+]
+
+def ensure_history_schema(cursor, rebuild=False):
+    """Create the history indexes and the FTS5 index; returns whether search is available.
+
+    The index is rebuilt from translations when it is new or rebuild is set
+    (e.g. after the translations table was recreated).
+    """
+    for statement in HISTORY_INDEXES:
+        cursor.execute(statement)
+
+    try:
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'translations_fts'")
+        row = cursor.fetchone()
+        exists = row is not None
+        # Older indexes treated combining marks (Devanagari matras, Arabic harakat) as
+        # separators and split words at them; recreate those with the current tokenizer
+        if exists and 'categories' not in row[0]:
+            cursor.execute("DROP TABLE translations_fts")
+            exists = False
+            logger.info("🔄 Transcript search index tokenizer changed, rebuilding")
+        for statement in SEARCH_INDEX_SCHEMA:
+            cursor.execute(statement)
+        if rebuild or not exists:
+            cursor.execute("INSERT INTO translations_fts(translations_fts) VALUES ('rebuild')")
+            logger.info("✅ Transcript search index built")
+        return True
+    except sqlite3.OperationalError as e:
+        logger.warning(f"⚠️ Full-text search unavailable (SQLite without FTS5?): {e}")
+        return False
+
+def encode_cursor(created_at, row_id):
+    payload = json.dumps([created_at, row_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return str(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+def fts_match_expression(query):
+    """Quote each term so user input can't break FTS5 query syntax; a trailing * keeps prefix search"""
+    terms = []
+    for term in query.split():
+        prefix = term.endswith('*') and len(term) > 1
+        term = term.rstrip('*')
+        if term:
+            terms.append('"' + term.replace('"', '""') + '"' + ('*' if prefix else ''))
+    if not terms:
+        raise ValueError('Empty search query')
+    return ' '.join(terms)
+
+def _normalize_timestamp(value, name):
+    # created_at is stored as 'YYYY-MM-DD HH:MM:SS' (SQLite CURRENT_TIMESTAMP, UTC)
+    value = value.strip().replace('T', ' ').rstrip('Z')
+    if not re.fullmatch(r'\d{4}-\d{2}-\d{2}( \d{2}:\d{2}(:\d{2}(\.\d+)?)?)?', value):
+        raise ValueError(f"'{name}' must be an ISO date or datetime")
+    return value
+
+def _split_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+def build_history_query(args, search_available=True):
+    """Translate /history query parameters into (sql, params, fields, limit).
+
+    Supported parameters: limit, cursor, fields, target_language,
+    detected_language, parent_session_id, from, to and q (full-text search). Raises ValueError
+    for invalid input.
+    """
+    try:
+        limit = int(args.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ValueError("'limit' must be an integer")
+    limit = max(1, min(limit, MAX_LIMIT))
+
+    fields = HISTORY_FIELDS
+    if args.get('fields'):
+        fields = _split_list(args['fields'])
+        unknown = [field for field in fields if field not in HISTORY_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    conditions = []
+    params = []
+    source = 'translations t'
+
+    query = args.get('q', '').strip()
+    if query:
+        if not search_available:
+            raise ValueError('Full-text search is not available on this server')
+        source = 'translations_fts f JOIN translations t ON t.id = f.rowid'
+        conditions.append('translations_fts MATCH ?')
+        params.append(fts_match_expression(query))
+
+    for arg, column in (('target_language', 't.target_language'), ('detected_language', 't.detected_source_language')):
+        values = _split_list(args.get(arg, ''))
+        if values:
+            conditions.append(f"{column} IN ({','.join('?' for _ in values)})")
+            params.extend(values)
+
+    if args.get('parent_session_id'):
+        conditions.append('t.parent_session_id = ?')
+        params.append(args['parent_session_id'])
+
+    if args.get('from'):
+        conditions.append('t.created_at >= ?')
+        params.append(_normalize_timestamp(args['from'], 'from'))
+    if args.get('to'):
+        conditions.append('t.created_at < ?')
+        params.append(_normalize_timestamp(args['to'], 'to'))
+
+    if args.get('cursor'):
+        created_at, row_id = decode_cursor(args['cursor'])
+        # Row-value comparison lets SQLite seek the (created_at, id) index directly
+        conditions.append('(t.created_at, t.id) < (?, ?)')
+        params.extend([created_at, row_id])
+
+    columns = ', '.join(f't.{field}' for field in fields)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    # One extra row tells whether another page exists
+    sql = f"""
+    SELECT {columns}, t.id AS _cursor_id, t.created_at AS _cursor_created_at
+    FROM {source}
+    {where}
+    ORDER BY t.created_at DESC, t.id DESC
+    LIMIT ?
+    """
+    params.append(limit + 1)
+    return sql, params, fields, limit
+
+def page_from_rows(rows, fields, limit):
+    """Split the fetched rows into the page and the cursor for the next one"""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = [{field: row[field] for field in fields} for row in rows]
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = encode_cursor(rows[-1]['_cursor_created_at'], rows[-1]['_cursor_id'])
+    return items, next_cursor
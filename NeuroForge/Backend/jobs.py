@@ -0,0 +1,215 @@
+"""
+Background job manager for asynchronous /upload processing
+Runs the translation pipeline on a bounded thread or process pool and keeps
+track of job status so clients can poll /jobs/<job_id>
+"""
+
+import threading
+import uuid
+import time
+import logging
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Job states
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+
+def _run_in_process(events, job_id, fn, args, kwargs):
+    """Worker-process side of a job: reports start and progress to the parent over events"""
+    events.put((job_id, 'started', None))
+
+    def progress(stage, percent):
+        events.put((job_id, stage, percent))
+
+    return fn(*args, progress=progress, **kwargs)
+
+class JobManager:
+    """Bounded worker pool with an in-memory job registry"""
+
+    def __init__(self, max_workers=4, executor_type='thread', max_pending=32, result_ttl=3600):
+        self.max_workers = max_workers
+        self.executor_type = executor_type
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+        self._events = None
+        self._manager = None
+        if executor_type == 'process':
+            # Started on first submit: spawned workers import the app, which builds a manager too
+            self._executor = None
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='neuroforge-job')
+
+        logger.info(f"✅ Job manager ready ({executor_type} pool, {max_workers} workers)")
+
+    def submit(self, fn, *args, session_id=None, paths=(), **kwargs):
+        """Queue a pipeline run. Returns the job record, or None when the queue is full.
+
+        paths are files the job still needs (e.g. its saved upload); they are
+        reported by active_holds() until the job finishes.
+        """
+        with self._lock:
+            self._prune_expired()
+            if self._pending_count() >= self.max_pending:
+                return None
+
+            job_id = str(uuid.uuid4())
+            job = {
+                'job_id': job_id,
+                'session_id': session_id,
+                'status': JOB_QUEUED,
+                'stage': 'queued',
+                'progress': 0,
+                'error': None,
+                'result': None,
+                'created_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                '_finished': None,
+                '_paths': [path for path in paths if isinstance(path, str)],
+                '_future': None
+            }
+            self._jobs[job_id] = job
+
+        if self.executor_type == 'process':
+            future = self._process_pool().submit(_run_in_process, self._events, job_id, fn, args, kwargs)
+        else:
+            future = self._executor.submit(self._run, job_id, fn, args, kwargs)
+
+        future.add_done_callback(lambda f: self._on_done(job_id, f))
+        with self._lock:
+            job['_future'] = future
+        return self.get(job_id)
+
+    def get(self, job_id):
+        """Public view of a job record, without the result payload"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return None
+            view = {k: v for k, v in job.items() if not k.startswith('_') and k != 'result'}
+            future = job['_future']
+
+        if view['status'] == JOB_QUEUED and future is not None and future.running():
+            view['status'] = JOB_RUNNING
+        return view
+
+    def get_result(self, job_id):
+        """Return (job view, result) for a job"""
+        view = self.get(job_id)
+        if not view:
+            return None, None
+        with self._lock:
+            return view, self._jobs[job_id]['result']
+
+    def update_progress(self, job_id, stage, progress):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job and job['_finished'] is None:
+                job['stage'] = stage
+                job['progress'] = progress
+
+    def active_holds(self):
+        """(session ids, paths) of queued and running jobs, which storage retention must leave alone"""
+        with self._lock:
+            active = [job for job in self._jobs.values() if job['status'] in (JOB_QUEUED, JOB_RUNNING)]
+            return ({job['session_id'] for job in active if job['session_id']},
+                    {path for job in active for path in job['_paths']})
+
+    def stats(self):
+        with self._lock:
+            counts = {JOB_QUEUED: 0, JOB_RUNNING: 0, JOB_COMPLETED: 0, JOB_FAILED: 0}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return {
+                'executor': self.executor_type,
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'jobs': counts
+            }
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+        if self._manager is not None:
+            self._events.put(None)
+            self._manager.shutdown()
+
+    def _process_pool(self):
+        with self._lock:
+            if self._executor is None:
+                # Forking a threaded server can copy held locks into the child; start workers fresh.
+                # Their progress comes back through a manager queue drained by a listener thread
+                context = multiprocessing.get_context('spawn')
+                self._manager = context.Manager()
+                self._events = self._manager.Queue()
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+                threading.Thread(target=self._listen, name='neuroforge-job-events', daemon=True).start()
+            return self._executor
+
+    def _mark_started(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            # A late event must not reopen a job that already finished
+            if job and job['status'] == JOB_QUEUED:
+                job['status'] = JOB_RUNNING
+                job['stage'] = 'started'
+                job['started_at'] = datetime.now().isoformat()
+
+    def _listen(self):
+        while True:
+            try:
+                event = self._events.get()
+            except (EOFError, OSError):
+                return  # manager shut down
+            if event is None:
+                return
+            job_id, stage, percent = event
+            if stage == 'started':
+                self._mark_started(job_id)
+            else:
+                self.update_progress(job_id, stage, percent)
+
+    def _run(self, job_id, fn, args, kwargs):
+        self._mark_started(job_id)
+
+        def progress(stage, percent):
+            self.update_progress(job_id, stage, percent)
+
+        return fn(*args, progress=progress, **kwargs)
+
+    def _on_done(self, job_id, future):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return
+            job['finished_at'] = datetime.now().isoformat()
+            job['_finished'] = time.monotonic()
+            try:
+                job['result'] = future.result()
+                job['status'] = JOB_COMPLETED
+                job['stage'] = 'completed'
+                job['progress'] = 100
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {e}")
+                job['status'] = JOB_FAILED
+                job['stage'] = 'failed'
+                job['error'] = str(e)
+
+    def _pending_count(self):
+        return sum(1 for job in self._jobs.values() if job['status'] in (JOB_QUEUED, JOB_RUNNING))
+
+    def _prune_expired(self):
+        now = time.monotonic()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['_finished'] is not None and now - job['_finished'] > self.result_ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,188 @@
+"""
+Offline language identification of transcripts
+Scores candidate languages by writing system, then by function words and
+character trigrams within a script, so auto-detection can recognize a clip in
+one or two likely languages instead of all of them
+"""
+
+import re
+import unicodedata
+
+# (first code point, last code point, script)
+SCRIPT_RANGES = [
+    (0x0041, 0x024F, 'latin'),
+    (0x0370, 0x03FF, 'greek'),
+    (0x0400, 0x04FF, 'cyrillic'),
+    (0x0590, 0x05FF, 'hebrew'),
+    (0x0600, 0x06FF, 'arabic'),
+    (0x0750, 0x077F, 'arabic'),
+    (0x0900, 0x097F, 'devanagari'),
+    (0x0980, 0x09FF, 'bengali'),
+    (0x0A00, 0x0A7F, 'gurmukhi'),
+    (0x0A80, 0x0AFF, 'gujarati'),
+    (0x0B80, 0x0BFF, 'tamil'),
+    (0x0C00, 0x0C7F, 'telugu'),
+    (0x0C80, 0x0CFF, 'kannada'),
+    (0x0D00, 0x0D7F, 'malayalam'),
+    (0x0E00, 0x0E7F, 'thai'),
+    (0x1000, 0x109F, 'myanmar'),
+    (0x1780, 0x17FF, 'khmer'),
+    (0x1100, 0x11FF, 'hangul'),
+    (0x3040, 0x30FF, 'kana'),
+    (0x3400, 0x4DBF, 'han'),
+    (0x4E00, 0x9FFF, 'han'),
+    (0xAC00, 0xD7AF, 'hangul'),
+]
+
+LANGUAGE_SCRIPTS = {
+    'hi': 'devanagari', 'mr': 'devanagari', 'ne': 'devanagari',
+    'bn': 'bengali', 'pa': 'gurmukhi', 'gu': 'gujarati', 'ta': 'tamil',
+    'te': 'telugu', 'kn': 'kannada', 'ml': 'malayalam', 'th': 'thai',
+    'my': 'myanmar', 'km': 'khmer',
+    'ar': 'arabic', 'ur': 'arabic', 'fa': 'arabic', 'he': 'hebrew',
+    'ru': 'cyrillic', 'uk': 'cyrillic', 'bg': 'cyrillic', 'el': 'greek',
+    'ko': 'hangul', 'ja': 'kana', 'zh': 'han',
+}
+
+# Frequent function words and a sample sentence (for the trigram profile) per language
+PROFILES = {
+    'en': ('the and is are was to of in that it for you with on this have be not what i am my me we your do can how',
+           'the weather is nice today and we are going to the market with our friends'),
+    'es': ('el la de que y en los las es un una por con para no se del lo como pero',
+           'el tiempo es muy bueno hoy y vamos al mercado con nuestros amigos para comprar'),
+    'fr': ('le la les de des et est un une que qui pas dans pour sur au je vous ce',
+           'le temps est beau aujourd hui et nous allons au marché avec nos amis pour acheter'),
+    'de': ('der die das und ist nicht ein eine zu den mit ich sie es auf für ist wir',
+           'das wetter ist heute schön und wir gehen mit unseren freunden auf den markt'),
+    'it': ('il la di che e un una per non con sono del della è gli le mi ci questo',
+           'il tempo è bello oggi e andiamo al mercato con i nostri amici per comprare'),
+    'pt': ('o a de que e do da em um uma para não com os as no na se mas você',
+           'o tempo está bom hoje e vamos ao mercado com os nossos amigos para comprar'),
+    'nl': ('de het een en van is dat niet ik je op te met voor zijn maar wat',
+           'het weer is vandaag mooi en we gaan met onze vrienden naar de markt'),
+    'tr': ('bir ve bu da de için ne ben sen çok var değil ile gibi mi',
+           'bugün hava çok güzel ve arkadaşlarımızla birlikte pazara gidiyoruz'),
+    'id': ('yang dan di ini itu dengan untuk tidak ada saya kami akan dari ke',
+           'cuaca hari ini sangat bagus dan kami akan pergi ke pasar dengan teman'),
+    'hi': ('है के में की और को से का यह नहीं हैं था पर भी कि',
+           'आज मौसम बहुत अच्छा है और हम अपने दोस्तों के साथ बाज़ार जा रहे हैं'),
+    'mr': ('आहे आणि हे या ला मध्ये नाही तर होते आम्ही तो ती चा ची',
+           'आज हवामान खूप छान आहे आणि आम्ही आमच्या मित्रांसोबत बाजारात जात आहोत'),
+    'ar': ('في من على أن إلى هذا هذه التي الذي كان لا ما مع عن',
+           'الطقس جميل اليوم ونحن ذاهبون إلى السوق مع أصدقائنا'),
+    'ur': ('ہے کے میں کی اور سے کا یہ نہیں ہیں تھا پر بھی',
+           'آج موسم بہت اچھا ہے اور ہم اپنے دوستوں کے ساتھ بازار جا رہے ہیں'),
+    'fa': ('است و در به از که این را با برای آن می یک',
+           'امروز هوا خیلی خوب است و ما با دوستانمان به بازار می رویم'),
+    'ru': ('и в не на что это я он она с как но по мы вы',
+           'сегодня хорошая погода и мы идём на рынок с нашими друзьями'),
+    'uk': ('і в не на що це я він вона з як але та ми ви',
+           'сьогодні гарна погода і ми йдемо на ринок з нашими друзями'),
+    'bg': ('и в не на че това аз той тя с като но да ние вие',
+           'днес времето е хубаво и ние отиваме на пазара с нашите приятели'),
+}
+
+# Recognizers for Latin-script languages write Hindi or Arabic speech in Latin letters
+# (Hinglish, Arabizi); these profiles let such transcripts point at the spoken language
+ROMANIZED_PROFILES = {
+    'hi': ('hai hain nahi nahin kya mera meri mujhe main hoon aap tum ka ke ki ko se ho raha rahe ye wo bhi kal',
+           'mera naam rahul hai aur main pune mein rehta hoon aap kaise ho mujhe nahi pata'),
+    'ar': ('ana anta enta inta huwa hiya ya min fi ala wa la ma shukran habibi yalla inshallah marhaba kifak',
+           'ana min masr wa ismi ahmad shukran habibi kifak ya akhi inshallah yalla'),
+}
+
+WORD = re.compile(r"\w+", re.UNICODE)
+
+def _base(code):
+    return code.split('-')[0].lower()
+
+def language_script(code):
+    """Writing system a language code is transcribed in (Latin unless listed)"""
+    return LANGUAGE_SCRIPTS.get(_base(code), 'latin')
+
+def _script(char):
+    point = ord(char)
+    for first, last, script in SCRIPT_RANGES:
+        if first <= point <= last:
+            return script if script != 'latin' or char.isalpha() else None
+    return None
+
+def script_shares(text):
+    """Fraction of the letters in text written in each script"""
+    counts = {}
+    total = 0
+    for char in text:
+        if not char.isalpha() and unicodedata.category(char) not in ('Mn', 'Mc'):
+            continue
+        script = _script(char)
+        if script:
+            counts[script] = counts.get(script, 0) + 1
+            total += 1
+    return {script: count / total for script, count in counts.items()} if total else {}
+
+def _trigrams(text):
+    trigrams = set()
+    for word in WORD.findall(text.lower()):
+        padded = f' {word} '
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+def _profiles(profiles):
+    return {
+        lang: (set(stopwords.split()), _trigrams(sample + ' ' + stopwords))
+        for lang, (stopwords, sample) in profiles.items()
+    }
+
+_PROFILE_CACHE = _profiles(PROFILES)
+_ROMANIZED_CACHE = _profiles(ROMANIZED_PROFILES)
+
+def _lexical_score(words, trigrams, lang, profiles=_PROFILE_CACHE):
+    profile = profiles.get(lang)
+    if not profile or not words:
+        return 0.0
+    stopwords, profile_trigrams = profile
+    stopword_ratio = sum(1 for word in words if word in stopwords) / len(words)
+    trigram_overlap = len(trigrams & profile_trigrams) / len(trigrams) if trigrams else 0.0
+    return min(1.0, 2.5 * stopword_ratio) * 0.6 + trigram_overlap * 0.4
+
+def rank_languages(text, candidates):
+    """Score candidate language codes for text; returns [(code, score)] best first.
+
+    A language scores the share of the text written in its script, split
+    between the candidates sharing that script by function-word and trigram
+    evidence. Languages with a romanized profile (Hindi, Arabic) also compete
+    for the Latin share. Scores of all candidates add up to at most 1. An
+    empty list means the text carries no evidence (no letters).
+    """
+    shares = script_shares(text)
+    if not shares:
+        return []
+    # Japanese mixes kanji with kana; han-only text is Chinese
+    if shares.get('kana'):
+        shares['kana'] += shares.pop('han', 0.0)
+    words = WORD.findall(text.lower())
+    trigrams = _trigrams(text)
+
+    by_script = {}
+    for code in candidates:
+        by_script.setdefault(language_script(code), []).append(code)
+        if language_script(code) != 'latin' and _base(code) in ROMANIZED_PROFILES:
+            by_script.setdefault('latin', []).append(code)
+
+    scores = {code: 0.0 for code in candidates}
+    for script, codes in by_script.items():
+        share = shares.get(script, 0.0)
+        if share == 0.0:
+            continue
+        # Small smoothing keeps languages without a profile in the running
+        evidence = {
+            code: _lexical_score(words, trigrams, _base(code),
+                                 _ROMANIZED_CACHE if language_script(code) != script else _PROFILE_CACHE) + 0.02
+            for code in codes
+        }
+        total = sum(evidence.values())
+        for code in codes:
+            scores[code] += share * evidence[code] / total
+
+    ranked = sorted(candidates, key=lambda code: -scores[code])
+    return [(code, scores[code]) for code in ranked]
@@ -0,0 +1,111 @@
+"""
+Observed source-language frequencies, globally and per user
+Kept up to date with every saved translation and used to try the languages
+uploads are most likely in first during auto-detection
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = '*'
+
+LANGUAGE_STATS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS language_stats (
+    scope TEXT NOT NULL,
+    language TEXT NOT NULL,
+    uploads INTEGER NOT NULL DEFAULT 0,
+    last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (scope, language)
+) WITHOUT ROWID
+"""
+
+# A user's own history outweighs global traffic once they have about this many uploads
+USER_PRIOR_UPLOADS = 5
+
+def user_scope(user_id):
+    return f'user:{user_id}'
+
+def _countable(language):
+    return bool(language) and language != 'unknown'
+
+def ensure_language_stats_schema(cursor, rebuild=False):
+    """Create language_stats, filling it from translations when new or when rebuild is set"""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'language_stats'")
+    exists = cursor.fetchone() is not None
+    cursor.execute(LANGUAGE_STATS_SCHEMA)
+    if exists and not rebuild:
+        return
+
+    cursor.execute("DELETE FROM language_stats")
+    cursor.execute("""
+    INSERT INTO language_stats (scope, language, uploads, last_seen_at)
+    SELECT ?, detected_source_language, COUNT(*), MAX(created_at)
+    FROM translations
+    WHERE detected_source_language IS NOT NULL AND detected_source_language NOT IN ('', 'unknown')
+    GROUP BY detected_source_language
+    """, (GLOBAL_SCOPE,))
+    cursor.execute("""
+    INSERT INTO language_stats (scope, language, uploads, last_seen_at)
+    SELECT 'user:' || user_id, detected_source_language, COUNT(*), MAX(created_at)
+    FROM translations
+    WHERE user_id IS NOT NULL AND detected_source_language IS NOT NULL
+      AND detected_source_language NOT IN ('', 'unknown')
+    GROUP BY user_id, detected_source_language
+    """)
+    logger.info("✅ Language statistics built from translation history")
+
+def record_language(cursor, language, user_id=None):
+    """Count one upload in language (inside the caller's write transaction)"""
+    if not _countable(language):
+        return
+    scopes = [GLOBAL_SCOPE] + ([user_scope(user_id)] if user_id else [])
+    cursor.executemany("""
+    INSERT INTO language_stats (scope, language, uploads, last_seen_at)
+    VALUES (?, ?, 1, CURRENT_TIMESTAMP)
+    ON CONFLICT(scope, language) DO UPDATE SET
+        uploads = uploads + 1,
+        last_seen_at = CURRENT_TIMESTAMP
+    """, [(scope, language) for scope in scopes])
+
+def order_languages(connection, languages, user_id=None, min_uploads=3, max_extra=4):
+    """languages, most frequently detected first.
+
+    Global and per-user shares are blended, the user's weight growing with
+    the number of their uploads. Languages never seen keep their relative
+    order after the observed ones. Up to max_extra languages that are not in
+    languages but were seen at least min_uploads times are added, so regular
+    traffic in a language missing from the default list still gets tried.
+    """
+    scopes = [GLOBAL_SCOPE] + ([user_scope(user_id)] if user_id else [])
+    rows = connection.execute(
+        f"SELECT scope, language, uploads FROM language_stats WHERE scope IN ({','.join('?' for _ in scopes)})",
+        scopes
+    ).fetchall()
+    if not rows:
+        return list(languages)
+
+    counts = {scope: {} for scope in scopes}
+    for scope, language, uploads in rows:
+        counts[scope][language] = uploads
+    shares = {}
+    for scope, by_language in counts.items():
+        total = sum(by_language.values())
+        shares[scope] = {language: uploads / total for language, uploads in by_language.items()} if total else {}
+
+    user_uploads = sum(counts[scopes[-1]].values()) if user_id else 0
+    user_weight = user_uploads / (user_uploads + USER_PRIOR_UPLOADS)
+
+    def score(language):
+        user_share = shares[scopes[-1]].get(language, 0.0) if user_id else 0.0
+        return user_weight * user_share + (1 - user_weight) * shares[GLOBAL_SCOPE].get(language, 0.0)
+
+    # Ties are broken by code: the set's own order changes from one process to the next
+    extra = sorted(
+        {language for by_language in counts.values() for language, uploads in by_language.items()
+         if uploads >= min_uploads and language not in languages},
+        key=lambda language: (-score(language), language)
+    )[:max_extra]
+    candidates = list(languages) + extra
+    # sorted() is stable, so ties (including never-seen languages) keep the configured order
+    return sorted(candidates, key=lambda language: -score(language))
@@ -0,0 +1,90 @@
+"""
+Live audio streams for sessions whose voice is still being synthesized
+text_to_speech publishes each finished segment here and /stream_audio relays
+them to the client with chunked transfer encoding
+"""
+
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LiveAudioStream:
+    """Ordered audio chunks of one session, readable while they are being produced"""
+
+    def __init__(self, session_id, mimetype='audio/mpeg'):
+        self.session_id = session_id
+        self.mimetype = mimetype
+        self.finished_at = None
+        self.failed = False
+        self._chunks = []
+        self._done = False
+        self._condition = threading.Condition()
+
+    @property
+    def has_audio(self):
+        with self._condition:
+            return bool(self._chunks)
+
+    @property
+    def done(self):
+        with self._condition:
+            return self._done
+
+    def publish(self, data):
+        with self._condition:
+            self._chunks.append(data)
+            self._condition.notify_all()
+
+    def finish(self, failed=False):
+        with self._condition:
+            if self._done:
+                return
+            self._done = True
+            self.failed = failed
+            self.finished_at = time.monotonic()
+            self._condition.notify_all()
+
+    def iter_chunks(self, timeout=300):
+        """Yield chunks from the start, waiting for new ones until the stream finishes"""
+        index = 0
+        while True:
+            with self._condition:
+                while index >= len(self._chunks) and not self._done:
+                    if not self._condition.wait(timeout=timeout):
+                        logger.warning(f"Live audio stream {self.session_id} timed out")
+                        return
+                if index >= len(self._chunks):
+                    return
+                pending = self._chunks[index:]
+                index = len(self._chunks)
+            for chunk in pending:
+                yield chunk
+
+class LiveAudioRegistry:
+    """Open live streams by session id; finished streams are kept for a short while"""
+
+    def __init__(self, finished_ttl=60):
+        self.finished_ttl = finished_ttl
+        self._streams = {}
+        self._lock = threading.Lock()
+
+    def open(self, session_id, mimetype='audio/mpeg'):
+        with self._lock:
+            self._prune()
+            stream = LiveAudioStream(session_id, mimetype)
+            self._streams[session_id] = stream
+            return stream
+
+    def get(self, session_id):
+        with self._lock:
+            self._prune()
+            return self._streams.get(session_id)
+
+    def _prune(self):
+        now = time.monotonic()
+        expired = [session_id for session_id, stream in self._streams.items()
+                   if stream.finished_at is not None and now - stream.finished_at > self.finished_ttl]
+        for session_id in expired:
+            del self._streams[session_id]
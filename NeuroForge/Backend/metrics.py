@@ -0,0 +1,222 @@
+"""
+Pipeline stage timing and Prometheus metrics for the /metrics endpoint
+Stage spans feed a latency histogram and are kept per session for the
+stage_timings table; counters and gauges use the Prometheus text format (0.0.4)
+"""
+
+import time
+import threading
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + list(extra or [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    metric_type = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        if not items and not self.labelnames and self.metric_type != 'histogram':
+            items = [((), 0)]
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+class Counter(_Metric):
+    metric_type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    metric_type = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+class Histogram(_Metric):
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['counts'][index] += 1
+                    break
+            state['sum'] += value
+            state['count'] += 1
+
+    def _render_sample(self, key, state):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, state['counts']):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, [('le', _format_value(bound))])
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', '+Inf')])} {state['count']}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {state['count']}")
+        return lines
+
+class MetricsRegistry:
+    """Holds metrics plus collectors: callables returning extra exposition lines at scrape time"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                lines.extend(collector())
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+        return '\n'.join(lines) + '\n'
+
+def render_metric_family(name, documentation, samples, metric_type='gauge'):
+    """Exposition lines for values computed at scrape time; samples is [(labels dict, value)]"""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+    return lines
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    'neuroforge_stage_duration_seconds', 'Duration of translation pipeline stages', ['stage'])
+PIPELINE_SECONDS = registry.histogram(
+    'neuroforge_pipeline_duration_seconds', 'End-to-end translation pipeline duration', ['outcome'])
+HTTP_SECONDS = registry.histogram(
+    'neuroforge_http_request_duration_seconds', 'HTTP request latency', ['method', 'endpoint', 'status'])
+PIPELINES_IN_FLIGHT = registry.gauge(
+    'neuroforge_pipelines_in_flight', 'Translation pipelines currently running')
+EXTERNAL_CALL_SECONDS = registry.histogram(
+    'neuroforge_external_call_duration_seconds', 'Latency of ASR/MT/TTS engine calls', ['service'])
+EXTERNAL_CALL_FAILURES = registry.counter(
+    'neuroforge_external_call_failures_total', 'Failed ASR/MT/TTS engine calls', ['service', 'error'])
+RESULT_REUSE = registry.counter(
+    'neuroforge_result_reuse_total', 'Uploads answered from an earlier identical translation')
+
+def stage_totals(spans):
+    """Total seconds per stage (a stage can run more than once)"""
+    totals = {}
+    for stage, _, duration in spans:
+        totals[stage] = round(totals.get(stage, 0.0) + duration, 4)
+    return totals
+
+class StageTimings:
+    """Spans of one pipeline run: (stage, offset from start, duration) in seconds.
+
+    started can be shared with another instance so that spans recorded on
+    parallel branches of one run use the same time origin.
+    """
+
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.spans = []
+
+    @contextmanager
+    def span(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            self.spans.append((stage, started - self.started, duration))
+            STAGE_SECONDS.observe(duration, stage=stage)
+
+    def as_dict(self):
+        """Total seconds per stage (a stage can run more than once)"""
+        return stage_totals(self.spans)
+
+@contextmanager
+def external_call(service, ignore=()):
+    """Time an engine call; exceptions other than `ignore` count as failures"""
+    started = time.perf_counter()
+    try:
+        yield
+    except ignore:
+        raise
+    except Exception as e:
+        EXTERNAL_CALL_FAILURES.inc(service=service, error=type(e).__name__)
+        raise
+    finally:
+        EXTERNAL_CALL_SECONDS.observe(time.perf_counter() - started, service=service)
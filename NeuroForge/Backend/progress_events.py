@@ -0,0 +1,101 @@
+"""
+Per-session progress events for the /events/<session_id> Server-Sent Events feed
+The pipeline publishes stage events (upload stored, language detected, transcript,
+translation, audio) with timings; SSE clients replay and follow them
+"""
+
+import json
+import threading
+import time
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+class ProgressFeed:
+    """Ordered stage events of one session, readable while they are being produced"""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.finished_at = None
+        self._events = []
+        self._done = False
+        self._started = time.perf_counter()
+        self._last = self._started
+        self._condition = threading.Condition()
+
+    def publish(self, event, **data):
+        """Record an event; elapsed is seconds since the upload arrived, duration since the previous event"""
+        now = time.perf_counter()
+        with self._condition:
+            if self._done:
+                return
+            data['timing'] = {
+                'timestamp': datetime.now().isoformat(),
+                'elapsed': round(now - self._started, 3),
+                'duration': round(now - self._last, 3)
+            }
+            self._last = now
+            self._events.append((len(self._events) + 1, event, data))
+            self._condition.notify_all()
+
+    def finish(self):
+        with self._condition:
+            self._done = True
+            self.finished_at = time.monotonic()
+            self._condition.notify_all()
+
+    def iter_events(self, last_event_id=0, heartbeat=15, timeout=600):
+        """Yield (id, event, data) after last_event_id; yields None as a keep-alive while idle"""
+        index = last_event_id
+        idle_since = time.monotonic()
+        while True:
+            with self._condition:
+                if index >= len(self._events) and not self._done:
+                    self._condition.wait(timeout=heartbeat)
+                pending = self._events[index:]
+                index = len(self._events)
+                done = self._done
+
+            if pending:
+                idle_since = time.monotonic()
+                for item in pending:
+                    yield item
+            elif done:
+                return
+            elif time.monotonic() - idle_since > timeout:
+                logger.warning(f"Progress feed {self.session_id} timed out")
+                return
+            else:
+                yield None
+
+class ProgressFeedRegistry:
+    """Open feeds by session id; finished feeds are kept for late subscribers"""
+
+    def __init__(self, finished_ttl=300):
+        self.finished_ttl = finished_ttl
+        self._feeds = {}
+        self._lock = threading.Lock()
+
+    def open(self, session_id):
+        with self._lock:
+            self._prune()
+            feed = ProgressFeed(session_id)
+            self._feeds[session_id] = feed
+            return feed
+
+    def get(self, session_id):
+        with self._lock:
+            self._prune()
+            return self._feeds.get(session_id)
+
+    def _prune(self):
+        now = time.monotonic()
+        expired = [session_id for session_id, feed in self._feeds.items()
+                   if feed.finished_at is not None and now - feed.finished_at > self.finished_ttl]
+        for session_id in expired:
+            del self._feeds[session_id]
+
+def format_sse(event_id, event, data):
+    """Encode one event in text/event-stream format"""
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
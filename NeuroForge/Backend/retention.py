@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Storage retention for uploads/ and output_audio/
+Sessions idle longer than the age limit, or the least recently streamed ones
+while storage is over the size quota, have their files deleted and their
+translations row marked expired (/stream_audio then answers 410). Runs as a
+background sweeper inside the app or from the command line:
+
+    python retention.py --max-age-days 30 --max-size-gb 5 --dry-run
+"""
+
+import os
+import time
+import argparse
+import threading
+import logging
+from datetime import datetime, timezone
+from database import get_database
+from metrics import registry as metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Added to translations by init_database (see OPTIONAL_TRANSLATION_COLUMNS in app.py)
+RETENTION_COLUMNS = {
+    'last_accessed_at': 'REAL',
+    'expired_at': 'TEXT'
+}
+
+RETENTION_EXPIRED = metrics_registry.counter(
+    'neuroforge_retention_expired_sessions_total', 'Sessions whose audio was removed by retention', ['reason'])
+RETENTION_FREED_BYTES = metrics_registry.counter(
+    'neuroforge_retention_freed_bytes_total', 'Bytes freed by the retention sweeper')
+
+def _timestamp_to_epoch(value):
+    """created_at is 'YYYY-MM-DD HH:MM:SS' (UTC) or an isoformat string from older migrations"""
+    if not value:
+        return 0.0
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', ''))
+    except ValueError:
+        return 0.0
+    return parsed.timestamp() if parsed.tzinfo else (parsed - datetime(1970, 1, 1)).total_seconds()
+
+class RetentionPolicy:
+    """Age and size quotas over the upload, voice and TTS cache folders"""
+
+    def __init__(self, database, folders, tts_cache_dir=None, max_age=None, max_bytes=None, grace_period=900,
+                 active_holds=None):
+        self.database = database
+        self.folders = [folder for folder in folders if folder]
+        self.tts_cache_dir = tts_cache_dir
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.grace_period = grace_period
+        # Callable returning (session ids, paths) of queued or running jobs, which are never touched
+        self.active_holds = active_holds
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.max_age or self.max_bytes)
+
+    def sweep(self, dry_run=False, now=None):
+        """Apply the quotas once; returns a summary of what was (or would be) removed"""
+        with self._lock:
+            return self._sweep(dry_run, now or time.time())
+
+    def _sweep(self, dry_run, now):
+        files = self._scan_files()
+        sessions = self._load_sessions()
+
+        # Hardlinked files (reused results, TTS cache) only free space once every link is gone
+        links = {}
+        for info in files.values():
+            links[info['inode']] = links.get(info['inode'], 0) + 1
+        sizes = {info['inode']: info['size'] for info in files.values()}
+        total_bytes = sum(sizes.values())
+
+        cache_paths = {}
+        for path, info in files.items():
+            if self._in_tts_cache(path):
+                cache_paths.setdefault(info['inode'], []).append(path)
+
+        held_sessions, held_paths = self.active_holds() if self.active_holds else ((), ())
+        held_sessions = set(held_sessions)
+        held_paths = {os.path.abspath(path) for path in held_paths}
+
+        def held(path):
+            # Job outputs aren't recorded anywhere before the job ends, but carry its session id
+            return path in held_paths or any(session_id in os.path.basename(path) for session_id in held_sessions)
+
+        # Reused results share files: those sessions are kept or expired together
+        groups = {}
+        by_path = {}
+        for session in sessions:
+            group = {'sessions': [session], 'paths': set(session['paths'])}
+            for path in session['paths']:
+                other = by_path.get(path)
+                if other is not None and other is not group:
+                    group['sessions'] += other['sessions']
+                    group['paths'] |= other['paths']
+                    for merged_path in other['paths']:
+                        by_path[merged_path] = group
+                    groups.pop(id(other), None)
+            for path in group['paths']:
+                by_path[path] = group
+            groups[id(group)] = group
+
+        referenced = set(by_path)
+        candidates = []
+        for group in groups.values():
+            members = group['sessions']
+            if any(member['created'] > now - self.grace_period for member in members):
+                continue  # still being processed or just finished
+            if any(member['session_id'] in held_sessions for member in members) or any(map(held, group['paths'])):
+                continue
+            candidates.append({'kind': 'session', 'recency': max(member['recency'] for member in members),
+                               'session_ids': [member['session_id'] for member in members],
+                               'paths': [path for path in group['paths'] if path in files]})
+
+        orphans = []
+        for path, info in files.items():
+            if path in referenced or info['mtime'] > now - self.grace_period or held(path):
+                continue
+            if self._in_tts_cache(path):
+                # Cache entries still linked to a session cost nothing extra
+                if info['nlink'] > 1:
+                    continue
+                candidates.append({'kind': 'cache', 'recency': info['mtime'], 'paths': [path]})
+            else:
+                orphans.append({'kind': 'orphan', 'recency': info['mtime'], 'paths': [path]})
+
+        candidates.sort(key=lambda candidate: candidate['recency'])
+        summary = {'dry_run': dry_run, 'scanned_files': len(files), 'bytes_before': total_bytes,
+                   'expired_sessions': [], 'removed_cache_entries': 0, 'removed_orphans': 0, 'freed_bytes': 0}
+
+        def remove(path):
+            info = files.pop(path, None)
+            if not info:
+                return 0
+            if not dry_run:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.warning(f"Retention could not remove {path}: {e}")
+                    return 0
+            links[info['inode']] -= 1
+            return sizes[info['inode']] if links[info['inode']] == 0 else 0
+
+        def release(paths):
+            freed = 0
+            for path in paths:
+                inode = files[path]['inode'] if path in files else None
+                freed += remove(path)
+                # A TTS cache entry left linked only to itself goes with its last session
+                remaining_cache = [cached for cached in cache_paths.get(inode, []) if cached in files]
+                if inode and remaining_cache and links[inode] == len(remaining_cache):
+                    for cached in remaining_cache:
+                        freed += remove(cached)
+                        summary['removed_cache_entries'] += 1
+            summary['freed_bytes'] += freed
+            return freed
+
+        remaining = total_bytes
+        expired = []
+        # Orphans are the cheapest to give up, so they go before any session, but only under a quota
+        for candidate in sorted(orphans, key=lambda orphan: orphan['recency']) + candidates:
+            paths = [path for path in candidate['paths'] if path in files]
+            too_old = self.max_age and candidate['recency'] < now - self.max_age
+            # Only evict for size what actually frees something
+            over_quota = self.max_bytes and remaining > self.max_bytes and paths
+            if not (too_old or over_quota) or (candidate['kind'] != 'session' and not paths):
+                continue
+            remaining -= release(paths)
+            if candidate['kind'] == 'cache':
+                summary['removed_cache_entries'] += 1
+            elif candidate['kind'] == 'orphan':
+                summary['removed_orphans'] += 1
+            else:
+                reason = 'age' if too_old else 'size'
+                expired.extend((session_id, reason) for session_id in candidate['session_ids'])
+
+        if expired and not dry_run:
+            self._mark_expired(expired, now)
+        for _, reason in expired:
+            RETENTION_EXPIRED.inc(reason=reason)
+        if not dry_run:
+            RETENTION_FREED_BYTES.inc(summary['freed_bytes'])
+
+        summary['expired_sessions'] = [session_id for session_id, _ in expired]
+        summary['bytes_after'] = remaining
+        if expired or summary['freed_bytes']:
+            logger.info(f"🧹 Retention {'(dry run) ' if dry_run else ''}expired {len(expired)} sessions, "
+                        f"freed {summary['freed_bytes'] / 1e6:.1f} MB ({remaining / 1e6:.1f} MB in use)")
+        return summary
+
+    def _in_tts_cache(self, path):
+        return bool(self.tts_cache_dir) and os.path.dirname(path) == self.tts_cache_dir
+
+    def _scan_files(self):
+        files = {}
+        folders = list(self.folders) + ([self.tts_cache_dir] if self.tts_cache_dir else [])
+        for folder in folders:
+            if not os.path.isdir(folder):
+                continue
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if not entry.is_file(follow_symlinks=False) or entry.name.endswith('.tmp'):
+                        continue
+                    stat = entry.stat(follow_symlinks=False)
+                    files[os.path.abspath(entry.path)] = {
+                        'size': stat.st_size, 'mtime': stat.st_mtime,
+                        'inode': (stat.st_dev, stat.st_ino), 'nlink': stat.st_nlink
+                    }
+        return files
+
+    def _load_sessions(self):
+        connection = self.database.connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+            SELECT session_id, original_audio_path, audio_path, translated_audio_path,
+                   created_at, last_accessed_at
+            FROM translations WHERE expired_at IS NULL
+            """)
+            sessions = []
+            for row in cursor:
+                created = _timestamp_to_epoch(row['created_at'])
+                paths = {os.path.abspath(path) for path in
+                         (row['original_audio_path'], row['audio_path'], row['translated_audio_path']) if path}
+                sessions.append({
+                    'session_id': row['session_id'],
+                    'created': created,
+                    'recency': max(created, row['last_accessed_at'] or 0.0),
+                    'paths': paths
+                })
+            cursor.close()
+            return sessions
+        finally:
+            connection.close()
+
+    def _mark_expired(self, expired, now):
+        expired_at = datetime.fromtimestamp(now, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        with self.database.transaction() as cursor:
+            cursor.executemany(
+                "UPDATE translations SET expired_at = ? WHERE session_id = ? AND expired_at IS NULL",
+                [(expired_at, session_id) for session_id, _ in expired]
+            )
+
+class RetentionSweeper:
+    """Daemon thread that sweeps on an interval"""
+
+    def __init__(self, policy, interval=3600, on_expired=None):
+        self.policy = policy
+        self.interval = interval
+        self.on_expired = on_expired
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread or not self.policy.enabled:
+            return
+        self._thread = threading.Thread(target=self._run, name='retention-sweeper', daemon=True)
+        self._thread.start()
+        logger.info(f"🧹 Retention sweeper running every {self.interval}s")
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                summary = self.policy.sweep()
+                if self.on_expired and summary['expired_sessions']:
+                    self.on_expired(summary['expired_sessions'])
+            except Exception as e:
+                logger.error(f"Retention sweep failed: {e}")
+
+def _env_float(name, scale=1.0):
+    value = os.environ.get(name)
+    return float(value) * scale if value else None
+
+def policy_from_environment(database=None, folders=('uploads', 'output_audio'), tts_cache_dir=None, active_holds=None):
+    """NEUROFORGE_RETENTION_MAX_AGE_DAYS, NEUROFORGE_RETENTION_MAX_SIZE_MB, NEUROFORGE_RETENTION_GRACE"""
+    return RetentionPolicy(
+        database or get_database(),
+        [os.path.abspath(folder) for folder in folders],
+        tts_cache_dir=os.path.abspath(tts_cache_dir) if tts_cache_dir else None,
+        max_age=_env_float('NEUROFORGE_RETENTION_MAX_AGE_DAYS', 86400),
+        max_bytes=_env_float('NEUROFORGE_RETENTION_MAX_SIZE_MB', 1024 * 1024),
+        grace_period=float(os.environ.get('NEUROFORGE_RETENTION_GRACE', 900)),
+        active_holds=active_holds
+    )
+
+def ensure_retention_columns(database):
+    """Add the retention columns when the CLI runs against a database the app hasn't migrated yet"""
+    connection = database.connection()
+    try:
+        existing = {row[1] for row in connection.execute("PRAGMA table_info(translations)")}
+        for column, definition in RETENTION_COLUMNS.items():
+            if column not in existing:
+                connection.execute(f"ALTER TABLE translations ADD COLUMN {column} {definition}")
+        connection.commit()
+    finally:
+        connection.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply NeuroForge storage retention once')
+    parser.add_argument('--database', default=os.environ.get('NEUROFORGE_DATABASE_PATH', 'neuroforge.db'))
+    parser.add_argument('--uploads', default='uploads')
+    parser.add_argument('--output', default='output_audio')
+    parser.add_argument('--tts-cache', default=os.environ.get('NEUROFORGE_TTS_CACHE_DIR', os.path.join('output_audio', 'tts_cache')))
+    parser.add_argument('--max-age-days', type=float, help='Expire sessions not streamed for this many days')
+    parser.add_argument('--max-size-gb', type=float, help='Evict least recently streamed sessions above this total')
+    parser.add_argument('--grace-minutes', type=float, default=15, help='Never touch sessions or files younger than this')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would be removed without deleting')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    policy = RetentionPolicy(
+        get_database(args.database),
+        [os.path.abspath(args.uploads), os.path.abspath(args.output)],
+        tts_cache_dir=os.path.abspath(args.tts_cache),
+        max_age=args.max_age_days * 86400 if args.max_age_days else None,
+        max_bytes=args.max_size_gb * 1024 ** 3 if args.max_size_gb else None,
+        grace_period=args.grace_minutes * 60
+    )
+    if not policy.enabled:
+        parser.error('set --max-age-days and/or --max-size-gb')
+    ensure_retention_columns(policy.database)
+
+    summary = policy.sweep(dry_run=args.dry_run)
+    print(f"{'🔍 Dry run: ' if args.dry_run else '🧹 '}expired {len(summary['expired_sessions'])} sessions, "
+          f"removed {summary['removed_cache_entries']} cache entries and {summary['removed_orphans']} orphaned files")
+    print(f"💾 {summary['bytes_before'] / 1e6:.1f} MB -> {summary['bytes_after'] / 1e6:.1f} MB "
+          f"({summary['freed_bytes'] / 1e6:.1f} MB freed)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Shared setup for the backend tests
+The backend modules are imported from the parent directory; anything that
+touches the app runs in a scratch directory with the offline 'local' engines
+and its own database, so no network or existing data is involved.
+"""
+
+import io
+import os
+import itertools
+import sys
+import tempfile
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRATCH_DIR = tempfile.mkdtemp(prefix='neuroforge-tests-')
+
+sys.path.insert(0, BACKEND_DIR)
+os.environ['NEUROFORGE_ENGINES'] = 'local'
+os.environ['NEUROFORGE_DATABASE_PATH'] = os.path.join(SCRATCH_DIR, 'neuroforge.db')
+os.environ['NEUROFORGE_TTS_CACHE_DIR'] = os.path.join(SCRATCH_DIR, 'output_audio', 'tts_cache')
+
+@pytest.fixture(scope='session')
+def neuroforge_app():
+    """The Flask app, imported once inside the scratch directory"""
+    previous = os.getcwd()
+    os.chdir(SCRATCH_DIR)
+    try:
+        import app as neuroforge_app
+    finally:
+        os.chdir(previous)
+    # Absolute folders: send_file resolves relative paths against the Backend directory
+    for key in ('UPLOAD_FOLDER', 'OUTPUT_FOLDER'):
+        folder = os.path.join(SCRATCH_DIR, neuroforge_app.app.config[key])
+        os.makedirs(folder, exist_ok=True)
+        neuroforge_app.app.config[key] = folder
+    neuroforge_app.app.config['TESTING'] = True
+    return neuroforge_app
+
+@pytest.fixture
+def client(neuroforge_app):
+    return neuroforge_app.app.test_client()
+
+def tone_bytes(frequency=440):
+    """Two seconds of a tone as 16-bit mono WAV"""
+    import wave
+    import math
+    import struct
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as output:
+        output.setnchannels(1)
+        output.setsampwidth(2)
+        output.setframerate(16000)
+        output.writeframes(b''.join(
+            struct.pack('<h', int(8000 * math.sin(2 * math.pi * frequency * i / 16000))) for i in range(32000)
+        ))
+    return buffer.getvalue()
+
+@pytest.fixture
+def tone_wav(tmp_path):
+    """Two seconds of a 440 Hz tone as 16-bit mono WAV"""
+    path = tmp_path / 'tone.wav'
+    path.write_bytes(tone_bytes())
+    return path
+
+_frequencies = itertools.count(500)
+
+@pytest.fixture
+def fresh_audio():
+    """Returns WAV content no earlier upload had, so the pipeline runs instead of reusing a result"""
+    return lambda: tone_bytes(next(_frequencies))
+
+TRANSCRIPT = 'hello this is a short test recording for the translation pipeline'
+
+@pytest.fixture
+def transcribed(neuroforge_app, monkeypatch):
+    """Speech recognition stubbed to return TRANSCRIPT (the local engine can't transcribe a tone)"""
+    monkeypatch.setattr(neuroforge_app, 'audio_to_text', lambda audio, src_lang='en-US': TRANSCRIPT)
+    return TRANSCRIPT
+
+@pytest.fixture
+def upload(client, tone_wav, transcribed):
+    """Post tone_wav to /upload with the given form fields; returns the JSON response"""
+    def post(content=None, filename='tone.wav', **fields):
+        data = {'source_language': 'en', 'target_language': 'hi', **fields}
+        data['file'] = (io.BytesIO(content if content is not None else tone_wav.read_bytes()), filename)
+        response = client.post('/upload', data=data)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return response.get_json()
+    return post
@@ -0,0 +1,88 @@
+"""Range, ETag and conditional requests on /stream_audio and /download_audio"""
+
+import hashlib
+import pytest
+from audio_delivery import AudioMetadataCache, file_content_hash
+
+@pytest.fixture
+def session(client, upload, fresh_audio):
+    """session_id and voice bytes of a completed translation"""
+    result = upload(fresh_audio())
+    assert result['audio_available']
+    response = client.get(f"/stream_audio/{result['session_id']}")
+    assert response.status_code == 200
+    return result['session_id'], response.get_data()
+
+def test_full_response_headers(client, neuroforge_app, session):
+    session_id, audio = session
+    response = client.get(f'/stream_audio/{session_id}')
+    assert response.status_code == 200
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert response.headers['ETag'] == f'"{hashlib.sha256(audio).hexdigest()}"'
+    assert response.cache_control.private and not response.cache_control.public
+    assert response.cache_control.max_age == neuroforge_app.app.config['AUDIO_CACHE_MAX_AGE']
+
+def test_range_request(client, session):
+    session_id, audio = session
+    response = client.get(f'/stream_audio/{session_id}', headers={'Range': 'bytes=10-99'})
+    assert response.status_code == 206
+    assert response.get_data() == audio[10:100]
+    assert response.headers['Content-Range'] == f'bytes 10-99/{len(audio)}'
+
+    tail = client.get(f'/stream_audio/{session_id}', headers={'Range': 'bytes=-16'})
+    assert tail.status_code == 206 and tail.get_data() == audio[-16:]
+
+def test_unsatisfiable_range(client, session):
+    session_id, audio = session
+    response = client.get(f'/stream_audio/{session_id}', headers={'Range': f'bytes={len(audio) + 10}-'})
+    assert response.status_code == 416
+
+def test_if_none_match(client, session):
+    session_id, _ = session
+    etag = client.get(f'/stream_audio/{session_id}').headers['ETag']
+    response = client.get(f'/stream_audio/{session_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.get_data() == b''
+    changed = client.get(f'/stream_audio/{session_id}', headers={'If-None-Match': '"something-else"'})
+    assert changed.status_code == 200
+
+def test_if_range_with_a_stale_etag_sends_everything(client, session):
+    session_id, audio = session
+    response = client.get(f'/stream_audio/{session_id}',
+                          headers={'Range': 'bytes=0-9', 'If-Range': '"something-else"'})
+    assert response.status_code == 200
+    assert response.get_data() == audio
+
+def test_download_is_an_attachment_with_the_same_validators(client, session):
+    session_id, audio = session
+    stream = client.get(f'/stream_audio/{session_id}')
+    download = client.get(f'/download_audio/{session_id}')
+    assert download.status_code == 200
+    assert download.headers['Content-Disposition'].startswith('attachment;')
+    assert session_id in download.headers['Content-Disposition']
+    assert download.headers['ETag'] == stream.headers['ETag']
+    assert client.get(f'/download_audio/{session_id}',
+                      headers={'If-None-Match': download.headers['ETag']}).status_code == 304
+    assert client.get(f'/download_audio/{session_id}', headers={'Range': 'bytes=0-3'}).get_data() == audio[:4]
+
+def test_unknown_session(client):
+    assert client.get('/stream_audio/no-such-session').status_code == 404
+    assert client.get('/download_audio/no-such-session').status_code == 404
+
+def test_file_content_hash(tmp_path):
+    path = tmp_path / 'voice.mp3'
+    path.write_bytes(b'x' * 200000)
+    assert file_content_hash(str(path), chunk_size=4096) == hashlib.sha256(b'x' * 200000).hexdigest()
+
+def test_metadata_cache_lru_and_ttl(monkeypatch):
+    cache = AudioMetadataCache(max_entries=2, ttl=10)
+    clock = [100.0]
+    monkeypatch.setattr('audio_delivery.time.monotonic', lambda: clock[0])
+    cache.put('a', {'path': 'a'})
+    cache.put('b', {'path': 'b'})
+    assert cache.get('a') == {'path': 'a'}
+    cache.put('c', {'path': 'c'})  # evicts b, the least recently used
+    assert cache.get('b') is None
+    clock[0] += 11
+    assert cache.get('a') is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
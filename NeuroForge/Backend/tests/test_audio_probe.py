@@ -0,0 +1,136 @@
+"""Header probing against pydub and against files with known durations"""
+
+import os
+import io
+import shutil
+import struct
+import pytest
+from pydub import AudioSegment
+import audio_probe
+from audio_probe import AudioProbe, probe_mp3, _mp3_frame
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'test_samples')
+needs_ffmpeg = pytest.mark.skipif(not shutil.which('ffmpeg'), reason='pydub needs ffmpeg to decode this format')
+
+def mp3_frame(mode=0x00, payload=b''):
+    """One MPEG1 Layer III frame, 128 kbps at 44.1 kHz; mode 0x00 is stereo, 0xC0 mono"""
+    header = bytes([0xFF, 0xFB, 0x90, mode])
+    length = _mp3_frame(header + bytes(500), 0)[0]
+    body = bytearray(length - 4)
+    body[:len(payload)] = payload
+    return header + bytes(body)
+
+FRAME_SECONDS = 1152 / 44100
+
+def probe_bytes(data):
+    return probe_mp3(io.BytesIO(data), len(data))
+
+def test_wav_matches_pydub(tone_wav):
+    info = AudioProbe().probe(str(tone_wav))
+    audio = AudioSegment.from_file(str(tone_wav))
+    assert info['format'] == 'WAV'
+    assert info['duration'] == pytest.approx(audio.duration_seconds)
+    assert (info['channels'], info['frame_rate'], info['sample_width']) == \
+        (audio.channels, audio.frame_rate, audio.sample_width)
+
+@pytest.mark.parametrize('name, duration', [
+    ('english_sample1.mp3.mp3', 33.41),
+    ('english_sample2.mp3.mp3', 13.44),
+])
+def test_mp3_samples(name, duration):
+    path = os.path.join(SAMPLES_DIR, name)
+    info = AudioProbe().probe(path)
+    assert info['format'] == 'MP3'
+    assert info['duration'] == pytest.approx(duration, abs=0.01)
+    assert info['sample_width'] == 2
+
+@needs_ffmpeg
+@pytest.mark.parametrize('name', ['english_sample1.mp3.mp3', 'english_sample2.mp3.mp3'])
+def test_mp3_matches_pydub(name):
+    path = os.path.join(SAMPLES_DIR, name)
+    audio = AudioSegment.from_file(path)
+    info = AudioProbe().probe(path)
+    assert info['duration'] == pytest.approx(audio.duration_seconds, abs=0.06)
+    assert (info['channels'], info['frame_rate']) == (audio.channels, audio.frame_rate)
+
+def test_mp3_tag_bytes_inside_audio_are_counted():
+    data = mp3_frame(payload=bytes(100) + b'Info') + mp3_frame() * 9
+    assert probe_bytes(data)['duration'] == pytest.approx(10 * FRAME_SECONDS)
+
+@pytest.mark.parametrize('header', [
+    mp3_frame(0x00, bytes(32) + b'Xing'),
+    mp3_frame(0xC0, bytes(17) + b'Info'),
+    mp3_frame(0x00, bytes(32) + b'VBRI'),
+])
+def test_mp3_metadata_frames_are_not_audio(header):
+    assert probe_bytes(header + mp3_frame() * 9)['duration'] == pytest.approx(9 * FRAME_SECONDS)
+
+def test_mp3_xing_totals_spanning_the_file_answer_without_walking():
+    frames = 2000
+    stream = mp3_frame() * frames
+    xing = bytes(32) + b'Xing' + struct.pack('>III', 0x3, frames, len(stream))
+    data = mp3_frame(payload=xing) + stream
+    assert probe_bytes(data)['duration'] == pytest.approx(frames * FRAME_SECONDS)
+
+class CountingReader(io.BytesIO):
+    largest_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.largest_read = max(self.largest_read, len(chunk))
+        return chunk
+
+def test_mp3_is_read_in_bounded_chunks():
+    data = mp3_frame() * 20000  # ~8 MB
+    reader = CountingReader(data)
+    info = probe_mp3(reader, len(data))
+    assert info['duration'] == pytest.approx(20000 * FRAME_SECONDS)
+    assert reader.largest_read <= audio_probe.MP3_READ_CHUNK + 8192
+
+def test_non_audio_is_not_mp3():
+    data = bytes(range(256)) * 100
+    assert probe_bytes(data) is None
+
+def write_flac(path, sample_rate, channels, bits, total_samples):
+    packed = (sample_rate << 44) | ((channels - 1) << 41) | ((bits - 1) << 36) | total_samples
+    info = struct.pack('>HH', 4096, 4096) + bytes(6) + packed.to_bytes(8, 'big') + bytes(16)
+    path.write_bytes(b'fLaC' + bytes([0x80, 0, 0, 34]) + info + bytes(1000))
+
+def test_flac_streaminfo(tmp_path):
+    path = tmp_path / 'clip.flac'
+    write_flac(path, 48000, 2, 16, 48000 * 3)
+    info = AudioProbe().probe(str(path))
+    assert (info['format'], info['channels'], info['frame_rate'], info['sample_width']) == ('FLAC', 2, 48000, 2)
+    assert info['duration'] == pytest.approx(3.0)
+
+def ogg_page(granule, packet, header_type=0):
+    return (b'OggS' + bytes([0, header_type]) + struct.pack('<qII', granule, 1, 0) + bytes(4)
+            + bytes([1, len(packet)]) + packet)
+
+@pytest.mark.parametrize('codec, packet, granule', [
+    ('OGG', b'\x01vorbis' + struct.pack('<IBI', 0, 1, 22050) + bytes(12), 22050 * 4),
+    ('OPUS', b'OpusHead' + bytes([1, 2]) + struct.pack('<HI', 312, 16000) + bytes(3), 48000 * 4 + 312),
+])
+def test_ogg_last_granule(tmp_path, codec, packet, granule):
+    path = tmp_path / 'clip.ogg'
+    path.write_bytes(ogg_page(0, packet, 2) + ogg_page(granule // 2, bytes(200)) + ogg_page(granule, bytes(200), 4))
+    info = AudioProbe().probe(str(path))
+    assert info['format'] == codec
+    assert info['duration'] == pytest.approx(4.0)
+
+@needs_ffmpeg
+def test_flac_and_ogg_match_pydub(tone_wav, tmp_path):
+    audio = AudioSegment.from_file(str(tone_wav))
+    for fmt in ('flac', 'ogg'):
+        path = tmp_path / f'tone.{fmt}'
+        audio.export(str(path), format=fmt)
+        info = AudioProbe().probe(str(path))
+        assert info['duration'] == pytest.approx(AudioSegment.from_file(str(path)).duration_seconds, abs=0.05)
+
+def test_probe_cache_follows_file_changes(tone_wav):
+    probe = AudioProbe()
+    first = probe.probe(str(tone_wav))
+    with open(tone_wav, 'ab') as f:
+        f.write(bytes(10))
+    os.utime(tone_wav, ns=(0, 10 ** 9))
+    assert probe.probe(str(tone_wav))['file_size'] == first['file_size'] + 10
@@ -0,0 +1,82 @@
+"""Batch expansion: archive member names, limits and the /upload/batch endpoint"""
+
+import io
+import os
+import zipfile
+import pytest
+from werkzeug.datastructures import FileStorage
+from batch_upload import BatchFiles, BatchError
+
+def allowed_file(filename):
+    return filename.rsplit('.', 1)[-1].lower() in ('wav', 'mp3')
+
+def archive(members, name='batch.zip'):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for member, data in members.items():
+            zf.writestr(member, data)
+    buffer.seek(0)
+    return FileStorage(stream=buffer, filename=name)
+
+def test_member_paths_cannot_escape():
+    upload = archive({'../../etc/evil.wav': b'RIFF', '/abs/path/clip.wav': b'RIFF',
+                      'dir\\..\\win.wav': b'RIFF', 'nested/ok.wav': b'RIFF'})
+    with BatchFiles([upload], allowed_file) as batch:
+        names = sorted(entry.filename for entry in batch.entries)
+    assert names == ['clip.wav', 'evil.wav', 'ok.wav', 'win.wav']
+    assert all('/' not in name and '..' not in name for name in names)
+
+def test_folders_hidden_files_and_resource_forks_are_skipped():
+    upload = archive({'a.wav': b'x', 'folder/': b'', '.hidden.wav': b'x', '__MACOSX/._a.wav': b'x'})
+    with BatchFiles([upload], allowed_file) as batch:
+        assert [entry.filename for entry in batch.entries] == ['a.wav']
+
+def test_unsupported_members_are_rejected_individually():
+    upload = archive({'a.wav': b'x', 'notes.txt': b'x'})
+    with BatchFiles([upload], allowed_file) as batch:
+        errors = {entry.filename: entry.error for entry in batch.entries}
+    assert errors == {'a.wav': None, 'notes.txt': 'File type not supported'}
+
+def test_zip_bomb_is_rejected_by_declared_size():
+    # Highly compressible: a few KB on the wire, far more once unpacked
+    upload = archive({f'{i}.wav': bytes(2 * 1024 * 1024) for i in range(3)})
+    assert len(upload.stream.getvalue()) < 64 * 1024
+    with pytest.raises(BatchError, match='exceed'):
+        BatchFiles([upload], allowed_file, max_unpacked_bytes=5 * 1024 * 1024)
+
+def test_too_many_files():
+    with pytest.raises(BatchError, match='Too many files'):
+        BatchFiles([archive({f'{i}.wav': b'x' for i in range(4)})], allowed_file, max_files=3)
+
+def test_corrupt_archive_and_empty_batch():
+    with pytest.raises(BatchError, match='not a valid zip'):
+        BatchFiles([FileStorage(stream=io.BytesIO(b'PK\x03\x04 broken'), filename='x.zip')], allowed_file)
+    with pytest.raises(BatchError, match='No files'):
+        BatchFiles([archive({'folder/': b''})], allowed_file)
+
+def test_direct_uploads_and_member_streams():
+    direct = FileStorage(stream=io.BytesIO(b'direct'), filename='one.wav')
+    with BatchFiles([direct, archive({'two.wav': b'member'})], allowed_file) as batch:
+        assert [entry.open().read() for entry in batch.entries] == [b'direct', b'member']
+
+def test_batch_endpoint_keeps_members_inside_uploads(client, neuroforge_app, tone_wav):
+    upload_folder = neuroforge_app.app.config['UPLOAD_FOLDER']
+    outside = os.path.join(os.path.dirname(upload_folder), 'escape.wav')
+    data = tone_wav.read_bytes()
+    upload = archive({'../escape.wav': data, 'b.wav': data})
+    response = client.post('/upload/batch?stream=false', data={
+        'files': (upload.stream, 'batch.zip'), 'target_language': 'hi', 'source_language': 'en'
+    })
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [item['filename'] for item in body['files']] == ['escape.wav', 'b.wav']
+    assert all(item['status'] == 'queued' for item in body['files'])
+    assert len(body['results']) == 2
+    assert not os.path.exists(outside)
+
+def test_batch_endpoint_rejects_bombs(client, neuroforge_app, monkeypatch):
+    monkeypatch.setitem(neuroforge_app.app.config, 'BATCH_MAX_UNPACKED_MB', 1)
+    upload = archive({'big.wav': bytes(2 * 1024 * 1024)})
+    response = client.post('/upload/batch', data={'files': (upload.stream, 'batch.zip')})
+    assert response.status_code == 400
+    assert 'exceed' in response.get_json()['error']
@@ -0,0 +1,139 @@
+"""Connection pool leases and transaction semantics"""
+
+import sqlite3
+import threading
+import pytest
+from database import Database
+
+@pytest.fixture
+def database(tmp_path):
+    database = Database(str(tmp_path / 'test.db'), max_idle=2)
+    with database.transaction() as cursor:
+        cursor.execute("CREATE TABLE items (name TEXT UNIQUE)")
+    yield database
+    database.close_idle()
+
+def names(database):
+    connection = database.connection()
+    try:
+        return sorted(row['name'] for row in connection.execute("SELECT name FROM items"))
+    finally:
+        connection.close()
+
+def test_wal_mode(database):
+    connection = database.connection()
+    try:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    finally:
+        connection.close()
+    assert database.stats()['journal_mode'] == 'wal'
+
+def test_nested_leases_share_the_thread_connection(database):
+    outer = database.connection()
+    inner = database.connection()
+    assert inner._connection is outer._connection
+    inner.close()
+    inner.close()  # a lease is released once
+    assert database.stats()['idle_connections'] == 0
+    outer.close()
+    assert database.stats()['idle_connections'] == 1
+
+def test_released_connections_are_reused_across_threads(database):
+    def lease():
+        database.connection().close()
+    for _ in range(3):
+        thread = threading.Thread(target=lease)
+        thread.start()
+        thread.join()
+    stats = database.stats()
+    assert stats['reused'] >= 2
+    assert stats['idle_connections'] <= 2
+
+def test_release_rolls_back_uncommitted_work(database):
+    connection = database.connection()
+    connection.execute("INSERT INTO items VALUES ('dangling')")
+    connection.close()
+    assert names(database) == []
+
+def test_transaction_commits_and_rolls_back(database):
+    with database.transaction() as cursor:
+        cursor.execute("INSERT INTO items VALUES ('a')")
+    with pytest.raises(ValueError):
+        with database.transaction() as cursor:
+            cursor.execute("INSERT INTO items VALUES ('b')")
+            raise ValueError('abort')
+    assert names(database) == ['a']
+
+def test_nested_transaction_uses_a_savepoint(database):
+    with database.transaction() as cursor:
+        cursor.execute("INSERT INTO items VALUES ('outer')")
+        with pytest.raises(sqlite3.IntegrityError):
+            with database.transaction() as nested:
+                nested.execute("INSERT INTO items VALUES ('inner')")
+                nested.execute("INSERT INTO items VALUES ('outer')")
+        with database.transaction() as nested:
+            nested.execute("INSERT INTO items VALUES ('kept')")
+    assert names(database) == ['kept', 'outer']
+
+def test_transaction_refuses_to_join_a_foreign_transaction(database):
+    leaked = database.connection()
+    leaked.execute("INSERT INTO items VALUES ('uncommitted')")
+    with pytest.raises(sqlite3.ProgrammingError):
+        with database.transaction() as cursor:
+            cursor.execute("INSERT INTO items VALUES ('lost')")
+    leaked.close()
+    # The failed attempt didn't keep the connection leased, and later work commits normally
+    with database.transaction() as cursor:
+        cursor.execute("INSERT INTO items VALUES ('after')")
+    assert names(database) == ['after']
+
+def test_writers_wait_for_each_other(database):
+    errors = []
+
+    def write(index):
+        try:
+            for i in range(20):
+                with database.transaction() as cursor:
+                    cursor.execute("INSERT INTO items VALUES (?)", (f'{index}-{i}',))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(names(database)) == 80
+
+def test_register_failure_does_not_leave_an_open_transaction(client, neuroforge_app, monkeypatch):
+    response = client.post('/register', json={'email': 'pool@example.com', 'password': 'secret1', 'name': 'Pool'})
+    assert response.get_json()['success']
+    assert client.post('/register', json={'email': 'pool@example.com', 'password': 'secret1',
+                                          'name': 'Pool'}).status_code == 400
+
+    def failing_hash(password):
+        raise RuntimeError('hash backend down')
+
+    monkeypatch.setattr(neuroforge_app, 'hash_password', failing_hash)
+    assert client.post('/register', json={'email': 'other@example.com', 'password': 'secret1',
+                                          'name': 'Other'}).status_code == 500
+    connection = neuroforge_app.database.connection()
+    try:
+        assert not connection.in_transaction
+    finally:
+        connection.close()
+
+def test_reused_result_is_committed(upload, neuroforge_app):
+    first = upload(voice_type='slow')
+    second = upload(voice_type='slow')
+    assert first['audio_available']
+    assert second['reused_from'] == first['session_id']
+    connection = neuroforge_app.database.connection()
+    try:
+        row = connection.execute("SELECT original_text FROM translations WHERE session_id = ?",
+                                 (second['session_id'],)).fetchone()
+        assert row['original_text'] == first['original_text']
+        assert not connection.in_transaction
+    finally:
+        connection.close()
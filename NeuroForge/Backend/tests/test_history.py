@@ -0,0 +1,123 @@
+"""Keyset pagination, filters and full-text search of /history"""
+
+import sqlite3
+import pytest
+from history import (HISTORY_FIELDS, build_history_query, page_from_rows, ensure_history_schema,
+                     fts_match_expression, decode_cursor)
+
+TEXTS = [
+    'the quick brown fox', 'say "hello" AND goodbye', 'minus -sign and star*', 'NEAR(plain words)',
+    'नमस्ते दुनिया', 'the lazy dog'
+]
+
+@pytest.fixture
+def connection(tmp_path):
+    connection = sqlite3.connect(str(tmp_path / 'history.db'))
+    connection.row_factory = sqlite3.Row
+    columns = ', '.join(field for field in HISTORY_FIELDS if field != 'created_at')
+    connection.execute(f"CREATE TABLE translations (id INTEGER PRIMARY KEY, {columns}, created_at TEXT)")
+    assert ensure_history_schema(connection.cursor())
+    # Two rows per timestamp so that pages have to break ties by id
+    connection.executemany(
+        "INSERT INTO translations (session_id, target_language, original_text, translated_text, created_at) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [(f's{i}', 'hi' if i % 2 else 'es', text, '', f'2024-01-0{1 + i // 2} 10:00:00')
+         for i, text in enumerate(TEXTS)]
+    )
+    yield connection
+    connection.close()
+
+def fetch(connection, **args):
+    sql, params, fields, limit = build_history_query(args)
+    return page_from_rows(connection.execute(sql, params).fetchall(), fields, limit)
+
+def test_keyset_pages_cover_every_row_once(connection):
+    seen = []
+    cursor = None
+    while True:
+        args = {'limit': '4', 'fields': 'session_id'}
+        if cursor:
+            args['cursor'] = cursor
+        page, cursor = fetch(connection, **args)
+        seen.extend(item['session_id'] for item in page)
+        if not cursor:
+            break
+    # Newest first; within a timestamp the higher id first
+    assert seen == ['s5', 's4', 's3', 's2', 's1', 's0']
+
+def test_last_page_has_no_cursor(connection):
+    page, cursor = fetch(connection, limit='6')
+    assert len(page) == 6 and cursor is None
+
+def test_cursor_encodes_the_last_row(connection):
+    page, cursor = fetch(connection, limit='3')
+    assert decode_cursor(cursor) == ('2024-01-02 10:00:00', 4)
+
+def test_field_projection(connection):
+    page, _ = fetch(connection, fields='session_id,target_language', limit='1')
+    assert page == [{'session_id': 's5', 'target_language': 'hi'}]
+
+def test_filters(connection):
+    page, _ = fetch(connection, target_language='es', fields='session_id')
+    assert [item['session_id'] for item in page] == ['s4', 's2', 's0']
+    page, _ = fetch(connection, **{'from': '2024-01-02', 'to': '2024-01-03', 'fields': 'session_id'})
+    assert [item['session_id'] for item in page] == ['s3', 's2']
+
+@pytest.mark.parametrize('args', [
+    {'limit': 'many'}, {'fields': 'session_id,password_hash'}, {'cursor': 'not-a-cursor'},
+    {'from': 'yesterday'}, {'q': '* *'}
+])
+def test_invalid_parameters(args):
+    with pytest.raises(ValueError):
+        build_history_query(args)
+
+def test_search_requires_the_index():
+    with pytest.raises(ValueError):
+        build_history_query({'q': 'fox'}, search_available=False)
+
+def test_match_expression_quotes_terms():
+    assert fts_match_expression('quick fox') == '"quick" "fox"'
+    assert fts_match_expression('say "hello"') == '"say" """hello"""'
+    assert fts_match_expression('bro*') == '"bro"*'
+
+@pytest.mark.parametrize('query, expected', [
+    ('fox', ['s0']),
+    ('QUICK bro*', ['s0']),
+    ('"hello"', ['s1']),
+    ('AND', ['s2', 's1']),
+    ('-sign', ['s2']),
+    ('star*', ['s2']),
+    ('NEAR(plain', ['s3']),
+    ('नमस्ते', ['s4']),
+    ('the', ['s5', 's0']),
+    ('OR', []),
+])
+def test_search_input_is_not_query_syntax(connection, query, expected):
+    page, _ = fetch(connection, q=query, fields='session_id')
+    assert [item['session_id'] for item in page] == expected
+
+def test_search_index_follows_updates_and_deletes(connection):
+    connection.execute("UPDATE translations SET original_text = 'a sleepy cat' WHERE session_id = 's5'")
+    connection.execute("DELETE FROM translations WHERE session_id = 's0'")
+    assert fetch(connection, q='the')[0] == []
+    assert [item['session_id'] for item in fetch(connection, q='cat')[0]] == ['s5']
+
+def test_history_endpoint(client, neuroforge_app, upload):
+    upload()
+    upload()
+    response = client.get('/history?limit=1&fields=session_id,original_text')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['total'] == 1 and body['next_cursor']
+    assert set(body['history'][0]) == {'session_id', 'original_text'}
+    following = client.get(f"/history?limit=1&fields=session_id&cursor={body['next_cursor']}").get_json()
+    assert following['history'][0]['session_id'] != body['history'][0]['session_id']
+
+    if neuroforge_app.app.config.get('HISTORY_SEARCH'):
+        found = client.get('/history?q=translation+"pipeline&fields=original_text').get_json()['history']
+        assert found and all('pipeline' in item['original_text'] for item in found)
+
+def test_history_endpoint_rejects_bad_input(client):
+    response = client.get('/history?fields=password_hash')
+    assert response.status_code == 400
+    assert 'password_hash' in response.get_json()['error']
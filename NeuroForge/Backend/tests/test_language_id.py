@@ -0,0 +1,98 @@
+"""Offline language ranking and the auto-detect candidate narrowing built on it"""
+
+import pytest
+import audio_processing
+from language_id import rank_languages, script_shares
+
+DEFAULT_CANDIDATES = [(lang.split('-')[0], lang) for lang in
+                      ['en-US', 'es-ES', 'fr-FR', 'de-DE', 'it-IT', 'pt-PT',
+                       'ru-RU', 'ja-JP', 'ko-KR', 'zh-CN', 'ar-SA', 'hi-IN']]
+LANGS = [lang for lang, _ in DEFAULT_CANDIDATES]
+
+def top(text, candidates=LANGS):
+    return rank_languages(text, candidates)[0][0]
+
+def test_script_shares():
+    assert script_shares('hello') == {'latin': 1.0}
+    assert script_shares('नमस्ते')['devanagari'] == 1.0
+    assert script_shares('123 !?') == {}
+
+@pytest.mark.parametrize('text, expected', [
+    ('hello there', 'en'),
+    ('where is the station', 'en'),
+    ('hola como estas', 'es'),
+    ('guten tag', 'de'),
+    ('मेरा नाम राहुल है', 'hi'),
+    ('сегодня хорошая погода', 'ru'),
+    ('مرحبا كيف حالك', 'ar'),
+    ('今日は天気がいいです', 'ja'),
+    ('안녕하세요', 'ko'),
+    ('mera naam rahul hai', 'hi'),
+    ('shukran habibi', 'ar'),
+])
+def test_rank_languages_top(text, expected):
+    assert top(text) == expected
+
+def test_rank_languages_scores_are_a_distribution():
+    ranking = rank_languages('the weather is nice today', LANGS)
+    assert [lang for lang, _ in ranking][0] == 'en'
+    assert sum(score for _, score in ranking) == pytest.approx(1.0)
+    assert rank_languages('1234', LANGS) == []
+
+def test_ties_keep_candidate_order():
+    ranking = rank_languages('ok', ['fr', 'en', 'es'])
+    assert ranking[0][0] == 'fr'
+
+@pytest.fixture
+def recognitions(monkeypatch):
+    """Fake recognizer returning canned transcripts per recognizer language; records every call"""
+    calls = []
+    transcripts = {}
+
+    def audio_to_text(file_path, src_lang='en-US'):
+        calls.append(src_lang)
+        return transcripts.get(src_lang, '')
+
+    monkeypatch.setattr(audio_processing, 'audio_to_text', audio_to_text)
+    return calls, transcripts
+
+def identify(candidates=DEFAULT_CANDIDATES):
+    prepared = object.__new__(audio_processing.PreparedAudio)
+    return audio_processing.identify_language(
+        prepared, candidates, score_fn=lambda text: min(len(text.strip()) / 50.0, 1.0), threshold=0.7, keep=2)
+
+def test_short_english_accepted_after_one_recognition(recognitions):
+    calls, transcripts = recognitions
+    transcripts['en-US'] = 'hello there'
+    lang, text, _ = identify()
+    assert (lang, text) == ('en', 'hello there')
+    assert calls == ['en-US']
+
+def test_devanagari_hindi_accepted_after_one_recognition(recognitions):
+    calls, transcripts = recognitions
+    transcripts['hi-IN'] = 'मेरा नाम राहुल है'
+    candidates = [DEFAULT_CANDIDATES[-1]] + DEFAULT_CANDIDATES[:-1]
+    lang, _, _ = identify(candidates)
+    assert lang == 'hi'
+    assert calls == ['hi-IN']
+
+def test_romanized_hindi_gets_a_second_pass_in_hindi(recognitions):
+    calls, transcripts = recognitions
+    transcripts['en-US'] = 'mera naam rahul hai aur main pune mein rehta hoon'
+    transcripts['hi-IN'] = 'मेरा नाम राहुल है और मैं पुणे में रहता हूँ'
+    lang, _, _ = identify()
+    assert lang == 'hi'
+    assert 'hi-IN' in calls
+
+def test_second_pass_is_capped_at_keep(recognitions):
+    calls, transcripts = recognitions
+    transcripts['en-US'] = 'bahut accha laga'
+    identify()
+    # First pass plus at most `keep` others, the history-ordered runner-up among them
+    assert len(calls) <= 3
+    assert calls[0] == 'en-US' and 'es-ES' in calls
+
+def test_nothing_recognized_falls_back_to_every_candidate(recognitions):
+    calls, _ = recognitions
+    assert identify()[0] is None
+    assert len(calls) == len(DEFAULT_CANDIDATES)
@@ -0,0 +1,85 @@
+"""Observed language frequencies and the auto-detect order derived from them"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+import pytest
+from language_stats import (ensure_language_stats_schema, record_language, order_languages,
+                            GLOBAL_SCOPE, user_scope)
+
+@pytest.fixture
+def connection():
+    connection = sqlite3.connect(':memory:')
+    connection.execute("""
+    CREATE TABLE translations (
+        id INTEGER PRIMARY KEY, user_id TEXT, detected_source_language TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    ensure_language_stats_schema(connection.cursor())
+    yield connection
+    connection.close()
+
+def record(connection, language, times=1, user_id=None):
+    for _ in range(times):
+        record_language(connection.cursor(), language, user_id)
+
+def test_no_statistics_keeps_configured_order(connection):
+    assert order_languages(connection, ['en', 'es', 'hi']) == ['en', 'es', 'hi']
+
+def test_most_frequent_first_and_unseen_keep_their_order(connection):
+    record(connection, 'hi', 5)
+    record(connection, 'es', 2)
+    assert order_languages(connection, ['en', 'es', 'fr', 'hi']) == ['hi', 'es', 'en', 'fr']
+
+def test_unknown_and_empty_are_not_counted(connection):
+    record(connection, 'unknown', 3)
+    record(connection, '', 3)
+    assert connection.execute("SELECT COUNT(*) FROM language_stats").fetchone()[0] == 0
+
+def test_user_history_outweighs_global_traffic(connection):
+    record(connection, 'en', 50)
+    record(connection, 'mr', 20, user_id='u1')
+    assert order_languages(connection, ['en', 'hi'], user_id='u1')[0] == 'mr'
+    assert order_languages(connection, ['en', 'hi'], user_id='u2')[0] == 'en'
+    counts = dict(connection.execute("SELECT scope, SUM(uploads) FROM language_stats GROUP BY scope").fetchall())
+    assert counts == {GLOBAL_SCOPE: 70, user_scope('u1'): 20}
+
+def test_extra_languages_need_min_uploads_and_are_capped(connection):
+    record(connection, 'ta', 3)
+    record(connection, 'te', 2)
+    assert order_languages(connection, ['en'], min_uploads=3) == ['ta', 'en']
+    for language in ('bn', 'gu', 'kn', 'ml', 'pa'):
+        record(connection, language, 3)
+    assert len(order_languages(connection, ['en'], min_uploads=3, max_extra=4)) == 5
+
+def test_tied_extras_are_ordered_by_code(connection):
+    for language in ('ta', 'ml', 'bn', 'kn', 'gu', 'pa'):
+        record(connection, language, 3)
+    assert order_languages(connection, ['en'], max_extra=4) == ['bn', 'gu', 'kn', 'ml', 'en']
+
+def test_order_is_stable_across_hash_seeds():
+    script = (
+        "import sqlite3, sys; sys.path.insert(0, '.');"
+        "from language_stats import *;"
+        "c = sqlite3.connect(':memory:');"
+        "c.execute('CREATE TABLE translations (id INTEGER, user_id TEXT, detected_source_language TEXT, created_at TEXT)');"
+        "ensure_language_stats_schema(c.cursor());"
+        "[record_language(c.cursor(), l) for l in ('ta', 'ml', 'bn', 'kn', 'gu', 'pa') for _ in range(3)];"
+        "print(order_languages(c, ['en'], max_extra=3))"
+    )
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    outputs = {
+        subprocess.run([sys.executable, '-c', script], cwd=backend, capture_output=True, text=True,
+                       env={**os.environ, 'PYTHONHASHSEED': str(seed)}, check=True).stdout
+        for seed in range(6)
+    }
+    assert len(outputs) == 1
+
+def test_rebuild_from_translation_history(connection):
+    connection.executemany("INSERT INTO translations (user_id, detected_source_language) VALUES (?, ?)",
+                           [('u1', 'hi'), ('u1', 'hi'), (None, 'en'), (None, 'unknown')])
+    ensure_language_stats_schema(connection.cursor(), rebuild=True)
+    rows = set(connection.execute("SELECT scope, language, uploads FROM language_stats").fetchall())
+    assert rows == {(GLOBAL_SCOPE, 'hi', 2), (GLOBAL_SCOPE, 'en', 1), (user_scope('u1'), 'hi', 2)}
@@ -0,0 +1,58 @@
+"""Stage timings and the Prometheus /metrics endpoint"""
+
+from metrics import MetricsRegistry, StageTimings, stage_totals
+
+def test_counter_and_histogram_exposition():
+    registry = MetricsRegistry()
+    requests = registry.counter('test_requests_total', 'Requests', ['status'])
+    latency = registry.histogram('test_latency_seconds', 'Latency', buckets=(0.1, 1.0))
+    requests.inc(status='200')
+    requests.inc(2, status='200')
+    latency.observe(0.05)
+    latency.observe(0.5)
+    text = registry.render()
+    assert '# TYPE test_requests_total counter' in text
+    assert 'test_requests_total{status="200"} 3' in text
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 2' in text
+    assert 'test_latency_seconds_count 2' in text
+
+def test_stage_totals_add_repeated_stages():
+    spans = [('translation', 0.0, 0.25), ('tts', 0.25, 0.5), ('translation', 0.75, 0.25)]
+    assert stage_totals(spans) == {'translation': 0.5, 'tts': 0.5}
+
+def test_spans_share_a_time_origin():
+    timings = StageTimings()
+    with timings.span('decode'):
+        pass
+    branch = StageTimings(started=timings.started)
+    with branch.span('tts'):
+        pass
+    assert branch.spans[0][1] >= timings.spans[0][1] >= 0
+
+def test_upload_records_stage_timings(client, upload, fresh_audio):
+    result = upload(fresh_audio())
+    assert {'decode', 'asr', 'translation', 'db_write'} <= set(result['stage_timings'])
+
+    response = client.get(f"/timings/{result['session_id']}")
+    assert response.status_code == 200
+    stages = response.get_json()['stages']
+    assert [span['stage'] for span in stages][:2] == ['decode', 'asr']
+    offsets = [span['started_offset'] for span in stages]
+    assert offsets == sorted(offsets)
+    assert all(span['duration'] >= 0 for span in stages)
+
+def test_timings_of_unknown_session(client):
+    assert client.get('/timings/no-such-session').status_code == 404
+
+def test_metrics_endpoint(client, upload, fresh_audio):
+    upload(fresh_audio())
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert 'neuroforge_stage_duration_seconds_count{stage="asr"}' in text
+    assert 'neuroforge_pipeline_duration_seconds_count' in text
+    assert 'neuroforge_http_request_duration_seconds_bucket{' in text
+    assert 'neuroforge_pipelines_in_flight 0' in text
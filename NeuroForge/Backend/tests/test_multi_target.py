@@ -0,0 +1,64 @@
+"""One upload fanned out over several target languages"""
+
+import io
+import pytest
+from conftest import TRANSCRIPT
+
+@pytest.fixture
+def recognitions(neuroforge_app, monkeypatch, transcribed):
+    """Counts speech recognition calls"""
+    calls = []
+    def audio_to_text(audio, src_lang='en-US'):
+        calls.append(src_lang)
+        return TRANSCRIPT
+    monkeypatch.setattr(neuroforge_app, 'audio_to_text', audio_to_text)
+    return calls
+
+def test_fan_out_transcribes_once(client, upload, fresh_audio, recognitions):
+    result = upload(fresh_audio(), target_languages='hi, es,fr,es')
+    assert len(recognitions) == 1
+    assert result['target_languages'] == ['hi', 'es', 'fr']
+    assert result['parent_session_id'] == result['session_id']
+
+    translations = result['translations']
+    assert [item['target_language'] for item in translations] == ['hi', 'es', 'fr']
+    session_ids = {item['session_id'] for item in translations}
+    assert len(session_ids) == 3 and result['session_id'] not in session_ids
+    for item in translations:
+        assert item['parent_session_id'] == result['session_id']
+        assert item['original_text'] == TRANSCRIPT
+        assert 'asr' in item['stage_timings'] and 'translation' in item['stage_timings']
+        assert client.get(f"/stream_audio/{item['session_id']}").status_code == 200
+
+    children = client.get(f"/history?parent_session_id={result['session_id']}&fields=session_id,target_language")
+    assert {(item['session_id'], item['target_language']) for item in children.get_json()['history']} == \
+        {(item['session_id'], item['target_language']) for item in translations}
+
+def test_repeated_form_fields(upload, fresh_audio, recognitions):
+    result = upload(fresh_audio(), target_languages=['hi', 'es'])
+    assert result['target_languages'] == ['hi', 'es']
+
+def test_single_target_keeps_the_plain_response(upload, fresh_audio, recognitions):
+    result = upload(fresh_audio(), target_languages='es')
+    assert result['target_language'] == 'es'
+    assert 'translations' not in result and 'parent_session_id' not in result
+
+def test_one_failing_target_does_not_fail_the_others(neuroforge_app, monkeypatch, upload, fresh_audio, recognitions):
+    render_target = neuroforge_app._render_target
+    def flaky(session_id, target_language, *args, **kwargs):
+        if target_language == 'fr':
+            raise RuntimeError('engine down')
+        return render_target(session_id, target_language, *args, **kwargs)
+    monkeypatch.setattr(neuroforge_app, '_render_target', flaky)
+
+    result = upload(fresh_audio(), target_languages='hi,fr')
+    by_target = {item['target_language']: item for item in result['translations']}
+    assert by_target['hi']['audio_available']
+    assert not by_target['fr']['audio_available']
+    assert by_target['fr']['translated_text'].startswith('Error')
+
+def test_too_many_targets(client, neuroforge_app, tone_wav):
+    limit = neuroforge_app.app.config['MAX_TARGET_LANGUAGES']
+    targets = ','.join(f'x{i}' for i in range(limit + 1))
+    response = client.post('/upload', data={'file': (io.BytesIO(tone_wav.read_bytes()), 'tone.wav'), 'target_languages': targets})
+    assert response.status_code == 400
@@ -0,0 +1,136 @@
+"""Age and size eviction by the retention policy, and 410 for expired sessions"""
+
+import os
+import time
+import pytest
+from database import Database
+from retention import RetentionPolicy
+
+NOW = time.time()
+DAY = 86400
+
+@pytest.fixture
+def storage(tmp_path):
+    """A database with the translations columns retention reads, plus upload/output folders"""
+    database = Database(str(tmp_path / 'retention.db'))
+    with database.transaction() as cursor:
+        cursor.execute("""
+        CREATE TABLE translations (
+            session_id TEXT, original_audio_path TEXT, audio_path TEXT, translated_audio_path TEXT,
+            created_at TEXT, last_accessed_at REAL, expired_at TEXT
+        )
+        """)
+    folders = [str(tmp_path / 'uploads'), str(tmp_path / 'output_audio')]
+    for folder in folders:
+        os.makedirs(folder)
+    yield database, folders
+    database.close_idle()
+
+def add_session(storage, session_id, age_days, size=1000, accessed_days=None, shared_with=None):
+    database, (uploads, outputs) = storage
+    upload = os.path.join(uploads, f'{session_id}.wav')
+    voice = shared_with or os.path.join(outputs, f'{session_id}.mp3')
+    for path in (upload, voice):
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(b'\0' * size)
+            os.utime(path, (NOW - age_days * DAY, NOW - age_days * DAY))
+    created_at = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(NOW - age_days * DAY))
+    accessed = NOW - accessed_days * DAY if accessed_days is not None else None
+    with database.transaction() as cursor:
+        cursor.execute("INSERT INTO translations VALUES (?, ?, ?, ?, ?, ?, NULL)",
+                       (session_id, upload, upload, voice, created_at, accessed))
+    return upload, voice
+
+def expired(storage):
+    database, _ = storage
+    connection = database.connection()
+    try:
+        return sorted(row['session_id'] for row in
+                      connection.execute("SELECT session_id FROM translations WHERE expired_at IS NOT NULL"))
+    finally:
+        connection.close()
+
+def policy(storage, **limits):
+    database, folders = storage
+    return RetentionPolicy(database, folders, **limits)
+
+def test_age_limit_expires_idle_sessions(storage):
+    old_files = add_session(storage, 'old', age_days=40)
+    add_session(storage, 'recent', age_days=5)
+    add_session(storage, 'streamed', age_days=40, accessed_days=1)
+
+    summary = policy(storage, max_age=30 * DAY).sweep(now=NOW)
+    assert summary['expired_sessions'] == ['old']
+    assert summary['freed_bytes'] == 2000
+    assert not any(os.path.exists(path) for path in old_files)
+    assert expired(storage) == ['old']
+
+def test_size_quota_evicts_least_recently_streamed_first(storage):
+    add_session(storage, 'a', age_days=3, accessed_days=0.5)
+    add_session(storage, 'b', age_days=2)
+    add_session(storage, 'c', age_days=1)
+
+    summary = policy(storage, max_bytes=3500).sweep(now=NOW)
+    assert summary['expired_sessions'] == ['b', 'c']
+    assert summary['bytes_after'] == 2000
+    assert expired(storage) == ['b', 'c']
+
+def test_grace_period_and_holds(storage):
+    add_session(storage, 'fresh', age_days=0)
+    add_session(storage, 'held', age_days=40)
+    retention = policy(storage, max_age=DAY, active_holds=lambda: (['held'], []))
+    assert retention.sweep(now=NOW)['expired_sessions'] == []
+
+def test_dry_run_removes_nothing(storage):
+    files = add_session(storage, 'old', age_days=40)
+    summary = policy(storage, max_age=DAY).sweep(dry_run=True, now=NOW)
+    assert summary['expired_sessions'] == ['old'] and summary['freed_bytes'] == 2000
+    assert all(os.path.exists(path) for path in files)
+    assert expired(storage) == []
+
+def test_shared_audio_expires_with_every_session(storage):
+    _, voice = add_session(storage, 'first', age_days=40)
+    # A reused result points at the same voice file and was streamed recently
+    add_session(storage, 'reused', age_days=40, accessed_days=1, shared_with=voice)
+    assert policy(storage, max_age=30 * DAY).sweep(now=NOW)['expired_sessions'] == []
+
+    summary = policy(storage, max_bytes=1).sweep(now=NOW)
+    assert sorted(summary['expired_sessions']) == ['first', 'reused']
+    assert not os.path.exists(voice)
+
+def test_orphaned_files_go_before_sessions(storage):
+    add_session(storage, 'kept', age_days=3)
+    _, (uploads, _) = storage
+    orphan = os.path.join(uploads, 'orphan.wav')
+    with open(orphan, 'wb') as f:
+        f.write(b'\0' * 1000)
+    os.utime(orphan, (NOW - 2 * DAY, NOW - 2 * DAY))
+
+    summary = policy(storage, max_bytes=2000).sweep(now=NOW)
+    assert summary['removed_orphans'] == 1 and summary['expired_sessions'] == []
+    assert not os.path.exists(orphan)
+
+def test_expired_session_audio_is_gone(client, neuroforge_app, upload, fresh_audio):
+    session_id = upload(fresh_audio())['session_id']
+    assert client.get(f'/stream_audio/{session_id}').status_code == 200
+
+    connection = neuroforge_app.database.connection()
+    try:
+        others = [row['session_id'] for row in connection.execute(
+            "SELECT session_id FROM translations WHERE session_id != ?", (session_id,))]
+    finally:
+        connection.close()
+    retention = RetentionPolicy(neuroforge_app.database, neuroforge_app.retention_policy.folders,
+                                max_age=1, grace_period=0, active_holds=lambda: (others, []))
+    summary = retention.sweep(now=time.time() + 60)
+    assert session_id in summary['expired_sessions']
+
+    # The cached delivery metadata still points at the removed file
+    for url in (f'/stream_audio/{session_id}', f'/download_audio/{session_id}'):
+        response = client.get(url)
+        assert response.status_code == 410
+        assert response.get_json()['error'] == 'expired'
+        assert response.get_json()['expired_at']
+    history = client.get('/history?fields=session_id,expired_at&limit=500').get_json()['history']
+    assert any(item['session_id'] == session_id and item['expired_at'] for item in history)
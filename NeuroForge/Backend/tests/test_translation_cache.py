@@ -0,0 +1,51 @@
+"""Translation cache keys, schema migration and lookup accounting"""
+
+import sqlite3
+import pytest
+import audio_processing
+from translation_cache import TranslationCache
+
+@pytest.fixture
+def cache(tmp_path):
+    return TranslationCache(db_path=str(tmp_path / 'cache.db'))
+
+def test_entries_are_kept_per_engine(cache):
+    cache.put('hello', 'en', 'hi', 'local', '[hi] hello')
+    cache._memory.clear()
+    assert cache.get('hello', 'en', 'hi', 'google') is None
+    assert cache.get('hello', 'en', 'hi', 'local') == '[hi] hello'
+
+def test_normalized_text_shares_an_entry(cache):
+    cache.put('hello   world', 'en', 'hi', 'local', 'x')
+    assert cache.get('hello world ', 'en', 'hi', 'local') == 'x'
+
+def test_tables_without_engine_are_recreated(tmp_path):
+    path = str(tmp_path / 'old.db')
+    connection = sqlite3.connect(path)
+    connection.execute("""
+    CREATE TABLE translation_cache (source_language TEXT, target_language TEXT, text_hash TEXT,
+        translated_text TEXT, latency REAL, hit_count INTEGER, created_at REAL, last_used_at REAL,
+        PRIMARY KEY (source_language, target_language, text_hash))
+    """)
+    connection.commit()
+    connection.close()
+    cache = TranslationCache(db_path=path)
+    cache.put('hello', 'en', 'hi', 'google', 'namaste')
+    cache._memory.clear()
+    assert cache.get('hello', 'en', 'hi', 'google') == 'namaste'
+
+def test_long_text_counts_one_lookup(cache, monkeypatch):
+    monkeypatch.setattr(audio_processing, 'translation_cache', cache)
+    text = ' '.join(f'Sentence number {i} of a long transcript.' for i in range(250))
+    assert len(text) > audio_processing.TRANSLATION_SEGMENT_CHARS
+    audio_processing.translate_text(text, 'en', 'hi')
+    stats = cache.stats()
+    assert stats['misses'] == 1
+    assert stats['segment_misses'] >= 2
+    audio_processing.translate_text(text, 'en', 'hi')
+    stats = cache.stats()
+    assert (stats['misses'], stats['memory_hits'], stats['hit_rate']) == (1, 1, 0.5)
+
+def test_metrics_label_segment_lookups(client):
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'neuroforge_cache_misses_total{cache="translation_segment"}' in body
@@ -0,0 +1,246 @@
+"""
+Two-tier cache for translate_text results
+In-process LRU in front of a SQLite table (translation_cache in neuroforge.db),
+keyed on (MT engine, source language, target language, normalized text hash)
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+import logging
+from collections import OrderedDict
+from database import get_database
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATABASE_PATH = 'neuroforge.db'
+
+def normalize_text(text):
+    """Unicode NFC and collapsed whitespace, so trivially different inputs share an entry"""
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFC', text)).strip()
+
+def text_hash(text):
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+class TranslationCache:
+    """LRU memory tier backed by a persistent SQLite tier with size and age eviction"""
+
+    def __init__(self, db_path=DEFAULT_DATABASE_PATH, max_memory_entries=2048,
+                 max_db_entries=100000, max_age=30 * 24 * 3600, enabled=True):
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self.max_db_entries = max_db_entries
+        self.max_age = max_age
+        self.enabled = enabled
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._table_ready = False
+        self._writes_since_eviction = 0
+        self._stats = {
+            'memory_hits': 0,
+            'db_hits': 0,
+            'misses': 0,
+            'segment_hits': 0,
+            'segment_misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'saved_seconds': 0.0
+        }
+
+    def get(self, text, src_lang, target_lang, engine, segment=False):
+        """Return the cached translation from engine or None.
+
+        Lookups for the segments of a long text pass segment=True and are
+        counted apart, so hits and misses count one lookup per request.
+        """
+        if not self.enabled:
+            return None
+
+        key = (engine, src_lang, target_lang, text_hash(text))
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry['created_at'] <= self.max_age:
+                self._memory.move_to_end(key)
+                self._stats['segment_hits' if segment else 'memory_hits'] += 1
+                self._stats['saved_seconds'] += entry['latency']
+                return entry['translated_text']
+            if entry:
+                del self._memory[key]
+
+        row = self._db_get(key, now)
+        with self._lock:
+            if row:
+                self._remember(key, row)
+                self._stats['segment_hits' if segment else 'db_hits'] += 1
+                self._stats['saved_seconds'] += row['latency']
+                return row['translated_text']
+            self._stats['segment_misses' if segment else 'misses'] += 1
+        return None
+
+    def put(self, text, src_lang, target_lang, engine, translated_text, latency=0.0):
+        """Store a successful translation by engine; latency is the remote call time it replaces"""
+        if not self.enabled or not translated_text:
+            return
+
+        key = (engine, src_lang, target_lang, text_hash(text))
+        entry = {'translated_text': translated_text, 'latency': latency, 'created_at': time.time()}
+
+        with self._lock:
+            self._remember(key, entry)
+            self._stats['stores'] += 1
+            self._writes_since_eviction += 1
+            run_eviction = self._writes_since_eviction >= 100
+            if run_eviction:
+                self._writes_since_eviction = 0
+
+        self._db_put(key, entry)
+        if run_eviction:
+            self.evict()
+
+    def evict(self):
+        """Drop entries older than max_age and trim the SQLite tier to max_db_entries"""
+        connection = self._connect()
+        if not connection:
+            return 0
+        try:
+            cursor = connection.cursor()
+            cursor.execute("DELETE FROM translation_cache WHERE created_at < ?", (time.time() - self.max_age,))
+            removed = cursor.rowcount
+            cursor.execute("""
+            DELETE FROM translation_cache WHERE rowid IN (
+                SELECT rowid FROM translation_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+            )
+            """, (self.max_db_entries,))
+            removed += cursor.rowcount
+            connection.commit()
+            cursor.close()
+            with self._lock:
+                self._stats['evictions'] += removed
+            return removed
+        except sqlite3.Error as e:
+            logger.warning(f"Translation cache eviction failed: {e}")
+            return 0
+        finally:
+            connection.close()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['memory_hits'] + stats['db_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['db_hits']) / lookups if lookups else 0.0
+        stats['saved_seconds'] = round(stats['saved_seconds'], 3)
+        stats['enabled'] = self.enabled
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        connection = self._connect()
+        if connection:
+            connection.execute("DELETE FROM translation_cache")
+            connection.commit()
+            connection.close()
+
+    def _remember(self, key, entry):
+        # Caller holds the lock
+        self._memory[key] = {
+            'translated_text': entry['translated_text'],
+            'latency': entry['latency'],
+            'created_at': entry['created_at']
+        }
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _connect(self):
+        try:
+            connection = get_database(self.db_path).connection()
+            if not self._table_ready:
+                self._create_table(connection)
+            return connection
+        except sqlite3.Error as e:
+            logger.warning(f"Translation cache database unavailable: {e}")
+            return None
+
+    def _create_table(self, connection):
+        # Tables from before the engine was part of the key can't tell engines apart; start over
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(translation_cache)")]
+        if columns and 'engine' not in columns:
+            connection.execute("DROP TABLE translation_cache")
+            logger.info("🔄 Translation cache reset to key entries by MT engine")
+        connection.execute("""
+        CREATE TABLE IF NOT EXISTS translation_cache (
+            engine TEXT NOT NULL,
+            source_language TEXT NOT NULL,
+            target_language TEXT NOT NULL,
+            text_hash TEXT NOT NULL,
+            translated_text TEXT NOT NULL,
+            latency REAL DEFAULT 0.0,
+            hit_count INTEGER DEFAULT 0,
+            created_at REAL NOT NULL,
+            last_used_at REAL NOT NULL,
+            PRIMARY KEY (engine, source_language, target_language, text_hash)
+        )
+        """)
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_translation_cache_last_used ON translation_cache(last_used_at)")
+        connection.commit()
+        self._table_ready = True
+
+    def _db_get(self, key, now):
+        connection = self._connect()
+        if not connection:
+            return None
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+            SELECT translated_text, latency, created_at FROM translation_cache
+            WHERE engine = ? AND source_language = ? AND target_language = ? AND text_hash = ? AND created_at >= ?
+            """, (*key, now - self.max_age))
+            row = cursor.fetchone()
+            if row:
+                cursor.execute("""
+                UPDATE translation_cache SET hit_count = hit_count + 1, last_used_at = ?
+                WHERE engine = ? AND source_language = ? AND target_language = ? AND text_hash = ?
+                """, (now, *key))
+                connection.commit()
+                row = dict(row)
+            cursor.close()
+            return row
+        except sqlite3.Error as e:
+            logger.warning(f"Translation cache lookup failed: {e}")
+            return None
+        finally:
+            connection.close()
+
+    def _db_put(self, key, entry):
+        connection = self._connect()
+        if not connection:
+            return
+        try:
+            connection.execute("""
+            INSERT OR REPLACE INTO translation_cache
+            (engine, source_language, target_language, text_hash, translated_text, latency, hit_count, created_at, last_used_at)
+            VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)
+            """, (*key, entry['translated_text'], entry['latency'], entry['created_at'], entry['created_at']))
+            connection.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Translation cache store failed: {e}")
+        finally:
+            connection.close()
+
+def cache_from_environment():
+    """Build the process-wide cache from NEUROFORGE_TRANSLATION_CACHE* settings"""
+    return TranslationCache(
+        db_path=os.environ.get('NEUROFORGE_DATABASE_PATH', DEFAULT_DATABASE_PATH),
+        max_memory_entries=int(os.environ.get('NEUROFORGE_TRANSLATION_CACHE_MEMORY_ENTRIES', 2048)),
+        max_db_entries=int(os.environ.get('NEUROFORGE_TRANSLATION_CACHE_DB_ENTRIES', 100000)),
+        max_age=int(os.environ.get('NEUROFORGE_TRANSLATION_CACHE_MAX_AGE', 30 * 24 * 3600)),
+        enabled=os.environ.get('NEUROFORGE_TRANSLATION_CACHE', 'true').lower() in ('1', 'true', 'yes')
+    )
@@ -0,0 +1,111 @@
+"""
+Content-addressed cache for text_to_speech output
+Synthesized files are stored once under output_audio/tts_cache/<sha256>.mp3,
+keyed on (TTS engine, text, language, voice type and, for the fast voice,
+its tempo), and hardlinked to each session's file
+"""
+
+import os
+import hashlib
+import threading
+import logging
+from translation_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join('output_audio', 'tts_cache')
+
+def tts_cache_key(text, lang, voice_type, engine, tempo=None):
+    # The fast voice's audio depends on the tempo it was sped up by
+    variant = f'{float(tempo):g}' if voice_type == 'fast' and tempo else ''
+    payload = '\x1f'.join([engine, lang, voice_type, variant, normalize_text(text)])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class TtsCache:
+    """Stores each distinct synthesis once and links session files to it"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, enabled=True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0}
+        if enabled:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, text, lang, voice_type, engine, tempo=None, extension='mp3'):
+        return os.path.join(self.cache_dir, f"{tts_cache_key(text, lang, voice_type, engine, tempo)}.{extension}")
+
+    def lookup(self, text, lang, voice_type, out_file, engine, tempo=None):
+        """Return a path holding the cached audio for out_file, or None on a miss.
+
+        The cached file is hardlinked to out_file; where links aren't possible
+        the cache path itself is returned as a shared reference.
+        """
+        if not self.enabled:
+            return None
+
+        cached_path = self.path_for(text, lang, voice_type, engine, tempo, self._extension(out_file))
+        if not os.path.exists(cached_path) or os.path.getsize(cached_path) == 0:
+            self._count('misses')
+            return None
+
+        self._count('hits')
+        try:
+            os.utime(cached_path)  # recency for the retention sweeper
+        except OSError:
+            pass
+        if os.path.abspath(cached_path) == os.path.abspath(out_file):
+            return out_file
+        try:
+            if os.path.exists(out_file):
+                os.remove(out_file)
+            os.link(cached_path, out_file)
+            return out_file
+        except OSError as e:
+            logger.debug(f"Hardlink to TTS cache failed, using shared reference: {e}")
+            return cached_path
+
+    def store(self, text, lang, voice_type, audio_path, engine, tempo=None):
+        """Add a freshly synthesized file to the cache"""
+        if not self.enabled:
+            return
+
+        cached_path = self.path_for(text, lang, voice_type, engine, tempo, self._extension(audio_path))
+        if os.path.exists(cached_path):
+            return
+        temp_path = f"{cached_path}.{threading.get_ident()}.tmp"
+        try:
+            try:
+                os.link(audio_path, temp_path)
+            except OSError:
+                with open(audio_path, 'rb') as src, open(temp_path, 'wb') as dst:
+                    dst.write(src.read())
+            os.replace(temp_path, cached_path)
+            self._count('stores')
+        except OSError as e:
+            logger.warning(f"Could not store TTS output in cache: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['enabled'] = self.enabled
+        return stats
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    @staticmethod
+    def _extension(path):
+        return os.path.splitext(path)[1][1:] or 'mp3'
+
+def tts_cache_from_environment():
+    """Build the process-wide cache from NEUROFORGE_TTS_CACHE* settings"""
+    return TtsCache(
+        cache_dir=os.environ.get('NEUROFORGE_TTS_CACHE_DIR', DEFAULT_CACHE_DIR),
+        enabled=os.environ.get('NEUROFORGE_TTS_CACHE', 'true').lower() in ('1', 'true', 'yes')
+    )
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+NeuroForge API Load Benchmark
+Drives /upload, /history, /stream_audio and /download_audio from concurrent workers
+with synthetic audio, and reports throughput and p50/p95/p99 latency per endpoint
+
+Runs against the in-process Flask app (default, with the offline 'local' engines)
+or a live server (--url http://localhost:5000). Results are written as JSON so
+runs can be compared with --baseline.
+
+Examples:
+    python benchmark.py --concurrency 8 --requests 200
+    python benchmark.py --url http://localhost:5000 --mix upload=1,history=4 --duration 60
+    python benchmark.py --baseline benchmark_results/previous.json
+"""
+
+import os
+import io
+import sys
+import json
+import math
+import time
+import wave
+import random
+import struct
+import argparse
+import tempfile
+import threading
+from datetime import datetime
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Backend')
+DEFAULT_MIX = 'upload=2,history=4,stream=3,download=1'
+OPERATIONS = ['upload', 'history', 'stream', 'download']
+
+def make_synthetic_wav(duration, seed=0, sample_rate=16000):
+    """Speech-like test audio: a few gliding tones with syllable-rate amplitude bursts and light noise"""
+    rng = random.Random(seed)
+    base = rng.uniform(120, 260)
+    frames = []
+    for i in range(int(duration * sample_rate)):
+        t = i / sample_rate
+        envelope = max(0.0, math.sin(2 * math.pi * 3.5 * t)) ** 2  # ~3.5 syllables per second
+        pitch = base * (1 + 0.1 * math.sin(2 * math.pi * 0.5 * t))
+        sample = (math.sin(2 * math.pi * pitch * t) + 0.5 * math.sin(4 * math.pi * pitch * t)) * envelope
+        sample += rng.uniform(-0.05, 0.05)
+        frames.append(struct.pack('<h', int(max(-1.0, min(1.0, sample * 0.6)) * 32767)))
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b''.join(frames))
+    return buffer.getvalue()
+
+def make_unique(wav_bytes, index):
+    """Stamp a request index into the first samples so each upload hashes differently"""
+    stamped = bytearray(wav_bytes)
+    stamped[44:52] = struct.pack('<Q', index)
+    return bytes(stamped)
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}' in mix (choose from {', '.join(OPERATIONS)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+class InProcessClient:
+    """Flask test client per worker thread; the app is imported once in a scratch directory"""
+
+    def __init__(self, workdir, engines='local'):
+        os.makedirs(workdir, exist_ok=True)
+        os.chdir(workdir)
+        # Always the scratch database, never one inherited from the environment
+        os.environ['NEUROFORGE_DATABASE_PATH'] = os.path.join(workdir, 'neuroforge.db')
+        if engines:
+            os.environ.setdefault('NEUROFORGE_ENGINES', engines)
+        sys.path.insert(0, BACKEND_DIR)
+        import app as neuroforge_app
+        self.app = neuroforge_app.app
+        # Absolute folders: send_file resolves relative paths against the Backend directory
+        for key in ('UPLOAD_FOLDER', 'OUTPUT_FOLDER'):
+            self.app.config[key] = os.path.join(workdir, self.app.config[key])
+        self._local = threading.local()
+
+    def _client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        return client
+
+    def get(self, path):
+        response = self._client().get(path)
+        return response.status_code, response.get_data(), self._json(response.get_data())
+
+    def post_file(self, path, filename, content, form):
+        data = dict(form)
+        data['file'] = (io.BytesIO(content), filename)
+        response = self._client().post(path, data=data, content_type='multipart/form-data')
+        return response.status_code, response.get_data(), self._json(response.get_data())
+
+    @staticmethod
+    def _json(body):
+        try:
+            return json.loads(body)
+        except (ValueError, UnicodeDecodeError):
+            return None
+
+class HttpClient:
+    """requests.Session per worker thread against a running server"""
+
+    def __init__(self, base_url, timeout=300):
+        import requests
+        self.requests = requests
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self.requests.Session()
+        return session
+
+    def get(self, path):
+        response = self._session().get(self.base_url + path, timeout=self.timeout)
+        return response.status_code, response.content, self._json(response)
+
+    def post_file(self, path, filename, content, form):
+        files = {'file': (filename, content, 'audio/wav')}
+        response = self._session().post(self.base_url + path, files=files, data=form, timeout=self.timeout)
+        return response.status_code, response.content, self._json(response)
+
+    @staticmethod
+    def _json(response):
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+class Benchmark:
+    """Closed-loop load: each worker issues its next request as soon as the previous one returns"""
+
+    def __init__(self, client, args):
+        self.client = client
+        self.args = args
+        self.weights = parse_mix(args.mix)
+        self.rng = random.Random(args.seed)
+        self.audio = {duration: make_synthetic_wav(duration, seed=args.seed + index)
+                      for index, duration in enumerate(args.audio_durations)}
+        self.sessions = []
+        self.samples = {}
+        self.status_counts = {}
+        self.lock = threading.Lock()
+        self.issued = 0
+        self.upload_index = 0
+
+    def next_operation(self):
+        """Claim the next request slot; None once the request or time budget is spent"""
+        with self.lock:
+            if self.args.requests and self.issued >= self.args.requests:
+                return None
+            if self.args.duration and time.perf_counter() - self.started > self.args.duration:
+                return None
+            self.issued += 1
+            operation = self.rng.choices(list(self.weights), weights=list(self.weights.values()))[0]
+            if operation in ('stream', 'download') and not self.sessions:
+                operation = 'upload'
+            session_id = self.rng.choice(self.sessions) if self.sessions else None
+            return operation, session_id
+
+    def record(self, operation, started, status, size, ok):
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.samples.setdefault(operation, []).append((elapsed, ok, size))
+            counts = self.status_counts.setdefault(operation, {})
+            counts[str(status)] = counts.get(str(status), 0) + 1
+
+    def upload(self):
+        with self.lock:
+            self.upload_index += 1
+            index = self.upload_index
+        duration = self.rng.choice(self.args.audio_durations)
+        content = self.audio[duration]
+        if not self.args.repeat_audio:
+            content = make_unique(content, index)
+
+        form = {
+            'source_language': self.args.source_language,
+            'target_language': self.args.target_language,
+            'voice_type': self.args.voice_type
+        }
+        if self.args.async_uploads:
+            form['async'] = 'true'
+
+        started = time.perf_counter()
+        status, body, data = self.client.post_file('/upload', f'bench_{index}_{duration}s.wav', content, form)
+        session_id = (data or {}).get('session_id')
+
+        if status == 202 and data and data.get('status_url'):
+            self.record('upload_accept', started, status, len(body), True)
+            status, body, data = self.wait_for_job(data['status_url'])
+
+        ok = status == 200 and bool(data) and data.get('status') != 'error'
+        self.record('upload', started, status, len(body), ok)
+        if ok and session_id:
+            with self.lock:
+                self.sessions.append(session_id)
+
+    def wait_for_job(self, status_url):
+        while True:
+            status, body, data = self.client.get(status_url)
+            if status != 200 or not data or data.get('status') in ('completed', 'failed'):
+                if data and data.get('status') == 'failed':
+                    return 500, body, data
+                return status, body, data
+            time.sleep(self.args.poll_interval)
+
+    def request(self, operation, session_id):
+        if operation == 'upload':
+            return self.upload()
+
+        path = {
+            'history': '/history',
+            'stream': f'/stream_audio/{session_id}',
+            'download': f'/download_audio/{session_id}'
+        }[operation]
+        started = time.perf_counter()
+        status, body, _ = self.client.get(path)
+        self.record(operation, started, status, len(body), status == 200)
+
+    def worker(self):
+        while True:
+            claimed = self.next_operation()
+            if claimed is None:
+                return
+            started = time.perf_counter()
+            try:
+                self.request(*claimed)
+            except Exception as e:
+                self.record(claimed[0], started, f'error:{type(e).__name__}', 0, False)
+
+    def warm_up(self):
+        """Seed a few sessions so stream/download have targets from the first request"""
+        for _ in range(self.args.warmup):
+            self.upload()
+        self.samples.clear()
+        self.status_counts.clear()
+
+    def run(self):
+        self.warm_up()
+        self.started = time.perf_counter()
+        threads = [threading.Thread(target=self.worker, name=f'bench-{i}') for i in range(self.args.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.wall_time = time.perf_counter() - self.started
+        return self.summary()
+
+    def summary(self):
+        operations = {}
+        all_latencies = []
+        total_ok = 0
+        total = 0
+        for operation, samples in sorted(self.samples.items()):
+            latencies = sorted(elapsed for elapsed, _, _ in samples)
+            ok_count = sum(1 for _, ok, _ in samples if ok)
+            operations[operation] = {
+                'requests': len(samples),
+                'errors': len(samples) - ok_count,
+                'throughput_rps': round(len(samples) / self.wall_time, 3) if self.wall_time else 0.0,
+                'latency_ms': {
+                    'mean': round(sum(latencies) / len(latencies) * 1000, 2),
+                    'p50': round(percentile(latencies, 50) * 1000, 2),
+                    'p95': round(percentile(latencies, 95) * 1000, 2),
+                    'p99': round(percentile(latencies, 99) * 1000, 2),
+                    'max': round(latencies[-1] * 1000, 2)
+                },
+                'bytes': sum(size for _, _, size in samples),
+                'status_codes': self.status_counts.get(operation, {})
+            }
+            if operation != 'upload_accept':
+                all_latencies.extend(latencies)
+                total_ok += ok_count
+                total += len(samples)
+
+        all_latencies.sort()
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'target': self.args.url or 'in-process',
+            'config': {
+                'concurrency': self.args.concurrency,
+                'requests': self.args.requests,
+                'duration': self.args.duration,
+                'mix': self.weights,
+                'audio_durations': self.args.audio_durations,
+                'async_uploads': self.args.async_uploads,
+                'repeat_audio': self.args.repeat_audio,
+                'source_language': self.args.source_language,
+                'target_language': self.args.target_language,
+                'voice_type': self.args.voice_type,
+                'seed': self.args.seed
+            },
+            'wall_time_seconds': round(self.wall_time, 3),
+            'overall': {
+                'requests': total,
+                'errors': total - total_ok,
+                'throughput_rps': round(total / self.wall_time, 3) if self.wall_time else 0.0,
+                'latency_ms': {
+                    'p50': round((percentile(all_latencies, 50) or 0) * 1000, 2),
+                    'p95': round((percentile(all_latencies, 95) or 0) * 1000, 2),
+                    'p99': round((percentile(all_latencies, 99) or 0) * 1000, 2),
+                    'max': round(all_latencies[-1] * 1000, 2) if all_latencies else 0.0
+                }
+            },
+            'operations': operations
+        }
+
+def print_report(results, baseline=None):
+    print("\n" + "="*78)
+    print(f"📊 NeuroForge Benchmark — {results['target']}, {results['config']['concurrency']} workers, "
+          f"{results['wall_time_seconds']}s")
+    print("="*78)
+    print(f"{'operation':<14}{'reqs':>7}{'errs':>6}{'rps':>9}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}{'max ms':>11}")
+    rows = list(results['operations'].items()) + [('overall', results['overall'])]
+    for operation, stats in rows:
+        latency = stats['latency_ms']
+        print(f"{operation:<14}{stats['requests']:>7}{stats['errors']:>6}{stats['throughput_rps']:>9.2f}"
+              f"{latency['p50']:>11.1f}{latency['p95']:>11.1f}{latency['p99']:>11.1f}"
+              f"{latency['max']:>11.1f}")
+
+    if baseline:
+        print(f"\n📈 Change vs baseline ({baseline.get('timestamp', 'unknown')}):")
+        previous_rows = dict(baseline.get('operations', {}), overall=baseline.get('overall', {}))
+        for operation, stats in rows:
+            previous = previous_rows.get(operation)
+            if not previous:
+                continue
+            changes = [f"rps {_relative_change(stats['throughput_rps'], previous.get('throughput_rps'))}"]
+            for key in ('p50', 'p95', 'p99'):
+                changes.append(f"{key} {_relative_change(stats['latency_ms'][key], previous.get('latency_ms', {}).get(key))}")
+            print(f"   {operation:<14}" + "  ".join(changes))
+
+def _relative_change(current, previous):
+    if not previous:
+        return 'n/a'
+    return f"{(current - previous) / previous * 100:+.1f}%"
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Concurrent load benchmark for the NeuroForge API')
+    parser.add_argument('--url', help='Base URL of a running server (default: in-process app)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent workers')
+    parser.add_argument('--requests', type=int, default=100, help='Total requests (0 = use --duration only)')
+    parser.add_argument('--duration', type=float, default=0, help='Stop after this many seconds')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Request mix weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--audio-durations', default='2,5,15',
+                        help='Comma-separated synthetic clip lengths in seconds')
+    parser.add_argument('--repeat-audio', action='store_true',
+                        help='Upload identical clips (exercises caches and result reuse)')
+    parser.add_argument('--async-uploads', action='store_true',
+                        help='Upload with async=true and time until the job finishes')
+    parser.add_argument('--poll-interval', type=float, default=0.05)
+    parser.add_argument('--source-language', default='en')
+    parser.add_argument('--target-language', default='hi')
+    parser.add_argument('--voice-type', default='standard')
+    parser.add_argument('--warmup', type=int, default=2, help='Uploads before measuring')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--engines', default='local',
+                        help="In-process engines (NEUROFORGE_ENGINES), '' to use the app's default")
+    parser.add_argument('--workdir', help='In-process scratch directory (default: a new temp dir)')
+    parser.add_argument('--output', help='JSON results path (default: benchmark_results/benchmark_<time>.json)')
+    parser.add_argument('--baseline', help='Earlier results JSON to compare against')
+    args = parser.parse_args(argv)
+    args.audio_durations = [float(value) for value in args.audio_durations.split(',') if value.strip()]
+    if not args.requests and not args.duration:
+        parser.error('set --requests or --duration')
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    output = os.path.abspath(args.output or os.path.join(
+        'benchmark_results', f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    if args.url:
+        client = HttpClient(args.url)
+    else:
+        client = InProcessClient(args.workdir or tempfile.mkdtemp(prefix='neuroforge_bench_'), args.engines)
+
+    print(f"🚀 Benchmarking {args.url or 'in-process app'}: {args.concurrency} workers, mix {args.mix}")
+    results = Benchmark(client, args).run()
+    print_report(results, baseline)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results saved to {output}")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -372,8 +372,9 @@ if __name__ == "__main__":
         print("2. Quick API Check Only") 
         print("3. Performance Tests")
         print("4. Error Handling Only")
+        print("5. Concurrent Load Benchmark")
         
-        choice = input("\nEnter choice (1-4, default=1): ").strip()
+        choice = input("\nEnter choice (1-5, default=1): ").strip()
         
         if choice == "2":
             print_header("Quick API Check")
@@ -383,6 +384,10 @@ if __name__ == "__main__":
             test_performance()
         elif choice == "4":
             test_error_handling()
+        elif choice == "5":
+            # Concurrency, request mix and percentiles: see benchmark.py --help
+            import benchmark
+            benchmark.main(['--url', API_BASE_URL])
         else:
             # Default: Complete test suite
             run_complete_test_suite()